@@ -0,0 +1,79 @@
+"""
+Compares the latency of the `list` tool on the subprocess and embedded
+dbt CLI backends.
+
+Usage:
+    DBT_PROJECT_DIR=/path/to/project DBT_PATH=$(which dbt) \\
+        python benchmarks/dbt_cli_backends.py --iterations 20 --selector my_model+
+
+The embedded backend requires dbt Core and the project's adapter to be
+installed in the same environment as dbt-mcp.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from dbt_mcp.config.config import DbtCliConfig
+from dbt_mcp.dbt_cli.tools import register_dbt_cli_tools
+
+
+class ToolCollector:
+    def __init__(self):
+        self.tools = {}
+
+    def tool(self, **kwargs):
+        def decorator(func):
+            self.tools[func.__name__] = func
+            return func
+
+        return decorator
+
+
+async def benchmark_backend(
+    backend: str, iterations: int, selector: str | None
+) -> list[float]:
+    collector = ToolCollector()
+    register_dbt_cli_tools(
+        collector,  # type: ignore[arg-type]
+        DbtCliConfig(
+            project_dir=os.environ["DBT_PROJECT_DIR"],
+            dbt_path=os.environ.get("DBT_PATH", "dbt"),
+            dbt_cli_timeout=600,
+            dbt_cli_backend=backend,  # type: ignore[arg-type]
+        ),
+    )
+    ls = collector.tools["ls"]
+    # Warm up, this includes the initial parse for the embedded backend
+    await ls(selector=selector, resource_type=None)
+
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await ls(selector=selector, resource_type=None)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--selector", default=None)
+    args = parser.parse_args()
+
+    for backend in ["subprocess", "embedded"]:
+        latencies = asyncio.run(
+            benchmark_backend(backend, args.iterations, args.selector)
+        )
+        quantiles = statistics.quantiles(latencies, n=100)
+        print(
+            f"{backend:<12} p50={quantiles[49] * 1000:8.1f}ms "
+            + f"p95={quantiles[94] * 1000:8.1f}ms "
+            + f"(n={len(latencies)})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Compares the latency of fetching all models (10 pages of 100 models) from
+a local stub of the Discovery API, with a new connection per request (as
+`requests.post` does) and with the pooled client of AsyncMetadataAPIClient.
+
+The stub delays each new connection by --connect-latency-ms to account for
+the TCP and TLS handshakes with the real API, which are nearly free on
+localhost.
+
+Usage:
+    python benchmarks/discovery_client.py --iterations 20 --connect-latency-ms 50
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from dbt_mcp.discovery.client import (
+    MAX_NUM_MODELS,
+    PAGE_SIZE,
+    AsyncMetadataAPIClient,
+    AsyncModelsFetcher,
+)
+
+
+class StubDiscoveryHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connect_latency = 0.0
+
+    def setup(self):
+        time.sleep(self.connect_latency)
+        super().setup()
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        page = int(request["variables"]["after"] or 0)
+        body = json.dumps(
+            {
+                "data": {
+                    "environment": {
+                        "applied": {
+                            "models": {
+                                "pageInfo": {"endCursor": str(page + 1)},
+                                "edges": [
+                                    {
+                                        "node": {
+                                            "name": f"model_{page}_{i}",
+                                            "uniqueId": f"model.p.model_{page}_{i}",
+                                            "description": "A model" * 10,
+                                        }
+                                    }
+                                    for i in range(PAGE_SIZE)
+                                ],
+                            }
+                        }
+                    }
+                }
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ConnectionPerRequestClient(AsyncMetadataAPIClient):
+    """The client before connections were pooled."""
+
+    async def execute_query(self, query: str, variables: dict) -> dict:
+        async with httpx.AsyncClient() as http_client:
+            response = await http_client.post(
+                url=self.url,
+                json={"query": query, "variables": variables},
+                headers={**self.headers, "Connection": "close"},
+            )
+        return response.json()
+
+
+async def benchmark_client(
+    api_client: AsyncMetadataAPIClient, iterations: int
+) -> list[float]:
+    models_fetcher = AsyncModelsFetcher(api_client=api_client, environment_id=1)
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        models = await models_fetcher.fetch_models()
+        latencies.append(time.perf_counter() - start)
+        assert len(models) == MAX_NUM_MODELS
+    return latencies
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--connect-latency-ms", type=float, default=50)
+    args = parser.parse_args()
+
+    StubDiscoveryHandler.connect_latency = args.connect_latency_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubDiscoveryHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/graphql"
+
+    clients = {
+        "per-request": ConnectionPerRequestClient(url=url, headers={}),
+        "pooled": AsyncMetadataAPIClient(url=url, headers={}),
+    }
+    for name, api_client in clients.items():
+        latencies = await benchmark_client(api_client, args.iterations)
+        await api_client.close()
+        quantiles = statistics.quantiles(latencies, n=100)
+        print(
+            f"{name:<12} p50={quantiles[49] * 1000:8.1f}ms "
+            + f"p95={quantiles[94] * 1000:8.1f}ms "
+            + f"(n={len(latencies)})"
+        )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,123 @@
+"""
+Compares the latency of finding misspellings of group by names among the
+dimensions and entities of a Semantic Layer, with the dynamic programming
+implementation of the Levenshtein distance that was used before, with
+get_misspellings and with a WordMatcher built once for the names.
+
+Usage:
+    python benchmarks/levenshtein.py --iterations 50 --sizes 100,1000,5000
+"""
+
+import argparse
+import functools
+import random
+import statistics
+import string
+import time
+from collections.abc import Callable
+
+from dbt_mcp.semantic_layer.levenshtein import (
+    Misspelling,
+    WordMatcher,
+    get_misspellings,
+)
+
+
+def dynamic_programming_levenshtein(s1: str, s2: str) -> int:
+    len_s1, len_s2 = len(s1), len(s2)
+    dp = [[0] * (len_s2 + 1) for _ in range(len_s1 + 1)]
+    for i in range(len_s1 + 1):
+        dp[i][0] = i
+    for j in range(len_s2 + 1):
+        dp[0][j] = j
+    for i in range(1, len_s1 + 1):
+        for j in range(1, len_s2 + 1):
+            cost = 0 if s1[i - 1] == s2[j - 1] else 1
+            dp[i][j] = min(dp[i - 1][j] + 1, dp[i][j - 1] + 1, dp[i - 1][j - 1] + cost)
+    return dp[len_s1][len_s2]
+
+
+def dynamic_programming_misspellings(
+    targets: list[str], words: list[str], top_k: int | None = None
+) -> list[Misspelling]:
+    """get_misspellings before the bit-parallel matcher."""
+    misspellings = []
+    for target in targets:
+        if target in words:
+            continue
+        threshold = max(1, len(target) // 2)
+        distances = [
+            (word, dynamic_programming_levenshtein(target, word)) for word in words
+        ]
+        distances = [(word, dist) for word, dist in distances if dist <= threshold]
+        distances.sort(key=lambda x: x[1])
+        similar_words = [word for word, _ in distances[:top_k]]
+        misspellings.append(Misspelling(word=target, similar_words=similar_words))
+    return misspellings
+
+
+def random_names(rng: random.Random, size: int) -> list[str]:
+    """Names like `order__customer_region`."""
+    parts = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10)))
+        for _ in range(200)
+    ]
+    return [
+        "__".join("_".join(rng.sample(parts, 2)) for _ in range(rng.randint(1, 2)))
+        for _ in range(size)
+    ]
+
+
+def misspell(rng: random.Random, word: str) -> str:
+    i = rng.randrange(len(word))
+    return word[:i] + rng.choice(string.ascii_lowercase) + word[i + 1 :]
+
+
+def benchmark(
+    find_misspellings: Callable[[list[str]], list[Misspelling]],
+    targets: list[str],
+    iterations: int,
+) -> list[float]:
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        find_misspellings(targets)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--sizes", default="100,1000,5000")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    for size in (int(size) for size in args.sizes.split(",")):
+        words = random_names(rng, size)
+        # A query grouping by a valid name and a misspelled one
+        targets = [words[0], misspell(rng, rng.choice(words))]
+        matcher = WordMatcher(words)
+        implementations = {
+            "dynamic-programming": functools.partial(
+                dynamic_programming_misspellings, words=words, top_k=5
+            ),
+            "get_misspellings": functools.partial(
+                get_misspellings, words=words, top_k=5
+            ),
+            "prebuilt-matcher": functools.partial(matcher.misspellings, top_k=5),
+        }
+        expected = implementations["dynamic-programming"](targets)
+        for name, find_misspellings in implementations.items():
+            assert find_misspellings(targets) == expected
+            latencies = benchmark(find_misspellings, targets, args.iterations)
+            quantiles = statistics.quantiles(latencies, n=100)
+            print(
+                f"{size:>6} words {name:<20} p50={quantiles[49] * 1000:8.2f}ms "
+                + f"p95={quantiles[94] * 1000:8.2f}ms "
+                + f"(n={len(latencies)})"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Compares the time and peak memory of serializing the results of
+query_metrics with pandas (`to_pandas().to_json(orient="records",
+indent=2)`, as before) and with the Arrow-native formats.
+
+Each serialization runs in a fresh process, after a warm-up on a small
+table, so the peak RSS it reports is the increase of the maximum resident
+set size during the serialization.
+
+Usage:
+    python benchmarks/query_metrics_serialization.py --iterations 5 --sizes 1000,100000,1000000
+"""
+
+import argparse
+import datetime
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+
+import pyarrow as pa
+
+from dbt_mcp.semantic_layer.serialization import serialize_table
+
+
+def pandas_json(table: pa.Table) -> str:
+    return table.to_pandas().to_json(orient="records", indent=2) or ""
+
+
+IMPLEMENTATIONS: dict[str, Callable[[pa.Table], str]] = {
+    "pandas-json": pandas_json,
+    "arrow-json": lambda table: serialize_table(table, "json"),
+    "arrow-csv": lambda table: serialize_table(table, "csv"),
+    "arrow-ipc": lambda table: serialize_table(table, "arrow"),
+}
+
+
+def metrics_table(size: int) -> pa.Table:
+    """Like the result of grouping two metrics by day and a dimension."""
+    rng = random.Random(0)
+    start = datetime.datetime(2020, 1, 1)
+    regions = ["EMEA", "AMER", "APAC", "LATAM"]
+    return pa.table(
+        {
+            "metric_time__day": pa.array(
+                [start + datetime.timedelta(days=i // 4) for i in range(size)],
+                pa.timestamp("us"),
+            ),
+            "customer__region": [regions[i % 4] for i in range(size)],
+            "order_count": [rng.randint(0, 10_000) for _ in range(size)],
+            "revenue": [rng.random() * 100_000 for _ in range(size)],
+        }
+    )
+
+
+def max_rss_bytes() -> int:
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def run_once(name: str, size: int) -> None:
+    """Serializes a table in this process and prints the time and the
+    increase of the peak RSS."""
+    # Like in a running server, functions are already loaded and initialized
+    IMPLEMENTATIONS[name](metrics_table(10))
+    table = metrics_table(size)
+    max_rss_before = max_rss_bytes()
+    start = time.perf_counter()
+    result = IMPLEMENTATIONS[name](table)
+    elapsed = time.perf_counter() - start
+    print(elapsed, max_rss_bytes() - max_rss_before, len(result))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--sizes", default="1000,100000,1000000")
+    parser.add_argument("--run", nargs=2, metavar=("IMPLEMENTATION", "SIZE"))
+    args = parser.parse_args()
+
+    if args.run:
+        run_once(args.run[0], int(args.run[1]))
+        return
+
+    for size in (int(size) for size in args.sizes.split(",")):
+        for name in IMPLEMENTATIONS:
+            latencies, peak_rss = [], []
+            for _ in range(args.iterations):
+                output = subprocess.run(
+                    [sys.executable, __file__, "--run", name, str(size)],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout.split()
+                latencies.append(float(output[0]))
+                peak_rss.append(int(output[1]))
+                result_size = int(output[2])
+            print(
+                f"{size:>8} rows {name:<12} "
+                + f"p50={statistics.median(latencies) * 1000:9.2f}ms "
+                + f"max={max(latencies) * 1000:9.2f}ms "
+                + f"peak_rss=+{statistics.median(peak_rss) / 1e6:7.1f}MB "
+                + f"size={result_size / 1e6:7.1f}MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Literal
 
 import yaml
 from pydantic import BaseModel, Field, field_validator
@@ -18,24 +18,70 @@ class TrackingConfig(BaseModel):
     local_user_id: str | None = None
 
 
+class HttpClientConfig(BaseModel):
+    pool_size: int = 10
+    timeout: float = 30
+    connect_timeout: float = 10
+    max_retries: int = 3
+    retry_backoff: float = 0.5
+    retry_max_backoff: float = 30
+    http2: bool = True
+
+
 class SemanticLayerConfig(BaseModel):
     url: str
     host: str
     prod_environment_id: int
     service_token: str
     headers: dict[str, str]
+    http_client: HttpClientConfig = HttpClientConfig()
+    cache_ttl: int = 300
+    cache_max_entries: int = 256
+    cache_max_bytes: int = 10_000_000
+    session_pool_size: int = 10
+    session_idle_timeout: int = 60
+    result_cache_ttl: int = 0
+    result_cache_stale_ttl: int = 0
+    result_cache_max_entries: int = 128
+    result_cache_max_bytes: int = 100_000_000
+    result_max_rows: int = 1000
+    result_max_bytes: int = 100_000
+    result_pages_ttl: int = 600
+    result_pages_max_bytes: int = 200_000_000
 
 
 class DiscoveryConfig(BaseModel):
     url: str
     headers: dict[str, str]
     environment_id: int
+    http_client: HttpClientConfig = HttpClientConfig()
+    cache_ttl: int = 300
+    cache_max_entries: int = 256
+    cache_check_interval: int = 30
+
+
+# Commands that share a concurrency limit are separated by "|". Commands
+# running models in the warehouse and writing run_results.json run one at a
+# time, while commands like list, compile and show are only bounded by
+# DBT_CLI_MAX_CONCURRENCY.
+DEFAULT_DBT_CLI_COMMAND_CONCURRENCY = {"build|run|test": 1, "docs": 1}
 
 
 class DbtCliConfig(BaseModel):
     project_dir: str
     dbt_path: str
     dbt_cli_timeout: int
+    dbt_cli_max_concurrency: int = 4
+    dbt_cli_command_concurrency: dict[str, int] = DEFAULT_DBT_CLI_COMMAND_CONCURRENCY
+    dbt_cli_max_queued_commands: int = 100
+    dbt_cli_backend: Literal["subprocess", "embedded"] = "subprocess"
+    dbt_cli_use_manifest_index: bool = True
+    dbt_cli_output_max_bytes: int = 1_000_000
+    dbt_cli_result_format: Literal["text", "summary"] = "text"
+    dbt_cli_result_max_nodes: int = 50
+    dbt_cli_show_cache_ttl: int = 0
+    dbt_cli_show_cache_max_entries: int = 128
+    dbt_cli_show_cache_max_bytes: int = 10_000_000
 
 
 class RemoteConfig(BaseModel):
@@ -67,7 +113,78 @@ class DbtMcpSettings(BaseSettings):
     dbt_project_dir: str | None = Field(None, alias="DBT_PROJECT_DIR")
     dbt_path: str = Field("dbt", alias="DBT_PATH")
     dbt_cli_timeout: int = Field(10, alias="DBT_CLI_TIMEOUT")
+    dbt_cli_max_concurrency: int = Field(4, alias="DBT_CLI_MAX_CONCURRENCY")
+    dbt_cli_command_concurrency: Annotated[dict[str, int] | None, NoDecode] = Field(
+        None, alias="DBT_CLI_COMMAND_CONCURRENCY"
+    )
+    dbt_cli_max_queued_commands: int = Field(100, alias="DBT_CLI_MAX_QUEUED_COMMANDS")
+    dbt_cli_backend: Literal["subprocess", "embedded"] = Field(
+        "subprocess", alias="DBT_CLI_BACKEND"
+    )
+    dbt_cli_use_manifest_index: bool = Field(True, alias="DBT_CLI_USE_MANIFEST_INDEX")
+    dbt_cli_output_max_bytes: int = Field(1_000_000, alias="DBT_CLI_OUTPUT_MAX_BYTES")
+    dbt_cli_result_format: Literal["text", "summary"] = Field(
+        "text", alias="DBT_CLI_RESULT_FORMAT"
+    )
+    dbt_cli_result_max_nodes: int = Field(50, alias="DBT_CLI_RESULT_MAX_NODES")
+    dbt_cli_show_cache_ttl: int = Field(0, alias="DBT_CLI_SHOW_CACHE_TTL")
+    dbt_cli_show_cache_max_entries: int = Field(
+        128, alias="DBT_CLI_SHOW_CACHE_MAX_ENTRIES"
+    )
+    dbt_cli_show_cache_max_bytes: int = Field(
+        10_000_000, alias="DBT_CLI_SHOW_CACHE_MAX_BYTES"
+    )
     dbt_warn_error_options: str | None = Field(None, alias="DBT_WARN_ERROR_OPTIONS")
+    dbt_api_pool_size: int = Field(10, alias="DBT_API_POOL_SIZE")
+    dbt_api_timeout: float = Field(30, alias="DBT_API_TIMEOUT")
+    dbt_api_connect_timeout: float = Field(10, alias="DBT_API_CONNECT_TIMEOUT")
+    dbt_api_max_retries: int = Field(3, alias="DBT_API_MAX_RETRIES")
+    dbt_api_retry_backoff: float = Field(0.5, alias="DBT_API_RETRY_BACKOFF")
+    dbt_api_retry_max_backoff: float = Field(30, alias="DBT_API_RETRY_MAX_BACKOFF")
+    dbt_api_http2: bool = Field(True, alias="DBT_API_HTTP2")
+    discovery_cache_ttl: int = Field(300, alias="DISCOVERY_CACHE_TTL")
+    discovery_cache_max_entries: int = Field(256, alias="DISCOVERY_CACHE_MAX_ENTRIES")
+    discovery_cache_check_interval: int = Field(
+        30, alias="DISCOVERY_CACHE_CHECK_INTERVAL"
+    )
+
+    semantic_layer_cache_ttl: int = Field(300, alias="SEMANTIC_LAYER_CACHE_TTL")
+    semantic_layer_cache_max_entries: int = Field(
+        256, alias="SEMANTIC_LAYER_CACHE_MAX_ENTRIES"
+    )
+    semantic_layer_cache_max_bytes: int = Field(
+        10_000_000, alias="SEMANTIC_LAYER_CACHE_MAX_BYTES"
+    )
+    semantic_layer_session_pool_size: int = Field(
+        10, alias="SEMANTIC_LAYER_SESSION_POOL_SIZE"
+    )
+    semantic_layer_session_idle_timeout: int = Field(
+        60, alias="SEMANTIC_LAYER_SESSION_IDLE_TIMEOUT"
+    )
+    semantic_layer_result_cache_ttl: int = Field(
+        0, alias="SEMANTIC_LAYER_RESULT_CACHE_TTL"
+    )
+    semantic_layer_result_cache_stale_ttl: int = Field(
+        0, alias="SEMANTIC_LAYER_RESULT_CACHE_STALE_TTL"
+    )
+    semantic_layer_result_cache_max_entries: int = Field(
+        128, alias="SEMANTIC_LAYER_RESULT_CACHE_MAX_ENTRIES"
+    )
+    semantic_layer_result_cache_max_bytes: int = Field(
+        100_000_000, alias="SEMANTIC_LAYER_RESULT_CACHE_MAX_BYTES"
+    )
+    semantic_layer_result_max_rows: int = Field(
+        1000, alias="SEMANTIC_LAYER_RESULT_MAX_ROWS"
+    )
+    semantic_layer_result_max_bytes: int = Field(
+        100_000, alias="SEMANTIC_LAYER_RESULT_MAX_BYTES"
+    )
+    semantic_layer_result_pages_ttl: int = Field(
+        600, alias="SEMANTIC_LAYER_RESULT_PAGES_TTL"
+    )
+    semantic_layer_result_pages_max_bytes: int = Field(
+        200_000_000, alias="SEMANTIC_LAYER_RESULT_PAGES_MAX_BYTES"
+    )
 
     disable_dbt_cli: bool = Field(False, alias="DISABLE_DBT_CLI")
     disable_semantic_layer: bool = Field(False, alias="DISABLE_SEMANTIC_LAYER")
@@ -109,6 +226,31 @@ class DbtMcpSettings(BaseSettings):
             raise ValueError("\n".join(errors))
         return tool_names
 
+    @field_validator("dbt_cli_command_concurrency", mode="before")
+    @classmethod
+    def parse_dbt_cli_command_concurrency(
+        cls, env_var: str | None
+    ) -> dict[str, int] | None:
+        if not env_var:
+            return None
+        errors: list[str] = []
+        command_concurrency: dict[str, int] = {}
+        for entry in env_var.split(","):
+            entry_stripped = entry.strip()
+            if entry_stripped == "":
+                continue
+            commands, _, limit = entry_stripped.partition("=")
+            try:
+                command_concurrency[commands.strip()] = int(limit)
+            except ValueError:
+                errors.append(
+                    f"Invalid entry in DBT_CLI_COMMAND_CONCURRENCY: {entry_stripped}."
+                    + " Must look like `build|run=1`."
+                )
+        if errors:
+            raise ValueError("\n".join(errors))
+        return command_concurrency
+
 
 class Config(BaseModel):
     tracking_config: TrackingConfig
@@ -172,6 +314,27 @@ def load_config() -> Config:
             errors.append(
                 "DBT_PATH environment variable is required when dbt CLI tools are enabled."
             )
+        if settings.dbt_cli_max_concurrency < 1:
+            errors.append("DBT_CLI_MAX_CONCURRENCY must be at least 1.")
+        if any(
+            limit < 1 for limit in (settings.dbt_cli_command_concurrency or {}).values()
+        ):
+            errors.append("DBT_CLI_COMMAND_CONCURRENCY limits must be at least 1.")
+        if settings.dbt_cli_result_max_nodes < 0:
+            errors.append("DBT_CLI_RESULT_MAX_NODES must not be negative.")
+
+    if settings.dbt_api_pool_size < 1:
+        errors.append("DBT_API_POOL_SIZE must be at least 1.")
+    if settings.dbt_api_max_retries < 0:
+        errors.append("DBT_API_MAX_RETRIES must not be negative.")
+    if settings.dbt_api_retry_max_backoff < 0:
+        errors.append("DBT_API_RETRY_MAX_BACKOFF must not be negative.")
+    if settings.semantic_layer_session_pool_size < 1:
+        errors.append("SEMANTIC_LAYER_SESSION_POOL_SIZE must be at least 1.")
+    if settings.semantic_layer_result_max_rows < 0:
+        errors.append("SEMANTIC_LAYER_RESULT_MAX_ROWS must not be negative.")
+    if settings.semantic_layer_result_max_bytes < 0:
+        errors.append("SEMANTIC_LAYER_RESULT_MAX_BYTES must not be negative.")
 
     if errors:
         raise ValueError("Errors found in configuration:\n\n" + "\n".join(errors))
@@ -201,8 +364,32 @@ def load_config() -> Config:
             project_dir=settings.dbt_project_dir,
             dbt_path=settings.dbt_path,
             dbt_cli_timeout=settings.dbt_cli_timeout,
+            dbt_cli_max_concurrency=settings.dbt_cli_max_concurrency,
+            dbt_cli_command_concurrency=(
+                settings.dbt_cli_command_concurrency
+                or DEFAULT_DBT_CLI_COMMAND_CONCURRENCY
+            ),
+            dbt_cli_max_queued_commands=settings.dbt_cli_max_queued_commands,
+            dbt_cli_backend=settings.dbt_cli_backend,
+            dbt_cli_use_manifest_index=settings.dbt_cli_use_manifest_index,
+            dbt_cli_output_max_bytes=settings.dbt_cli_output_max_bytes,
+            dbt_cli_result_format=settings.dbt_cli_result_format,
+            dbt_cli_result_max_nodes=settings.dbt_cli_result_max_nodes,
+            dbt_cli_show_cache_ttl=settings.dbt_cli_show_cache_ttl,
+            dbt_cli_show_cache_max_entries=settings.dbt_cli_show_cache_max_entries,
+            dbt_cli_show_cache_max_bytes=settings.dbt_cli_show_cache_max_bytes,
         )
 
+    http_client_config = HttpClientConfig(
+        pool_size=settings.dbt_api_pool_size,
+        timeout=settings.dbt_api_timeout,
+        connect_timeout=settings.dbt_api_connect_timeout,
+        max_retries=settings.dbt_api_max_retries,
+        retry_backoff=settings.dbt_api_retry_backoff,
+        retry_max_backoff=settings.dbt_api_retry_max_backoff,
+        http2=settings.dbt_api_http2,
+    )
+
     discovery_config = None
     if (
         not settings.disable_discovery
@@ -221,6 +408,10 @@ def load_config() -> Config:
                 "Content-Type": "application/json",
             },
             environment_id=settings.actual_prod_environment_id,
+            http_client=http_client_config,
+            cache_ttl=settings.discovery_cache_ttl,
+            cache_max_entries=settings.discovery_cache_max_entries,
+            cache_check_interval=settings.discovery_cache_check_interval,
         )
 
     semantic_layer_config = None
@@ -248,6 +439,20 @@ def load_config() -> Config:
                 "Authorization": f"Bearer {settings.dbt_token}",
                 "x-dbt-partner-source": "dbt-mcp",
             },
+            http_client=http_client_config,
+            cache_ttl=settings.semantic_layer_cache_ttl,
+            cache_max_entries=settings.semantic_layer_cache_max_entries,
+            cache_max_bytes=settings.semantic_layer_cache_max_bytes,
+            session_pool_size=settings.semantic_layer_session_pool_size,
+            session_idle_timeout=settings.semantic_layer_session_idle_timeout,
+            result_cache_ttl=settings.semantic_layer_result_cache_ttl,
+            result_cache_stale_ttl=settings.semantic_layer_result_cache_stale_ttl,
+            result_cache_max_entries=settings.semantic_layer_result_cache_max_entries,
+            result_cache_max_bytes=settings.semantic_layer_result_cache_max_bytes,
+            result_max_rows=settings.semantic_layer_result_max_rows,
+            result_max_bytes=settings.semantic_layer_result_max_bytes,
+            result_pages_ttl=settings.semantic_layer_result_pages_ttl,
+            result_pages_max_bytes=settings.semantic_layer_result_pages_max_bytes,
         )
 
     # Load local user ID from dbt profile
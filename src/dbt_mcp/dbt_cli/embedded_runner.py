@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import os
+import subprocess
+import threading
+from collections.abc import Callable
+from typing import Any, Literal
+
+from dbt_mcp.config.config import DbtCliConfig
+from dbt_mcp.dbt_cli.log_events import is_quiet_output
+from dbt_mcp.dbt_cli.project import fingerprint_project
+from dbt_mcp.tools.streaming import OutputEvent
+
+logger = logging.getLogger(__name__)
+
+DbtFlavor = Literal["core", "cloud_cli", "fusion", "unknown"]
+
+# Commands that read the parsed manifest. Others (e.g. `debug`, `deps`)
+# run without parsing the project first.
+MANIFEST_COMMANDS = {
+    "build",
+    "clone",
+    "compile",
+    "docs",
+    "list",
+    "ls",
+    "retry",
+    "run",
+    "run-operation",
+    "seed",
+    "show",
+    "snapshot",
+    "source",
+    "test",
+}
+
+
+def detect_dbt_flavor(dbt_path: str) -> DbtFlavor:
+    try:
+        output = subprocess.run(
+            [dbt_path, "--version"],
+            check=False,
+            capture_output=True,
+            text=True,
+            timeout=30,
+        ).stdout.lower()
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+    if "cloud cli" in output:
+        return "cloud_cli"
+    if "fusion" in output:
+        return "fusion"
+    if "core:" in output:
+        return "core"
+    return "unknown"
+
+
+class EmbeddedDbtRunner:
+    """Runs dbt Core in-process and reuses the parsed manifest across calls.
+
+    dbt Core doesn't support concurrent invocations in the same process,
+    so invocations are serialized and run in a worker thread. The manifest
+    is re-parsed whenever a file in the project changes.
+    """
+
+    def __init__(self, project_dir: str):
+        # Imported here as dbt Core is only required for this backend
+        from dbt.cli.main import dbtRunner  # type: ignore[import-not-found]
+
+        self._dbt_runner_cls = dbtRunner
+        self.project_dir = os.path.abspath(project_dir)
+        self._lock = threading.Lock()
+        self._manifest: Any = None
+        self._project_fingerprint: str | None = None
+
+    async def invoke(
+        self,
+        args: list[str],
+        timeout: int | None = None,
+        on_event: Callable[[OutputEvent], None] | None = None,
+    ) -> str:
+        # On timeout the invocation can't be interrupted, it keeps running in
+        # its thread and later invocations wait for it to complete.
+        return await asyncio.wait_for(
+            asyncio.to_thread(self._invoke, args, on_event), timeout=timeout
+        )
+
+    def _invoke(
+        self,
+        args: list[str],
+        on_event: Callable[[OutputEvent], None] | None = None,
+    ) -> str:
+        with self._lock:
+            command = args[0] if args else ""
+            # The project is only fingerprinted when a manifest is parsed or
+            # reused, to tell whether the cached one is still up to date
+            if command == "parse":
+                self._project_fingerprint = fingerprint_project(self.project_dir)
+            elif command in MANIFEST_COMMANDS:
+                project_fingerprint = fingerprint_project(self.project_dir)
+                if project_fingerprint != self._project_fingerprint:
+                    self._manifest = None
+                    self._project_fingerprint = project_fingerprint
+                if self._manifest is None:
+                    parse_result = self._run(["parse"], [], on_event)
+                    if parse_result.success:
+                        self._manifest = parse_result.result
+
+            output_lines: list[str] = []
+            result = self._run(args, output_lines, on_event)
+            if command == "parse" and result.success:
+                self._manifest = result.result
+            if result.exception is not None:
+                output_lines.append(str(result.exception))
+            return "\n".join(output_lines) or "OK"
+
+    def _run(
+        self,
+        args: list[str],
+        output_lines: list[str],
+        on_event: Callable[[OutputEvent], None] | None,
+    ) -> Any:
+        def collect_output(msg: Any) -> None:
+            if is_quiet_output(msg.info.name, msg.info.level):
+                output_lines.append(msg.info.msg)
+            if on_event is not None:
+                on_event(
+                    OutputEvent(
+                        message=msg.info.msg,
+                        data={
+                            "info": {
+                                "name": msg.info.name,
+                                "level": msg.info.level,
+                                "msg": msg.info.msg,
+                            }
+                        },
+                    )
+                )
+
+        runner = self._dbt_runner_cls(
+            manifest=self._manifest if args[0] in MANIFEST_COMMANDS else None,
+            callbacks=[collect_output],
+        )
+        return runner.invoke([*args, *self._project_args()])
+
+    def _project_args(self) -> list[str]:
+        # Console logging is disabled, as stdout may be the MCP transport.
+        # Output is collected through event callbacks instead.
+        project_args = ["--project-dir", self.project_dir, "--log-level", "none"]
+        # The dbt CLI looks for profiles.yml in the working directory first
+        if "DBT_PROFILES_DIR" not in os.environ and os.path.exists(
+            os.path.join(self.project_dir, "profiles.yml")
+        ):
+            project_args += ["--profiles-dir", self.project_dir]
+        return project_args
+
+
+def create_embedded_runner(config: DbtCliConfig) -> EmbeddedDbtRunner | None:
+    if config.dbt_cli_backend != "embedded":
+        return None
+    flavor = detect_dbt_flavor(config.dbt_path)
+    if flavor != "core":
+        logger.info(
+            f"DBT_PATH points to a {flavor} dbt executable, "
+            + "falling back to the subprocess backend"
+        )
+        return None
+    try:
+        return EmbeddedDbtRunner(project_dir=config.project_dir)
+    except ImportError:
+        logger.warning(
+            "dbt Core is not installed in the dbt-mcp environment, "
+            + "falling back to the subprocess backend"
+        )
+        return None
@@ -0,0 +1,32 @@
+import json
+
+from dbt_mcp.tools.streaming import OutputEvent
+
+# Events that dbt Core writes to stdout even when `--quiet` is set.
+# Mirrors PRINT_EVENT_NAMES in dbt_common.events.logger.
+PRINT_EVENT_NAMES = ("PrintEvent", "ShowNode", "CompiledNode")
+
+
+def is_quiet_output(event_name: str, level: str) -> bool:
+    """Whether dbt prints this event to the console with `--quiet`."""
+    return event_name in PRINT_EVENT_NAMES or level == "error"
+
+
+def parse_log_line(line: str) -> OutputEvent:
+    """Parses a line logged with `--log-format json`, falling back to plain text."""
+    try:
+        data = json.loads(line)
+        info = data["info"]
+        return OutputEvent(message=info["msg"], data=data)
+    except (ValueError, KeyError, TypeError):
+        return OutputEvent(message=line.rstrip("\n"))
+
+
+def quiet_output_line(event: OutputEvent) -> str | None:
+    """The line dbt would have printed with `--quiet`, if any."""
+    if event.data is None:
+        return event.message + "\n"
+    info = event.data["info"]
+    if is_quiet_output(info.get("name", ""), info.get("level", "")):
+        return event.message + "\n"
+    return None
@@ -0,0 +1,398 @@
+import json
+import logging
+import os
+import re
+import threading
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+from pathlib import PurePosixPath
+
+logger = logging.getLogger(__name__)
+
+# Same grammar as dbt's RAW_SELECTOR_PATTERN in dbt/graph/selector_spec.py
+RAW_SELECTOR_PATTERN = re.compile(
+    r"\A"
+    r"(?P<childrens_parents>(\@))?"
+    r"(?P<parents>((?P<parents_depth>(\d*))\+))?"
+    r"((?P<method>([\w.]+)):)?(?P<value>(.*?))"
+    r"(?P<children>(\+(?P<children_depth>(\d*))))?"
+    r"\Z"
+)
+GLOB_CHARACTERS = ("*", "?", "[", "]")
+
+# Resource types listed by `dbt list` when --resource-type isn't provided
+DEFAULT_RESOURCE_TYPES = frozenset(
+    (
+        "model",
+        "snapshot",
+        "seed",
+        "test",
+        "source",
+        "exposure",
+        "metric",
+        "saved_query",
+        "semantic_model",
+        "unit_test",
+    )
+)
+ALL_RESOURCE_TYPES = DEFAULT_RESOURCE_TYPES | frozenset(("analysis",))
+
+# Manifest sections holding selectable resources
+MANIFEST_RESOURCE_KEYS = (
+    "nodes",
+    "sources",
+    "exposures",
+    "metrics",
+    "semantic_models",
+    "saved_queries",
+    "unit_tests",
+)
+
+
+class UnsupportedSelectorError(Exception):
+    """The selector can't be answered from the manifest index."""
+
+
+@dataclass
+class IndexedNode:
+    unique_id: str
+    name: str
+    resource_type: str
+    package_name: str
+    fqn: list[str]
+    original_file_path: str
+    patch_path: str | None = None
+    source_name: str | None = None
+    version: str | None = None
+    tags: list[str] = field(default_factory=list)
+
+    @property
+    def selector(self) -> str:
+        """The node identifier printed by `dbt list`."""
+        if self.resource_type == "source":
+            return f"source:{self.package_name}.{self.source_name}.{self.name}"
+        if self.resource_type == "unit_test":
+            name = self.name if self.version is None else f"{self.name}_v{self.version}"
+            return f"unit_test:{self.package_name}.{name}"
+        if self.resource_type in (
+            "exposure",
+            "metric",
+            "saved_query",
+            "semantic_model",
+        ):
+            return f"{self.resource_type}:{self.package_name}.{self.name}"
+        return ".".join(self.fqn)
+
+
+def _matches_fqn(node: IndexedNode, selector: str) -> bool:
+    # Nodes match with or without their package name, like in dbt
+    return _is_selected_node(node.fqn, selector, node.version is not None) or (
+        _is_selected_node(node.fqn[1:], selector, node.version is not None)
+    )
+
+
+def _is_selected_node(fqn: list[str], selector: str, is_versioned: bool) -> bool:
+    # Port of dbt's is_selected_node
+    if is_versioned and len(fqn) > 1:
+        if fqn[-2] == selector:
+            return True
+        if "_".join(fqn[-2:]) == "_".join(selector.split(".")[-2:]):
+            return True
+    elif fqn and fqn[-1] == selector:
+        return True
+    flat_fqn = [item for segment in fqn for item in segment.split(".")]
+    selector_parts = selector.split(".")
+    if len(flat_fqn) < len(selector_parts):
+        return False
+    for i, selector_part in enumerate(selector_parts):
+        if any(wildcard in selector_part for wildcard in GLOB_CHARACTERS):
+            return fnmatch(".".join(flat_fqn[i:]), ".".join(selector_parts[i:]))
+        if flat_fqn[i] != selector_part:
+            return False
+    return True
+
+
+def _matches_path(node: IndexedNode, selector: str) -> bool:
+    selected_path = PurePosixPath(selector.rstrip("/"))
+    file_path = PurePosixPath(node.original_file_path)
+    if file_path == selected_path or selected_path in file_path.parents:
+        return True
+    if node.patch_path and "://" in node.patch_path:
+        return PurePosixPath(node.patch_path.split("://")[1]) == selected_path
+    return False
+
+
+def _matches_file(node: IndexedNode, selector: str) -> bool:
+    file_path = PurePosixPath(node.original_file_path)
+    return fnmatch(file_path.name, selector) or fnmatch(file_path.stem, selector)
+
+
+def _matches_source(node: IndexedNode, selector: str) -> bool:
+    if node.resource_type != "source":
+        return False
+    parts = selector.split(".")
+    package = "*"
+    if len(parts) == 1:
+        source, table = parts[0], "*"
+    elif len(parts) == 2:
+        source, table = parts
+    elif len(parts) == 3:
+        package, source, table = parts
+    else:
+        raise UnsupportedSelectorError(f"Invalid source selector {selector}")
+    return (
+        fnmatch(node.package_name, package)
+        and fnmatch(node.source_name or "", source)
+        and fnmatch(node.name, table)
+    )
+
+
+class ManifestIndex:
+    """In-memory indexes over `target/manifest.json` to answer `dbt list`.
+
+    The manifest is reloaded whenever its modification time changes, so
+    results reflect the last time dbt parsed the project. Loading a large
+    manifest takes a while, so `list_nodes` is meant to be called from a
+    worker thread, and calls are serialized.
+    """
+
+    def __init__(self, project_dir: str):
+        self.project_dir = project_dir
+        self.manifest_path = os.path.join(
+            project_dir, os.environ.get("DBT_TARGET_PATH", "target"), "manifest.json"
+        )
+        self._loaded_mtime_ns: int | None = None
+        self._lock = threading.Lock()
+        self.project_name: str | None = None
+        self.nodes: dict[str, IndexedNode] = {}
+        self.parent_map: dict[str, list[str]] = {}
+        self.child_map: dict[str, list[str]] = {}
+        self.by_resource_type: dict[str, set[str]] = defaultdict(set)
+        self.by_tag: dict[str, set[str]] = defaultdict(set)
+        self.by_package: dict[str, set[str]] = defaultdict(set)
+        self.by_name: dict[str, set[str]] = defaultdict(set)
+
+    def refresh(self) -> bool:
+        """Loads the manifest if it changed. Returns whether it is available."""
+        try:
+            mtime_ns = os.stat(self.manifest_path).st_mtime_ns
+        except OSError:
+            return False
+        if mtime_ns == self._loaded_mtime_ns:
+            return True
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load {self.manifest_path}: {e}")
+            return False
+        self._build(manifest)
+        self._loaded_mtime_ns = mtime_ns
+        return True
+
+    def _build(self, manifest: dict) -> None:
+        self.project_name = manifest.get("metadata", {}).get("project_name")
+        self.nodes = {}
+        self.by_resource_type = defaultdict(set)
+        self.by_tag = defaultdict(set)
+        self.by_package = defaultdict(set)
+        self.by_name = defaultdict(set)
+        for key in MANIFEST_RESOURCE_KEYS:
+            for unique_id, raw_node in manifest.get(key, {}).items():
+                version = raw_node.get("version")
+                node = IndexedNode(
+                    unique_id=unique_id,
+                    name=raw_node["name"],
+                    resource_type=raw_node["resource_type"],
+                    package_name=raw_node["package_name"],
+                    fqn=raw_node.get("fqn", []),
+                    original_file_path=raw_node.get("original_file_path", ""),
+                    patch_path=raw_node.get("patch_path"),
+                    source_name=raw_node.get("source_name"),
+                    version=str(version) if version is not None else None,
+                    tags=raw_node.get("tags", []),
+                )
+                self.nodes[unique_id] = node
+                self.by_resource_type[node.resource_type].add(unique_id)
+                self.by_package[node.package_name].add(unique_id)
+                self.by_name[node.name].add(unique_id)
+                for tag in node.tags:
+                    self.by_tag[tag].add(unique_id)
+        self.parent_map = manifest.get("parent_map", {})
+        self.child_map = manifest.get("child_map", {})
+
+    def list_nodes(
+        self, selector: str | None, resource_types: list[str] | None
+    ) -> list[str] | None:
+        """Returns the output lines of `dbt list`.
+
+        Returns None when the manifest isn't available or the selection
+        can't be answered from the index, in which case the dbt CLI
+        should be used instead.
+        """
+        with self._lock:
+            return self._list_nodes(selector, resource_types)
+
+    def _list_nodes(
+        self, selector: str | None, resource_types: list[str] | None
+    ) -> list[str] | None:
+        if not self.refresh():
+            return None
+        try:
+            allowed_types = self._resolve_resource_types(resource_types)
+            if selector:
+                selected = set[str]()
+                for union_term in selector.split():
+                    selected |= self._select_intersection(union_term)
+            else:
+                if os.path.exists(os.path.join(self.project_dir, "selectors.yml")):
+                    # The project might define a default selector
+                    return None
+                selected = set(self.nodes)
+        except UnsupportedSelectorError:
+            return None
+        return [
+            self.nodes[unique_id].selector
+            for unique_id in sorted(selected)
+            if unique_id in self.nodes
+            and self.nodes[unique_id].resource_type in allowed_types
+        ]
+
+    def _resolve_resource_types(self, resource_types: list[str] | None) -> set[str]:
+        if not resource_types:
+            return set(DEFAULT_RESOURCE_TYPES)
+        resolved: set[str] = set()
+        for resource_type in resource_types:
+            if resource_type == "all":
+                resolved |= ALL_RESOURCE_TYPES
+            elif resource_type == "default":
+                resolved |= DEFAULT_RESOURCE_TYPES
+            elif resource_type in ALL_RESOURCE_TYPES:
+                resolved.add(resource_type)
+            else:
+                raise UnsupportedSelectorError(f"Unknown resource type {resource_type}")
+        return resolved
+
+    def _select_intersection(self, term: str) -> set[str]:
+        selected: set[str] | None = None
+        for criteria in term.split(","):
+            criteria_selected = self._select_criteria(criteria)
+            selected = (
+                criteria_selected if selected is None else selected & criteria_selected
+            )
+        return selected or set()
+
+    def _select_criteria(self, raw: str) -> set[str]:
+        match = RAW_SELECTOR_PATTERN.match(raw)
+        if not match:
+            raise UnsupportedSelectorError(f"Invalid selector {raw}")
+        groups = match.groupdict()
+        if groups["childrens_parents"] and groups["children"]:
+            raise UnsupportedSelectorError(f"Invalid selector {raw}")
+        selected = self._search(groups["method"], groups["value"])
+
+        if groups["childrens_parents"]:
+            descendants = self._traverse(selected, self.child_map, None)
+            selected = (
+                selected
+                | descendants
+                | self._traverse(selected | descendants, self.parent_map, None)
+            )
+        else:
+            expanded = set(selected)
+            if groups["parents"]:
+                expanded |= self._traverse(
+                    selected,
+                    self.parent_map,
+                    int(groups["parents_depth"]) if groups["parents_depth"] else None,
+                )
+            if groups["children"]:
+                expanded |= self._traverse(
+                    selected,
+                    self.child_map,
+                    int(groups["children_depth"]) if groups["children_depth"] else None,
+                )
+            selected = expanded
+        return selected | self._indirectly_selected_tests(selected)
+
+    def _search(self, method: str | None, value: str) -> set[str]:
+        if method is None:
+            if "/" in value or "\\" in value:
+                method = "path"
+            elif value.lower().endswith((".sql", ".py", ".csv")):
+                method = "file"
+            else:
+                method = "fqn"
+
+        if method == "tag":
+            if any(wildcard in value for wildcard in GLOB_CHARACTERS):
+                return self._filter(
+                    lambda node: any(fnmatch(t, value) for t in node.tags)
+                )
+            return set(self.by_tag.get(value, set()))
+        if method == "package":
+            if value == "this" and self.project_name:
+                value = self.project_name
+            if any(wildcard in value for wildcard in GLOB_CHARACTERS):
+                return self._filter(lambda node: fnmatch(node.package_name, value))
+            return set(self.by_package.get(value, set()))
+        if method == "resource_type":
+            if value not in ALL_RESOURCE_TYPES | {"operation"}:
+                raise UnsupportedSelectorError(f"Unknown resource type {value}")
+            return set(self.by_resource_type.get(value, set()))
+        if method == "fqn":
+            if "." not in value and not any(w in value for w in GLOB_CHARACTERS):
+                # Fast path for a bare node name, the most common selector
+                by_name = self.by_name.get(value, set())
+                return by_name | self._filter(
+                    lambda node: (
+                        node.unique_id not in by_name and _matches_fqn(node, value)
+                    )
+                )
+            return self._filter(lambda node: _matches_fqn(node, value))
+        if method == "path":
+            if any(wildcard in value for wildcard in GLOB_CHARACTERS):
+                # dbt resolves path globs against the filesystem
+                raise UnsupportedSelectorError(f"Unsupported path glob {value}")
+            return self._filter(lambda node: _matches_path(node, value))
+        if method == "file":
+            return self._filter(lambda node: _matches_file(node, value))
+        if method == "source":
+            return self._filter(lambda node: _matches_source(node, value))
+        raise UnsupportedSelectorError(f"Unsupported selector method {method}")
+
+    def _filter(self, predicate: Callable[[IndexedNode], bool]) -> set[str]:
+        return {unique_id for unique_id, node in self.nodes.items() if predicate(node)}
+
+    def _traverse(
+        self,
+        start: Iterable[str],
+        adjacency: dict[str, list[str]],
+        max_depth: int | None,
+    ) -> set[str]:
+        visited: set[str] = set()
+        frontier = set(start)
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            next_frontier: set[str] = set()
+            for unique_id in frontier:
+                for neighbor in adjacency.get(unique_id, []):
+                    if neighbor not in visited:
+                        visited.add(neighbor)
+                        next_frontier.add(neighbor)
+            frontier = next_frontier
+            depth += 1
+        return visited
+
+    def _indirectly_selected_tests(self, selected: set[str]) -> set[str]:
+        # dbt's default "eager" indirect selection: tests are selected
+        # when any of the resources they test is selected
+        indirect: set[str] = set()
+        for unique_id in selected:
+            for child_id in self.child_map.get(unique_id, []):
+                child = self.nodes.get(child_id)
+                if child and child.resource_type in ("test", "unit_test"):
+                    indirect.add(child_id)
+        return indirect
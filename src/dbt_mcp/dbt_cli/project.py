@@ -0,0 +1,22 @@
+import hashlib
+import os
+
+# Directories inside a dbt project that don't affect the parsed manifest
+IGNORED_PROJECT_DIRS = {"target", "logs", "dbt_packages", "dbt_modules"}
+
+
+def fingerprint_project(project_dir: str) -> str:
+    """Hash of the paths and modification times of the files in the project."""
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(project_dir):
+        dirs[:] = sorted(
+            d for d in dirs if d not in IGNORED_PROJECT_DIRS and not d.startswith(".")
+        )
+        for file_name in sorted(files):
+            path = os.path.join(root, file_name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            digest.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+    return digest.hexdigest()
@@ -0,0 +1,78 @@
+import json
+import os
+from collections import Counter
+from typing import Any
+
+# Node statuses that don't need the attention of the caller
+PASSING_STATUSES = {"success", "pass"}
+FAILING_STATUSES = {"error", "fail", "runtime error"}
+
+
+def run_results_path(project_dir: str) -> str:
+    return os.path.join(
+        project_dir, os.environ.get("DBT_TARGET_PATH", "target"), "run_results.json"
+    )
+
+
+def run_results_mtime(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def read_run_results(
+    path: str, previous_mtime: int | None, command: str
+) -> dict[str, Any] | None:
+    """Reads run_results.json if `command` wrote it after `previous_mtime`.
+
+    Returns None when the file is missing or is left over from another
+    command, e.g. when the project failed to compile.
+    """
+    mtime = run_results_mtime(path)
+    if mtime is None or mtime == previous_mtime:
+        return None
+    try:
+        with open(path) as f:
+            run_results = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # Commands running concurrently write to the same file
+    if run_results.get("args", {}).get("which", command) != command:
+        return None
+    return run_results
+
+
+def summarize_run_results(run_results: dict[str, Any], max_nodes: int) -> str:
+    """Compact summary of a run, listing failing nodes first."""
+    results = run_results.get("results", [])
+    counts = Counter(result["status"] for result in results)
+    # Stable sort, so nodes keep the execution order within each group
+    ordered = sorted(results, key=lambda result: result["status"] in PASSING_STATUSES)
+
+    summary: dict[str, Any] = {
+        "status": "error" if FAILING_STATUSES & counts.keys() else "success",
+        "elapsed_time": round(run_results.get("elapsed_time") or 0, 2),
+        "counts": dict(counts),
+        "nodes": [_summarize_node(result) for result in ordered[:max_nodes]],
+    }
+    if len(ordered) > max_nodes:
+        summary["omitted_nodes"] = len(ordered) - max_nodes
+    return json.dumps(summary)
+
+
+def _summarize_node(result: dict[str, Any]) -> dict[str, Any]:
+    node: dict[str, Any] = {
+        "unique_id": result["unique_id"],
+        "status": result["status"],
+        "execution_time": round(result.get("execution_time") or 0, 2),
+    }
+    rows_affected = (result.get("adapter_response") or {}).get("rows_affected")
+    if rows_affected is not None:
+        node["rows_affected"] = rows_affected
+    if result["status"] not in PASSING_STATUSES:
+        if result.get("failures"):
+            node["failures"] = result["failures"]
+        if result.get("message"):
+            node["message"] = result["message"]
+    return node
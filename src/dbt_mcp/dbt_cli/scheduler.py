@@ -0,0 +1,119 @@
+import asyncio
+import statistics
+import time
+from collections import Counter, deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+# Number of recent queue waits kept to compute percentiles
+WAIT_SAMPLES = 1000
+
+
+class SchedulerQueueFullError(Exception):
+    pass
+
+
+@dataclass
+class _QueuedCommand:
+    group: str
+    future: asyncio.Future[None]
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class DbtCommandScheduler:
+    """Decides when queued dbt commands can start.
+
+    At most `max_concurrency` commands run at once, and commands of a group
+    in `command_concurrency` (e.g. `{"build|run|test": 1}`) are bounded by
+    the limit of the group. Commands start in the order they were queued,
+    but a command waiting for its group doesn't hold back commands of
+    other groups.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        command_concurrency: dict[str, int],
+        max_queued: int,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queued = max_queued
+        self._group_limits = command_concurrency
+        self._command_groups = {
+            command: group
+            for group in command_concurrency
+            for command in group.split("|")
+        }
+        self._queue: deque[_QueuedCommand] = deque()
+        self._running: Counter[str] = Counter()
+        self._completed = 0
+        self._rejected = 0
+        self._waits: deque[float] = deque(maxlen=WAIT_SAMPLES)
+        self._max_wait = 0.0
+
+    @asynccontextmanager
+    async def slot(self, command: str) -> AsyncIterator[None]:
+        """Waits for a slot to run `command`, held until the context exits."""
+        if len(self._queue) >= self.max_queued:
+            self._rejected += 1
+            raise SchedulerQueueFullError(
+                "Too many dbt commands are queued, try again later."
+            )
+        queued = _QueuedCommand(
+            group=self._command_groups.get(command, command),
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self._queue.append(queued)
+        self._dispatch()
+        try:
+            await queued.future
+        except asyncio.CancelledError:
+            if queued.future.cancelled():
+                self._queue.remove(queued)
+            else:
+                # The slot was granted just before the caller was cancelled
+                self._release(queued.group)
+            raise
+        try:
+            yield
+        finally:
+            self._completed += 1
+            self._release(queued.group)
+
+    def stats(self) -> dict[str, Any]:
+        waits = sorted(self._waits)
+        return {
+            "running": sum(self._running.values()),
+            "running_by_group": {
+                group: count for group, count in self._running.items() if count
+            },
+            "queued": len(self._queue),
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "queue_wait_seconds": {
+                "p50": statistics.median(waits) if waits else 0.0,
+                "p95": waits[int(len(waits) * 0.95)] if waits else 0.0,
+                "max": self._max_wait,
+            },
+        }
+
+    def _release(self, group: str) -> None:
+        self._running[group] -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        now = time.monotonic()
+        for queued in list(self._queue):
+            if sum(self._running.values()) >= self.max_concurrency:
+                return
+            limit = self._group_limits.get(queued.group)
+            if limit is not None and self._running[queued.group] >= limit:
+                continue
+            self._queue.remove(queued)
+            self._running[queued.group] += 1
+            wait = now - queued.enqueued_at
+            self._waits.append(wait)
+            self._max_wait = max(self._max_wait, wait)
+            queued.future.set_result(None)
@@ -0,0 +1,29 @@
+import json
+
+from dbt_mcp.cache.cache import TTLCache
+from dbt_mcp.config.config import DbtCliConfig
+
+# Normalized SQL, limit and project fingerprint
+ShowCacheKey = tuple[str, int | None, str]
+
+
+def is_show_output(output: str) -> bool:
+    """Whether `output` holds the rows returned by `dbt show --output json`.
+
+    Errors and truncated output are not cached.
+    """
+    try:
+        parsed = json.loads(output)
+    except ValueError:
+        return False
+    return isinstance(parsed, dict) and "show" in parsed
+
+
+def create_show_cache(config: DbtCliConfig) -> TTLCache[ShowCacheKey, str] | None:
+    if config.dbt_cli_show_cache_ttl <= 0:
+        return None
+    return TTLCache(
+        ttl_seconds=config.dbt_cli_show_cache_ttl,
+        max_entries=config.dbt_cli_show_cache_max_entries,
+        max_bytes=config.dbt_cli_show_cache_max_bytes,
+    )
@@ -1,12 +1,69 @@
+import asyncio
+import contextlib
 import os
-import subprocess
-from collections.abc import Iterable, Sequence
+from collections.abc import Callable, Iterable, Sequence
 
 from mcp.server.fastmcp import FastMCP
 from pydantic import Field
 
 from dbt_mcp.config.config import DbtCliConfig
+from dbt_mcp.dbt_cli.embedded_runner import create_embedded_runner
+from dbt_mcp.dbt_cli.log_events import parse_log_line, quiet_output_line
+from dbt_mcp.dbt_cli.manifest_index import ManifestIndex
+from dbt_mcp.dbt_cli.project import fingerprint_project
+from dbt_mcp.dbt_cli.run_results import (
+    read_run_results,
+    run_results_mtime,
+    run_results_path,
+    summarize_run_results,
+)
+from dbt_mcp.dbt_cli.scheduler import DbtCommandScheduler
+from dbt_mcp.dbt_cli.show_cache import create_show_cache, is_show_output
 from dbt_mcp.prompts.prompts import get_prompt
+from dbt_mcp.sql.normalize import normalize_sql
+from dbt_mcp.stats.stats import register_stats
+from dbt_mcp.tools.streaming import (
+    OutputEvent,
+    OutputListener,
+    OutputRingBuffer,
+    output_listener,
+    publish_output,
+)
+
+# Maximum length of a single line of dbt output
+MAX_LINE_BYTES = 16 * 1024 * 1024
+
+
+async def _read_output(
+    process: asyncio.subprocess.Process,
+    output: OutputRingBuffer,
+    listener: OutputListener | None,
+) -> None:
+    assert process.stdout is not None
+    async for raw_line in process.stdout:
+        line = raw_line.decode(errors="replace")
+        if listener is None:
+            output.append(line)
+            continue
+        event = parse_log_line(line)
+        quiet_line = quiet_output_line(event)
+        if quiet_line is not None:
+            output.append(quiet_line)
+        await publish_output(listener, event)
+    await process.wait()
+
+
+def _threadsafe_publisher(
+    listener: OutputListener | None,
+) -> Callable[[OutputEvent], None] | None:
+    if listener is None:
+        return None
+    loop = asyncio.get_running_loop()
+
+    def publish(event: OutputEvent) -> None:
+        asyncio.run_coroutine_threadsafe(publish_output(listener, event), loop)
+
+    return publish
 
 
 def register_dbt_cli_tools(
@@ -14,12 +71,59 @@ def register_dbt_cli_tools(
     config: DbtCliConfig,
     exclude_tools: Sequence[str] = [],
 ) -> None:
-    def _run_dbt_command(
+    # Bounds the number of dbt commands running at once, overall and per
+    # command. Commands are executed as asyncio subprocesses so a long-running
+    # command (e.g. `build`) doesn't block the event loop serving other calls.
+    scheduler = DbtCommandScheduler(
+        max_concurrency=config.dbt_cli_max_concurrency,
+        command_concurrency=config.dbt_cli_command_concurrency,
+        max_queued=config.dbt_cli_max_queued_commands,
+    )
+    register_stats("dbt_cli_scheduler", scheduler.stats)
+    # Only set when DBT_CLI_BACKEND=embedded and DBT_PATH points to dbt Core
+    embedded_runner = create_embedded_runner(config)
+    manifest_index = (
+        ManifestIndex(config.project_dir) if config.dbt_cli_use_manifest_index else None
+    )
+    # Only set when DBT_CLI_SHOW_CACHE_TTL is positive
+    show_cache = create_show_cache(config)
+    if show_cache is not None:
+        register_stats("dbt_cli_show_cache", show_cache.stats)
+
+    async def _run_subprocess(
+        full_command: list[str],
+        cwd_path: str | None,
+        timeout: int | None,
+        listener: OutputListener | None,
+    ) -> str:
+        process = await asyncio.create_subprocess_exec(
+            config.dbt_path,
+            *full_command,
+            cwd=cwd_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            limit=MAX_LINE_BYTES,
+        )
+        output = OutputRingBuffer(config.dbt_cli_output_max_bytes)
+        try:
+            await asyncio.wait_for(
+                _read_output(process, output, listener), timeout=timeout
+            )
+        except (TimeoutError, asyncio.CancelledError):
+            # The process may have exited already
+            with contextlib.suppress(ProcessLookupError):
+                process.kill()
+            await process.wait()
+            raise
+        return output.text() or "OK"
+
+    async def _run_dbt_command(
         command: list[str],
         selector: str | None = None,
         timeout: int | None = None,
         resource_type: list[str] | None = None,
         is_selectable: bool = False,
+        summarize: bool = False,
     ) -> str:
         try:
             # Commands that should always be quiet to reduce output verbosity
@@ -42,26 +146,56 @@ def register_dbt_cli_tools(
 
             full_command = command.copy()
             # Add --quiet flag to specific commands to reduce context window usage
+            listener = output_listener.get()
             if len(full_command) > 0 and full_command[0] in verbose_commands:
                 main_command = full_command[0]
                 command_args = full_command[1:] if len(full_command) > 1 else []
-                full_command = [main_command, "--quiet", *command_args]
+                if listener is None:
+                    full_command = [main_command, "--quiet", *command_args]
+                else:
+                    # Stream every structured log line to the listener, the
+                    # result still only contains what --quiet would print
+                    full_command = [
+                        main_command,
+                        "--log-format",
+                        "json",
+                        *command_args,
+                    ]
 
             # We change the path only if this is an absolute path, otherwise we can have
             # problems with relative paths applied multiple times as DBT_PROJECT_DIR
             # is applied to dbt Core and Fusion as well (but not the dbt Cloud CLI)
             cwd_path = config.project_dir if os.path.isabs(config.project_dir) else None
 
-            process = subprocess.Popen(
-                args=[config.dbt_path, *full_command],
-                cwd=cwd_path,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-            )
-            output, _ = process.communicate(timeout=timeout)
-            return output or "OK"
-        except subprocess.TimeoutExpired:
+            # Summaries are built from the run_results.json written by this
+            # command, so a file left over from an earlier command is ignored
+            summarize = summarize and config.dbt_cli_result_format == "summary"
+            results_path = run_results_path(config.project_dir)
+
+            async with scheduler.slot(command[0]):
+                previous_results_mtime = (
+                    run_results_mtime(results_path) if summarize else None
+                )
+                if embedded_runner is not None:
+                    output_text = await embedded_runner.invoke(
+                        full_command,
+                        timeout=timeout,
+                        on_event=_threadsafe_publisher(listener),
+                    )
+                else:
+                    output_text = await _run_subprocess(
+                        full_command, cwd_path, timeout, listener
+                    )
+                if summarize:
+                    run_results = read_run_results(
+                        results_path, previous_results_mtime, command[0]
+                    )
+                    if run_results is not None:
+                        return summarize_run_results(
+                            run_results, config.dbt_cli_result_max_nodes
+                        )
+            return output_text
+        except TimeoutError:
             return "Timeout: dbt command took too long to complete." + (
                 " Try using a specific selector to narrow down the results."
                 if is_selectable
@@ -71,23 +205,25 @@ def register_dbt_cli_tools(
             return str(e)
 
     @dbt_mcp.tool(description=get_prompt("dbt_cli/build"))
-    def build(
+    async def build(
         selector: str | None = Field(
             default=None, description=get_prompt("dbt_cli/args/selectors")
         ),
     ) -> str:
-        return _run_dbt_command(["build"], selector, is_selectable=True)
+        return await _run_dbt_command(
+            ["build"], selector, is_selectable=True, summarize=True
+        )
 
     @dbt_mcp.tool(description=get_prompt("dbt_cli/compile"))
-    def compile() -> str:
-        return _run_dbt_command(["compile"])
+    async def compile() -> str:
+        return await _run_dbt_command(["compile"])
 
     @dbt_mcp.tool(description=get_prompt("dbt_cli/docs"))
-    def docs() -> str:
-        return _run_dbt_command(["docs", "generate"])
+    async def docs() -> str:
+        return await _run_dbt_command(["docs", "generate"])
 
     @dbt_mcp.tool(name="list", description=get_prompt("dbt_cli/list"))
-    def ls(
+    async def ls(
         selector: str | None = Field(
             default=None, description=get_prompt("dbt_cli/args/selectors")
         ),
@@ -96,7 +232,15 @@ def register_dbt_cli_tools(
             description=get_prompt("dbt_cli/args/resource_type"),
         ),
     ) -> str:
-        return _run_dbt_command(
+        if manifest_index is not None:
+            # Answered from target/manifest.json when possible. An empty
+            # selection goes through dbt so it reports the error.
+            selected = await asyncio.to_thread(
+                manifest_index.list_nodes, selector, resource_type
+            )
+            if selected:
+                return "\n".join(selected)
+        return await _run_dbt_command(
             ["list"],
             selector,
             timeout=config.dbt_cli_timeout,
@@ -105,31 +249,38 @@ def register_dbt_cli_tools(
         )
 
     @dbt_mcp.tool(description=get_prompt("dbt_cli/parse"))
-    def parse() -> str:
-        return _run_dbt_command(["parse"])
+    async def parse() -> str:
+        return await _run_dbt_command(["parse"])
 
     @dbt_mcp.tool(description=get_prompt("dbt_cli/run"))
-    def run(
+    async def run(
         selector: str | None = Field(
             default=None, description=get_prompt("dbt_cli/args/selectors")
         ),
     ) -> str:
-        return _run_dbt_command(["run"], selector, is_selectable=True)
+        return await _run_dbt_command(
+            ["run"], selector, is_selectable=True, summarize=True
+        )
 
     @dbt_mcp.tool(description=get_prompt("dbt_cli/test"))
-    def test(
+    async def test(
         selector: str | None = Field(
             default=None, description=get_prompt("dbt_cli/args/selectors")
         ),
     ) -> str:
-        return _run_dbt_command(["test"], selector, is_selectable=True)
+        return await _run_dbt_command(
+            ["test"], selector, is_selectable=True, summarize=True
+        )
 
     @dbt_mcp.tool(description=get_prompt("dbt_cli/show"))
-    def show(
+    async def show(
         sql_query: str = Field(description=get_prompt("dbt_cli/args/sql_query")),
         limit: int | None = Field(
             default=None, description=get_prompt("dbt_cli/args/limit")
         ),
+        use_cache: bool = Field(
+            default=True, description=get_prompt("dbt_cli/args/use_cache")
+        ),
     ) -> str:
         args = ["show", "--inline", sql_query, "--favor-state"]
         # This is quite crude, but it should be okay for now
@@ -147,4 +298,22 @@ def register_dbt_cli_tools(
         if cli_limit is not None:
             args.extend(["--limit", str(cli_limit)])
         args.extend(["--output", "json"])
-        return _run_dbt_command(args)
+        if show_cache is None:
+            return await _run_dbt_command(args)
+
+        # Results are cached until the TTL expires or a file of the project
+        # changes. The query is still run when the client bypasses the cache,
+        # and its results are cached for later calls.
+        cache_key = (
+            normalize_sql(sql_query),
+            cli_limit,
+            await asyncio.to_thread(fingerprint_project, config.project_dir),
+        )
+        if use_cache:
+            cached_output = show_cache.get(cache_key)
+            if cached_output is not None:
+                return cached_output
+        output = await _run_dbt_command(args)
+        if is_show_output(output):
+            show_cache.set(cache_key, output)
+        return output
@@ -0,0 +1,115 @@
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+from dbt_mcp.cache.cache import TTLCache
+from dbt_mcp.discovery.client import AsyncQueryExecutor, GraphQLQueries
+
+logger = logging.getLogger(__name__)
+
+# Query and JSON encoded variables, which include the environment ID
+QueryCacheKey = tuple[str, str]
+
+
+class CachedMetadataAPIClient:
+    """Caches the results of Discovery API queries.
+
+    The applied state of an environment only changes when a job runs, so
+    results are kept until the TTL expires or the `lastUpdatedAt` of the
+    environment changes, which is checked at most every `check_interval`
+    seconds. Concurrent identical queries are sent only once.
+    """
+
+    def __init__(
+        self,
+        api_client: AsyncQueryExecutor,
+        environment_id: int,
+        ttl_seconds: float,
+        max_entries: int,
+        check_interval: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.api_client = api_client
+        self.environment_id = environment_id
+        self.check_interval = check_interval
+        self._clock = clock
+        self._cache: TTLCache[QueryCacheKey, dict] = TTLCache(
+            ttl_seconds=ttl_seconds, max_entries=max_entries, clock=clock
+        )
+        self._in_flight: dict[QueryCacheKey, asyncio.Task[dict]] = {}
+        self._last_updated_at: str | None = None
+        self._last_checked_at: float | None = None
+        self._check_task: asyncio.Task[None] | None = None
+        # Incremented on invalidation, so queries sent before don't store
+        # their (possibly outdated) results
+        self._generation = 0
+        self._deduplicated = 0
+        self._invalidations = 0
+
+    async def execute_query(self, query: str, variables: dict) -> dict:
+        await self._check_environment()
+        key = (query, json.dumps(variables, sort_keys=True))
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        # A caller being cancelled doesn't cancel the query for the others
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(key, query, variables))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self._deduplicated += 1
+        return await asyncio.shield(task)
+
+    async def _fetch(self, key: QueryCacheKey, query: str, variables: dict) -> dict:
+        generation = self._generation
+        result = await self.api_client.execute_query(query, variables)
+        if not result.get("errors") and generation == self._generation:
+            self._cache.set(key, result)
+        return result
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._invalidations += 1
+        self._cache.invalidate()
+
+    def stats(self) -> dict[str, Any]:
+        return self._cache.stats() | {
+            "deduplicated": self._deduplicated,
+            "invalidations": self._invalidations,
+        }
+
+    async def _check_environment(self) -> None:
+        now = self._clock()
+        if (
+            self._last_checked_at is not None
+            and now - self._last_checked_at < self.check_interval
+        ):
+            return
+        # Concurrent queries wait for the same check
+        if self._check_task is None or self._check_task.done():
+            self._check_task = asyncio.ensure_future(self._fetch_last_updated_at())
+        await asyncio.shield(self._check_task)
+
+    async def _fetch_last_updated_at(self) -> None:
+        try:
+            result = await self.api_client.execute_query(
+                GraphQLQueries.GET_ENVIRONMENT_LAST_UPDATED,
+                {"environmentId": self.environment_id},
+            )
+            last_updated_at = result["data"]["environment"]["applied"]["lastUpdatedAt"]
+        except Exception as e:
+            # Cached results still expire with the TTL
+            logger.warning(f"Failed to check if the environment was updated: {e}")
+            return
+        finally:
+            self._last_checked_at = self._clock()
+        if last_updated_at != self._last_updated_at:
+            if self._last_updated_at is not None:
+                self.invalidate()
+            self._last_updated_at = last_updated_at
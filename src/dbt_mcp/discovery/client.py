@@ -1,34 +1,135 @@
+import asyncio
+import functools
 import textwrap
-from typing import Literal, TypedDict
-
-import requests
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Collection,
+    Sequence,
+)
+from typing import Literal, Protocol, TypedDict
 
+from dbt_mcp.config.config import HttpClientConfig
 from dbt_mcp.gql.errors import raise_gql_error
+from dbt_mcp.gql.http_client import (
+    async_post_with_retries,
+    create_async_http_client,
+)
 
 PAGE_SIZE = 100
 MAX_NUM_MODELS = 1000
+# Maximum number of aliased root fields in a query for models by name
+MAX_MODELS_BY_NAME_PER_QUERY = 25
+# The lineage is fetched in full, so it isn't bounded by MAX_NUM_MODELS
+MAX_NUM_LINEAGE_MODELS = 50_000
 
+# Types of the parents and children of models
+NESTED_NODE_TYPES = (
+    "ExposureAppliedStateNestedNode",
+    "ExternalModelNode",
+    "MacroDefinitionNestedNode",
+    "MetricDefinitionNestedNode",
+    "ModelAppliedStateNestedNode",
+    "SavedQueryDefinitionNestedNode",
+    "SeedAppliedStateNestedNode",
+    "SemanticModelDefinitionNestedNode",
+    "SnapshotAppliedStateNestedNode",
+    "SourceAppliedStateNestedNode",
+    "TestAppliedStateNestedNode",
+)
+LINEAGE_NESTED_FIELDS = (
+    "{\n"
+    + "".join(
+        f"... on {node_type} {{ uniqueId name resourceType }}\n"
+        for node_type in NESTED_NODE_TYPES
+    )
+    + "}\n"
+)
 
-class GraphQLQueries:
-    GET_MODELS = textwrap.dedent("""
-        query GetModels(
+
+def models_query(operation_name: str, node_fields: str) -> str:
+    """Query for the models matching `$modelsFilter`."""
+    return (
+        textwrap.dedent(f"""
+        query {operation_name}(
+            $environmentId: BigInt!,
+            $modelsFilter: ModelAppliedFilter
+            $first: Int,
+        ) {{
+            environment(id: $environmentId) {{
+                applied {{
+                    models(filter: $modelsFilter, first: $first) {{
+                        edges {{
+                            node {{
+    """)
+        + node_fields
+        + textwrap.dedent("""
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    """)
+    )
+
+
+# Groups of fields of the model details that can be selected, in the order
+# they are queried. The name and unique ID are always selected.
+ModelDetailsField = Literal["compiled_code", "metadata", "columns"]
+MODEL_DETAILS_FIELD_GROUPS: dict[ModelDetailsField, str] = {
+    "compiled_code": "compiledCode\n",
+    "metadata": "description\ndatabase\nschema\n",
+    "columns": textwrap.dedent("""\
+        catalog {
+            columns {
+                description
+                name
+                type
+            }
+        }
+    """),
+}
+
+
+def model_details_fields(fields: Collection[ModelDetailsField] | None = None) -> str:
+    """Node fields of the model details in `fields`, all of them if empty."""
+    return "name\nuniqueId\n" + "".join(
+        group_fields
+        for field, group_fields in MODEL_DETAILS_FIELD_GROUPS.items()
+        if not fields or field in fields
+    )
+
+
+@functools.lru_cache(maxsize=16)
+def model_details_query(fields: frozenset[ModelDetailsField]) -> str:
+    return models_query("GetModelDetails", model_details_fields(fields))
+
+
+def models_page_query(operation_name: str, node_fields: str) -> str:
+    """Query for a page of the models matching `$modelsFilter`."""
+    return (
+        textwrap.dedent(f"""
+        query {operation_name}(
             $environmentId: BigInt!,
             $modelsFilter: ModelAppliedFilter,
             $after: String,
             $first: Int,
             $sort: AppliedModelSort
-        ) {
-            environment(id: $environmentId) {
-                applied {
-                    models(filter: $modelsFilter, after: $after, first: $first, sort: $sort) {
-                        pageInfo {
+        ) {{
+            environment(id: $environmentId) {{
+                applied {{
+                    models(filter: $modelsFilter, after: $after, first: $first, sort: $sort) {{
+                        pageInfo {{
                             endCursor
-                        }
-                        edges {
-                            node {
-                                name
-                                uniqueId
-                                description
+                            hasNextPage
+                        }}
+                        edges {{
+                            node {{
+    """)
+        + node_fields
+        + textwrap.dedent("""
                             }
                         }
                     }
@@ -36,34 +137,63 @@ class GraphQLQueries:
             }
         }
     """)
+    )
 
-    GET_MODEL_DETAILS = textwrap.dedent("""
-        query GetModelDetails(
-            $environmentId: BigInt!,
-            $modelsFilter: ModelAppliedFilter
-            $first: Int,
-        ) {
+
+@functools.lru_cache(maxsize=256)
+def models_by_identifier_query(
+    operation_name: str, node_fields: str, num_models: int
+) -> str:
+    """Query for several models by name, each one in an aliased root field
+    `model<i>` filtered on the `$identifier<i>` variable."""
+    variables = "".join(f"    $identifier{i}: String,\n" for i in range(num_models))
+    roots = "".join(
+        f"model{i}: models(filter: {{identifier: $identifier{i}}}, first: 1) {{\n"
+        + "edges {\nnode {\n"
+        + node_fields
+        + "}\n}\n}\n"
+        for i in range(num_models)
+    )
+    return (
+        f"query {operation_name}(\n    $environmentId: BigInt!,\n{variables}) {{\n"
+        + "environment(id: $environmentId) {\napplied {\n"
+        + roots
+        + "}\n}\n}\n"
+    )
+
+
+class GraphQLQueries:
+    GET_MODELS = models_page_query(
+        "GetModels",
+        textwrap.dedent("""\
+            name
+            uniqueId
+            description
+        """),
+    )
+
+    # Everything search_models indexes
+    GET_MODELS_SEARCH_FIELDS = models_page_query(
+        "GetModelsSearchFields",
+        textwrap.dedent("""\
+            name
+            uniqueId
+            description
+            catalog {
+                columns {
+                    name
+                }
+            }
+        """),
+    )
+
+    MODEL_DETAILS_FIELDS = model_details_fields()
+
+    GET_ENVIRONMENT_LAST_UPDATED = textwrap.dedent("""
+        query GetEnvironmentLastUpdated($environmentId: BigInt!) {
             environment(id: $environmentId) {
                 applied {
-                    models(filter: $modelsFilter, first: $first) {
-                        edges {
-                            node {
-                                name
-                                uniqueId
-                                compiledCode
-                                description
-                                database
-                                schema
-                                catalog {
-                                    columns {
-                                        description
-                                        name
-                                        type
-                                    }
-                                }
-                            }
-                        }
-                    }
+                    lastUpdatedAt
                 }
             }
         }
@@ -128,55 +258,49 @@ class GraphQLQueries:
         }
     """)
 
-    GET_MODEL_PARENTS = (
+    MODEL_PARENTS_FIELDS = (
         textwrap.dedent("""
-        query GetModelParents(
-            $environmentId: BigInt!,
-            $modelsFilter: ModelAppliedFilter
-            $first: Int,
-        ) {
-            environment(id: $environmentId) {
-                applied {
-                    models(filter: $modelsFilter, first: $first) {
-                        pageInfo {
-                            endCursor
-                        }
-                        edges {
-                            node {
-                                parents
+        name
+        uniqueId
+        parents
     """)
         + COMMON_FIELDS_PARENTS_CHILDREN
-        + textwrap.dedent("""
-                                }
-                            }
-                        }
-                    }
-                }
-            }
-        }
+        + "}\n"
+    )
+
+    MODEL_CHILDREN_FIELDS = (
+        textwrap.dedent("""
+        name
+        uniqueId
+        children
     """)
+        + COMMON_FIELDS_PARENTS_CHILDREN
+        + "}\n"
     )
 
-    GET_MODEL_CHILDREN = (
+    GET_MODELS_LINEAGE = (
         textwrap.dedent("""
-        query GetModelChildren(
+        query GetModelsLineage(
             $environmentId: BigInt!,
-            $modelsFilter: ModelAppliedFilter
-            $first: Int,
+            $after: String,
+            $first: Int
         ) {
             environment(id: $environmentId) {
                 applied {
-                    models(filter: $modelsFilter, first: $first) {
+                    models(after: $after, first: $first) {
                         pageInfo {
                             endCursor
                         }
                         edges {
                             node {
-                                children
+                                uniqueId
+                                name
+                                parents
     """)
-        + COMMON_FIELDS_PARENTS_CHILDREN
+        + LINEAGE_NESTED_FIELDS
+        + "children\n"
+        + LINEAGE_NESTED_FIELDS
         + textwrap.dedent("""
-                                }
                             }
                         }
                     }
@@ -186,128 +310,354 @@ class GraphQLQueries:
     """)
     )
 
+    GET_MODEL_DETAILS = model_details_query(frozenset())
+    GET_MODEL_PARENTS = models_query("GetModelParents", MODEL_PARENTS_FIELDS)
+    GET_MODEL_CHILDREN = models_query("GetModelChildren", MODEL_CHILDREN_FIELDS)
 
-class MetadataAPIClient:
-    def __init__(self, *, url: str, headers: dict[str, str]):
+
+class AsyncQueryExecutor(Protocol):
+    async def execute_query(self, query: str, variables: dict) -> dict: ...
+
+
+class AsyncMetadataAPIClient:
+    def __init__(
+        self,
+        *,
+        url: str,
+        headers: dict[str, str],
+        http_client_config: HttpClientConfig | None = None,
+    ):
         self.url = url
         self.headers = headers
+        self.http_client_config = http_client_config or HttpClientConfig()
+        self.http_client = create_async_http_client(self.http_client_config)
+        # Queries beyond the size of the pool would wait for a connection
+        # and could time out before being sent
+        self._concurrency_limit = asyncio.Semaphore(self.http_client_config.pool_size)
 
-    def execute_query(self, query: str, variables: dict) -> dict:
-        response = requests.post(
-            url=self.url,
-            json={"query": query, "variables": variables},
-            headers=self.headers,
-        )
+    async def execute_query(self, query: str, variables: dict) -> dict:
+        async with self._concurrency_limit:
+            response = await async_post_with_retries(
+                self.http_client,
+                self.http_client_config,
+                url=self.url,
+                json={"query": query, "variables": variables},
+                headers=self.headers,
+            )
         return response.json()
 
+    async def close(self) -> None:
+        await self.http_client.aclose()
+
 
 class ModelFilter(TypedDict, total=False):
     modelingLayer: Literal["marts"] | None
 
 
-class ModelsFetcher:
-    def __init__(self, api_client: MetadataAPIClient, environment_id: int):
+class ModelsPage(TypedDict):
+    models: list[dict]
+    # Cursor to pass to get the next page, None on the last page
+    next_cursor: str | None
+
+
+def _parse_response_to_json(result: dict) -> list[dict]:
+    raise_gql_error(result)
+    edges = result["data"]["environment"]["applied"]["models"]["edges"]
+    parsed_edges: list[dict] = []
+    if not edges:
+        return parsed_edges
+    if result.get("errors"):
+        raise Exception(f"GraphQL query failed: {result['errors']}")
+    for edge in edges:
+        if not isinstance(edge, dict) or "node" not in edge:
+            continue
+        node = edge["node"]
+        if not isinstance(node, dict):
+            continue
+        parsed_edges.append(node)
+    return parsed_edges
+
+
+def _models_page_variables(
+    environment_id: int,
+    model_filter: ModelFilter | None,
+    after_cursor: str,
+    page_size: int = PAGE_SIZE,
+) -> dict:
+    return {
+        "environmentId": environment_id,
+        "after": after_cursor,
+        "first": page_size,
+        "modelsFilter": model_filter or {},
+        "sort": {"field": "queryUsageCount", "direction": "desc"},
+    }
+
+
+def _end_cursor(result: dict) -> str:
+    return result["data"]["environment"]["applied"]["models"]["pageInfo"]["endCursor"]
+
+
+def _models_page(result: dict, after_cursor: str) -> ModelsPage:
+    models = _parse_response_to_json(result)
+    page_info = result["data"]["environment"]["applied"]["models"]["pageInfo"]
+    end_cursor = page_info["endCursor"]
+    # The cursor stops moving past the last page if hasNextPage isn't set
+    is_last_page = (
+        page_info.get("hasNextPage") is False
+        or not models
+        or not end_cursor
+        or end_cursor == after_cursor
+    )
+    return {"models": models, "next_cursor": None if is_last_page else end_cursor}
+
+
+def _model_variables(
+    environment_id: int, model_name: str, unique_id: str | None
+) -> dict:
+    model_filters: dict[str, list[str] | str] = (
+        {"uniqueIds": [unique_id]} if unique_id else {"identifier": model_name}
+    )
+    return {
+        "environmentId": environment_id,
+        "modelsFilter": model_filters,
+        "first": 1,
+    }
+
+
+def _chunks(items: Sequence[str], size: int) -> list[Sequence[str]]:
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def _first_model(result: dict) -> dict | None:
+    raise_gql_error(result)
+    edges = result["data"]["environment"]["applied"]["models"]["edges"]
+    if not edges:
+        return None
+    return edges[0]["node"]
+
+
+class AsyncModelsFetcher:
+    """Runs queries without blocking the event loop. Queries for several
+    models run concurrently."""
+
+    def __init__(self, api_client: AsyncQueryExecutor, environment_id: int):
         self.api_client = api_client
         self.environment_id = environment_id
 
-    def _parse_response_to_json(self, result: dict) -> list[dict]:
-        raise_gql_error(result)
-        edges = result["data"]["environment"]["applied"]["models"]["edges"]
-        parsed_edges: list[dict] = []
-        if not edges:
-            return parsed_edges
-        if result.get("errors"):
-            raise Exception(f"GraphQL query failed: {result['errors']}")
-        for edge in edges:
-            if not isinstance(edge, dict) or "node" not in edge:
-                continue
-            node = edge["node"]
-            if not isinstance(node, dict):
-                continue
-            parsed_edges.append(node)
-        return parsed_edges
+    async def fetch_models(self, model_filter: ModelFilter | None = None) -> list[dict]:
+        """The first MAX_NUM_MODELS models, see `iter_models_pages` to go
+        through all of them."""
+        all_edges: list[dict] = []
+        async for page in self.iter_models_pages(model_filter):
+            all_edges.extend(page["models"])
+            if len(all_edges) >= MAX_NUM_MODELS:
+                break
+        return all_edges
 
-    def fetch_models(self, model_filter: ModelFilter | None = None) -> list[dict]:
-        has_next_page = True
+    async def fetch_models_page(
+        self,
+        model_filter: ModelFilter | None = None,
+        cursor: str | None = None,
+        page_size: int = PAGE_SIZE,
+        query: str = GraphQLQueries.GET_MODELS,
+    ) -> ModelsPage:
+        """A page of models, with the fields selected by `query`, a query
+        built with `models_page_query`."""
+        after_cursor = cursor or ""
+        result = await self.api_client.execute_query(
+            query,
+            _models_page_variables(
+                self.environment_id, model_filter, after_cursor, page_size
+            ),
+        )
+        return _models_page(result, after_cursor)
+
+    async def iter_models_pages(
+        self,
+        model_filter: ModelFilter | None = None,
+        cursor: str | None = None,
+        query: str = GraphQLQueries.GET_MODELS,
+    ) -> AsyncIterator[ModelsPage]:
+        """Pages of models, each one fetched when the previous one was
+        consumed, so only one page is held in memory at a time."""
+        # Pages can't be requested concurrently, as each one starts at the
+        # cursor returned with the previous one
+        while True:
+            page = await self.fetch_models_page(model_filter, cursor, query=query)
+            yield page
+            if page["next_cursor"] is None:
+                return
+            cursor = page["next_cursor"]
+
+    async def fetch_models_lineage(self) -> list[dict]:
+        """All models with the unique ID, name and resource type of their
+        parents and children."""
         after_cursor: str = ""
         all_edges: list[dict] = []
-        while has_next_page and len(all_edges) < MAX_NUM_MODELS:
-            variables = {
-                "environmentId": self.environment_id,
-                "after": after_cursor,
-                "first": PAGE_SIZE,
-                "modelsFilter": model_filter or {},
-                "sort": {"field": "queryUsageCount", "direction": "desc"},
-            }
-
-            result = self.api_client.execute_query(GraphQLQueries.GET_MODELS, variables)
-            all_edges.extend(self._parse_response_to_json(result))
+        while len(all_edges) < MAX_NUM_LINEAGE_MODELS:
+            result = await self.api_client.execute_query(
+                GraphQLQueries.GET_MODELS_LINEAGE,
+                {
+                    "environmentId": self.environment_id,
+                    "after": after_cursor,
+                    "first": PAGE_SIZE,
+                },
+            )
+            all_edges.extend(_parse_response_to_json(result))
 
             previous_after_cursor = after_cursor
-            after_cursor = result["data"]["environment"]["applied"]["models"][
-                "pageInfo"
-            ]["endCursor"]
+            after_cursor = _end_cursor(result)
             if previous_after_cursor == after_cursor:
-                has_next_page = False
+                break
 
         return all_edges
 
-    def fetch_model_details(
-        self, model_name: str, unique_id: str | None = None
+    async def fetch_model_details(
+        self,
+        model_name: str,
+        unique_id: str | None = None,
+        fields: Collection[ModelDetailsField] | None = None,
     ) -> dict:
-        model_filters: dict[str, list[str] | str] = (
-            {"uniqueIds": [unique_id]} if unique_id else {"identifier": model_name}
-        )
-        variables = {
-            "environmentId": self.environment_id,
-            "modelsFilter": model_filters,
-            "first": 1,
-        }
-        result = self.api_client.execute_query(
-            GraphQLQueries.GET_MODEL_DETAILS, variables
+        """Details of the model, only the name, unique ID and the groups of
+        fields in `fields` if given."""
+        result = await self.api_client.execute_query(
+            model_details_query(frozenset(fields or ())),
+            _model_variables(self.environment_id, model_name, unique_id),
         )
-        raise_gql_error(result)
-        edges = result["data"]["environment"]["applied"]["models"]["edges"]
-        if not edges:
-            return {}
-        return edges[0]["node"]
+        model = _first_model(result)
+        return model if model is not None else {}
 
-    def fetch_model_parents(
+    async def fetch_model_parents(
         self, model_name: str, unique_id: str | None = None
     ) -> list[dict]:
-        model_filters: dict[str, list[str] | str] = (
-            {"uniqueIds": [unique_id]} if unique_id else {"identifier": model_name}
-        )
-        variables = {
-            "environmentId": self.environment_id,
-            "modelsFilter": model_filters,
-            "first": 1,
-        }
-        result = self.api_client.execute_query(
-            GraphQLQueries.GET_MODEL_PARENTS, variables
+        result = await self.api_client.execute_query(
+            GraphQLQueries.GET_MODEL_PARENTS,
+            _model_variables(self.environment_id, model_name, unique_id),
         )
-        raise_gql_error(result)
-        edges = result["data"]["environment"]["applied"]["models"]["edges"]
-        if not edges:
-            return []
-        return edges[0]["node"]["parents"]
+        model = _first_model(result)
+        return model["parents"] if model is not None else []
 
-    def fetch_model_children(
+    async def fetch_model_children(
         self, model_name: str, unique_id: str | None = None
     ) -> list[dict]:
-        model_filters: dict[str, list[str] | str] = (
-            {"uniqueIds": [unique_id]} if unique_id else {"identifier": model_name}
+        result = await self.api_client.execute_query(
+            GraphQLQueries.GET_MODEL_CHILDREN,
+            _model_variables(self.environment_id, model_name, unique_id),
+        )
+        model = _first_model(result)
+        return model["children"] if model is not None else []
+
+    async def fetch_for_models[T](
+        self,
+        fetch: Callable[[str, str | None], Awaitable[T]],
+        models: Sequence[tuple[str, str | None]],
+    ) -> list[T]:
+        """Calls `fetch` (e.g. `fetch_model_details`) for each model name and
+        unique ID concurrently, returning the results in the same order."""
+        return list(
+            await asyncio.gather(
+                *(fetch(model_name, unique_id) for model_name, unique_id in models)
+            )
+        )
+
+    async def fetch_models_details(
+        self,
+        model_names: Sequence[str] = (),
+        unique_ids: Sequence[str] = (),
+        fields: Collection[ModelDetailsField] | None = None,
+    ) -> dict[str, dict]:
+        """Details of each model, keyed by the given model name or unique ID."""
+        fields = frozenset(fields or ())
+        models = await self._fetch_models_batch(
+            "GetModelsDetails",
+            model_details_fields(fields),
+            model_details_query(fields),
+            model_names,
+            unique_ids,
+        )
+        return {key: model or {} for key, model in models.items()}
+
+    async def fetch_models_parents(
+        self, model_names: Sequence[str] = (), unique_ids: Sequence[str] = ()
+    ) -> dict[str, list[dict]]:
+        models = await self._fetch_models_batch(
+            "GetModelsParents",
+            GraphQLQueries.MODEL_PARENTS_FIELDS,
+            GraphQLQueries.GET_MODEL_PARENTS,
+            model_names,
+            unique_ids,
         )
-        variables = {
-            "environmentId": self.environment_id,
-            "modelsFilter": model_filters,
-            "first": 1,
+        return {key: model["parents"] if model else [] for key, model in models.items()}
+
+    async def fetch_models_children(
+        self, model_names: Sequence[str] = (), unique_ids: Sequence[str] = ()
+    ) -> dict[str, list[dict]]:
+        models = await self._fetch_models_batch(
+            "GetModelsChildren",
+            GraphQLQueries.MODEL_CHILDREN_FIELDS,
+            GraphQLQueries.GET_MODEL_CHILDREN,
+            model_names,
+            unique_ids,
+        )
+        return {
+            key: model["children"] if model else [] for key, model in models.items()
         }
-        result = self.api_client.execute_query(
-            GraphQLQueries.GET_MODEL_CHILDREN, variables
+
+    async def _fetch_models_batch(
+        self,
+        operation_name: str,
+        node_fields: str,
+        query: str,
+        model_names: Sequence[str],
+        unique_ids: Sequence[str],
+    ) -> dict[str, dict | None]:
+        # Unique IDs are fetched with a single filter per page of models, names
+        # with aliased root fields, as models can only be filtered by one name
+        unique_ids = list(dict.fromkeys(unique_ids))
+        model_names = list(dict.fromkeys(model_names))
+        batches = await asyncio.gather(
+            *(
+                self._fetch_by_unique_ids(query, chunk)
+                for chunk in _chunks(unique_ids, PAGE_SIZE)
+            ),
+            *(
+                self._fetch_by_names(operation_name, node_fields, chunk)
+                for chunk in _chunks(model_names, MAX_MODELS_BY_NAME_PER_QUERY)
+            ),
+        )
+        models: dict[str, dict | None] = {}
+        for batch in batches:
+            models |= batch
+        return models
+
+    async def _fetch_by_unique_ids(
+        self, query: str, unique_ids: Sequence[str]
+    ) -> dict[str, dict | None]:
+        result = await self.api_client.execute_query(
+            query,
+            {
+                "environmentId": self.environment_id,
+                "modelsFilter": {"uniqueIds": list(unique_ids)},
+                "first": len(unique_ids),
+            },
+        )
+        nodes = {node["uniqueId"]: node for node in _parse_response_to_json(result)}
+        return {unique_id: nodes.get(unique_id) for unique_id in unique_ids}
+
+    async def _fetch_by_names(
+        self, operation_name: str, node_fields: str, model_names: Sequence[str]
+    ) -> dict[str, dict | None]:
+        result = await self.api_client.execute_query(
+            models_by_identifier_query(operation_name, node_fields, len(model_names)),
+            {
+                "environmentId": self.environment_id,
+                **{f"identifier{i}": name for i, name in enumerate(model_names)},
+            },
         )
         raise_gql_error(result)
-        edges = result["data"]["environment"]["applied"]["models"]["edges"]
-        if not edges:
-            return []
-        return edges[0]["node"]["children"]
+        applied = result["data"]["environment"]["applied"]
+        models: dict[str, dict | None] = {}
+        for i, model_name in enumerate(model_names):
+            edges = applied[f"model{i}"]["edges"]
+            models[model_name] = edges[0]["node"] if edges else None
+        return models
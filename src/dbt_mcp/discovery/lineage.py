@@ -0,0 +1,267 @@
+import time
+from collections import Counter, defaultdict, deque
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from dbt_mcp.discovery.client import AsyncModelsFetcher
+from dbt_mcp.discovery.refresh import EnvironmentSnapshot
+
+Direction = Literal["upstream", "downstream"]
+
+# Macros are dependencies of models, but not part of the lineage
+IGNORED_RESOURCE_TYPES = {"macro"}
+
+
+@dataclass(frozen=True)
+class LineageNode:
+    unique_id: str
+    name: str
+    resource_type: str
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "uniqueId": self.unique_id,
+            "name": self.name,
+            "resourceType": self.resource_type,
+        }
+
+
+def lineage_from_models(
+    models: Iterable[dict],
+) -> tuple[list[LineageNode], list[tuple[str, str]]]:
+    """Nodes and (parent, child) edges of the lineage, from models with
+    their parents and children."""
+    nodes: dict[str, LineageNode] = {}
+    edges: list[tuple[str, str]] = []
+
+    def add_node(node: dict) -> str | None:
+        resource_type = node.get("resourceType") or "model"
+        if not node.get("uniqueId") or resource_type in IGNORED_RESOURCE_TYPES:
+            return None
+        nodes[node["uniqueId"]] = LineageNode(
+            unique_id=node["uniqueId"],
+            name=node.get("name") or "",
+            resource_type=resource_type,
+        )
+        return node["uniqueId"]
+
+    for model in models:
+        model_id = add_node(model)
+        if model_id is None:
+            continue
+        for parent in model.get("parents") or []:
+            if parent_id := add_node(parent):
+                edges.append((parent_id, model_id))
+        for child in model.get("children") or []:
+            if child_id := add_node(child):
+                edges.append((model_id, child_id))
+    return list(nodes.values()), edges
+
+
+class LineageGraph:
+    """Lineage of an environment, with nodes interned as integers and
+    adjacency sets of parents and children.
+
+    `update` replaces the nodes and edges, only touching the adjacency of
+    nodes whose parents changed, so a refresh doesn't rebuild the graph.
+    """
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {}
+        self._nodes: list[LineageNode | None] = []
+        self._parents: list[set[int]] = []
+        self._children: list[set[int]] = []
+        # Slots of removed nodes, reused for new ones
+        self._free: list[int] = []
+        # Versions of a model and models of different packages share their
+        # name, so names map to all the models having them
+        self._models_by_name: defaultdict[str, list[str]] = defaultdict(list)
+        self.num_edges = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def update(
+        self, nodes: Iterable[LineageNode], edges: Iterable[tuple[str, str]]
+    ) -> tuple[int, int]:
+        """Sets the nodes and (parent, child) edges of the graph, returning
+        the number of edges added and removed. Edges must be between the
+        given nodes."""
+        nodes_by_id = {node.unique_id: node for node in nodes}
+        for node in nodes_by_id.values():
+            self._intern(node)
+
+        new_parents: defaultdict[int, set[int]] = defaultdict(set)
+        for parent_id, child_id in edges:
+            new_parents[self._ids[child_id]].add(self._ids[parent_id])
+
+        added = removed = 0
+        for i in self._ids.values():
+            old = self._parents[i]
+            new = new_parents.get(i, set())
+            if old == new:
+                continue
+            for parent in old - new:
+                self._children[parent].discard(i)
+                removed += 1
+            for parent in new - old:
+                self._children[parent].add(i)
+                added += 1
+            self._parents[i] = new
+        self.num_edges += added - removed
+
+        for unique_id in self._ids.keys() - nodes_by_id.keys():
+            i = self._ids.pop(unique_id)
+            self._nodes[i] = None
+            self._free.append(i)
+
+        self._models_by_name = defaultdict(list)
+        for unique_id in sorted(self._ids):
+            node = self._node(self._ids[unique_id])
+            if node.resource_type == "model":
+                self._models_by_name[node.name].append(unique_id)
+        return added, removed
+
+    def find(self, model_name: str, unique_id: str | None = None) -> str:
+        """Unique ID of the node, looked up by model name if not given. The
+        name must only match one model."""
+        if unique_id:
+            if unique_id not in self._ids:
+                raise ValueError(f"Node {unique_id} not found in the lineage")
+            return unique_id
+        unique_ids = self._models_by_name.get(model_name, [])
+        if not unique_ids:
+            raise ValueError(f"Model {model_name} not found in the lineage")
+        if len(unique_ids) > 1:
+            raise ValueError(
+                f"Several models are named {model_name}, pass the unique ID of "
+                + f"one of them: {', '.join(unique_ids)}"
+            )
+        return unique_ids[0]
+
+    def traverse(
+        self, unique_id: str, direction: Direction, max_depth: int | None = None
+    ) -> list[tuple[LineageNode, int]]:
+        """Nodes upstream or downstream of `unique_id` with their distance,
+        closest first."""
+        depths = self._distances(self._ids[unique_id], direction, max_depth)
+        return [(self._node(i), depth) for i, depth in depths.items() if depth > 0]
+
+    def shortest_path(self, from_id: str, to_id: str) -> list[LineageNode] | None:
+        """Shortest path following the lineage downstream or upstream from
+        `from_id` to `to_id`, including both ends."""
+        start, goal = self._ids[from_id], self._ids[to_id]
+        for adjacency in (self._children, self._parents):
+            previous: dict[int, int | None] = {start: None}
+            queue = deque([start])
+            while queue:
+                i = queue.popleft()
+                if i == goal:
+                    path: list[int] = []
+                    current: int | None = i
+                    while current is not None:
+                        path.append(current)
+                        current = previous[current]
+                    return [self._node(j) for j in reversed(path)]
+                for j in adjacency[i]:
+                    if j not in previous:
+                        previous[j] = i
+                        queue.append(j)
+        return None
+
+    def impact(self, unique_id: str, max_depth: int | None = None) -> dict[str, Any]:
+        """Summary of the nodes downstream of `unique_id`."""
+        downstream = self.traverse(unique_id, "downstream", max_depth)
+        return {
+            "total": len(downstream),
+            "maxDepth": max((depth for _, depth in downstream), default=0),
+            "byDepth": dict(Counter(depth for _, depth in downstream)),
+            "byResourceType": dict(
+                Counter(node.resource_type for node, _ in downstream)
+            ),
+            "exposures": [
+                node.to_dict()
+                for node, _ in downstream
+                if node.resource_type == "exposure"
+            ],
+        }
+
+    def _intern(self, node: LineageNode) -> None:
+        i = self._ids.get(node.unique_id)
+        if i is None:
+            if self._free:
+                i = self._free.pop()
+            else:
+                i = len(self._nodes)
+                self._nodes.append(None)
+                self._parents.append(set())
+                self._children.append(set())
+            self._ids[node.unique_id] = i
+        self._nodes[i] = node
+
+    def _node(self, i: int) -> LineageNode:
+        node = self._nodes[i]
+        assert node is not None
+        return node
+
+    def _distances(
+        self, start: int, direction: Direction, max_depth: int | None
+    ) -> dict[int, int]:
+        adjacency = self._parents if direction == "upstream" else self._children
+        depths = {start: 0}
+        queue = deque([start])
+        while queue:
+            i = queue.popleft()
+            depth = depths[i] + 1
+            if max_depth is not None and depth > max_depth:
+                continue
+            for j in adjacency[i]:
+                if j not in depths:
+                    depths[j] = depth
+                    queue.append(j)
+        return depths
+
+
+class LineageFetcher:
+    """Keeps the lineage graph of an environment in memory.
+
+    The models with their parents and children are fetched in bulk, then
+    the graph is updated whenever the environment is, see
+    EnvironmentSnapshot.
+    """
+
+    def __init__(
+        self,
+        models_fetcher: AsyncModelsFetcher,
+        check_interval: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.models_fetcher = models_fetcher
+        self._graph = LineageGraph()
+        self._last_changes: dict[str, int] = {}
+        self._snapshot = EnvironmentSnapshot(
+            models_fetcher.api_client,
+            models_fetcher.environment_id,
+            build=self._update_graph,
+            check_interval=check_interval,
+            name="lineage",
+            clock=clock,
+        )
+
+    async def get_graph(self) -> LineageGraph:
+        return await self._snapshot.get()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "nodes": len(self._graph),
+            "edges": self._graph.num_edges,
+            **self._snapshot.stats(),
+            **self._last_changes,
+        }
+
+    async def _update_graph(self) -> LineageGraph:
+        models = await self.models_fetcher.fetch_models_lineage()
+        added, removed = self._graph.update(*lineage_from_models(models))
+        self._last_changes = {"edges_added": added, "edges_removed": removed}
+        return self._graph
@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from dbt_mcp.discovery.client import AsyncQueryExecutor, GraphQLQueries
+from dbt_mcp.gql.errors import raise_gql_error
+
+logger = logging.getLogger(__name__)
+
+
+class EnvironmentSnapshot[T]:
+    """Value built from the applied state of an environment, like the
+    lineage graph or the search index.
+
+    `build` is called again when the `lastUpdatedAt` of the environment
+    changes, which is checked at most every `check_interval` seconds.
+    Concurrent callers wait for the same refresh, and the previous value
+    keeps being returned if a refresh fails.
+    """
+
+    def __init__(
+        self,
+        api_client: AsyncQueryExecutor,
+        environment_id: int,
+        build: Callable[[], Awaitable[T]],
+        check_interval: float,
+        name: str,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.api_client = api_client
+        self.environment_id = environment_id
+        self.check_interval = check_interval
+        self.name = name
+        self._build = build
+        self._clock = clock
+        self._value: T | None = None
+        self._last_updated_at: str | None = None
+        self._last_checked_at: float | None = None
+        self._refresh_task: asyncio.Task[None] | None = None
+        self._refreshes = 0
+        self._last_refresh_seconds: float | None = None
+
+    async def get(self) -> T:
+        now = self._clock()
+        if (
+            self._value is not None
+            and self._last_checked_at is not None
+            and now - self._last_checked_at < self.check_interval
+        ):
+            return self._value
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._refresh())
+        try:
+            await asyncio.shield(self._refresh_task)
+        except Exception as e:
+            if self._value is None:
+                raise
+            logger.warning(f"Failed to refresh the {self.name}: {e}")
+        assert self._value is not None
+        return self._value
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "refreshes": self._refreshes,
+            "last_refresh_seconds": self._last_refresh_seconds,
+        }
+
+    async def _refresh(self) -> None:
+        try:
+            result = await self.api_client.execute_query(
+                GraphQLQueries.GET_ENVIRONMENT_LAST_UPDATED,
+                {"environmentId": self.environment_id},
+            )
+            raise_gql_error(result)
+            last_updated_at = result["data"]["environment"]["applied"]["lastUpdatedAt"]
+            if self._value is not None and last_updated_at == self._last_updated_at:
+                return
+
+            start = time.perf_counter()
+            value = await self._build()
+        finally:
+            self._last_checked_at = self._clock()
+        self._value = value
+        self._last_updated_at = last_updated_at
+        self._refreshes += 1
+        self._last_refresh_seconds = round(time.perf_counter() - start, 3)
@@ -0,0 +1,160 @@
+import heapq
+import math
+import re
+import time
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from dbt_mcp.discovery.client import AsyncModelsFetcher, GraphQLQueries
+from dbt_mcp.discovery.refresh import EnvironmentSnapshot
+
+# Weight of a token depending on where it appears in a model
+NAME_WEIGHT = 3.0
+COLUMN_WEIGHT = 1.5
+DESCRIPTION_WEIGHT = 1.0
+# Added to the score of models whose name is exactly the query
+EXACT_NAME_BONUS = 10.0
+# Minimum trigram similarity for a query token to match a different token,
+# e.g. a misspelling or a prefix of the token
+MIN_SIMILARITY = 0.4
+PREFIX_SIMILARITY = 0.6
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase alphanumeric tokens, `fct_orders` gives `fct` and `orders`."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def trigrams(token: str) -> set[str]:
+    # Padded so that short tokens have trigrams and prefixes weigh more
+    padded = f"  {token} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class ModelSearchIndex:
+    """Inverted index from tokens of the names, descriptions and column
+    names of models to the models containing them, with a trigram index
+    of the tokens for approximate matches."""
+
+    def __init__(self, models: Iterable[dict]):
+        self._models: list[dict[str, Any]] = []
+        self._models_by_name: defaultdict[str, list[int]] = defaultdict(list)
+        postings: defaultdict[str, dict[int, float]] = defaultdict(dict)
+        for model in models:
+            i = len(self._models)
+            name = model.get("name") or ""
+            description = model.get("description") or ""
+            self._models.append(
+                {
+                    "uniqueId": model.get("uniqueId"),
+                    "name": name,
+                    "description": description,
+                }
+            )
+            self._models_by_name[name.lower()].append(i)
+            columns = (model.get("catalog") or {}).get("columns") or []
+            weights: dict[str, float] = {}
+            for text, weight in (
+                (name, NAME_WEIGHT),
+                (description, DESCRIPTION_WEIGHT),
+                *((column.get("name") or "", COLUMN_WEIGHT) for column in columns),
+            ):
+                for token in tokenize(text):
+                    weights[token] = max(weights.get(token, 0.0), weight)
+            for token, weight in weights.items():
+                postings[token][i] = weight
+
+        self._postings = dict(postings)
+        self._idf = {
+            token: math.log(1 + len(self._models) / len(models_weights))
+            for token, models_weights in self._postings.items()
+        }
+        self._tokens_by_trigram: defaultdict[str, list[str]] = defaultdict(list)
+        for token in self._postings:
+            for trigram in trigrams(token):
+                self._tokens_by_trigram[trigram].append(token)
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def search(self, query: str, top_k: int = 10) -> list[dict[str, Any]]:
+        """The `top_k` best matches of `query`, best first."""
+        scores: defaultdict[int, float] = defaultdict(float)
+        for query_token in set(tokenize(query)):
+            # A query token counts once per model, with its best match
+            token_scores: dict[int, float] = {}
+            for token, similarity in self._matching_tokens(query_token):
+                idf = self._idf[token]
+                for i, weight in self._postings[token].items():
+                    score = similarity * weight * idf
+                    if score > token_scores.get(i, 0.0):
+                        token_scores[i] = score
+            for i, score in token_scores.items():
+                scores[i] += score
+        for i in self._models_by_name.get(query.strip().lower(), []):
+            scores[i] += EXACT_NAME_BONUS
+
+        best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+        return [self._models[i] | {"score": round(score, 3)} for i, score in best]
+
+    def _matching_tokens(self, query_token: str) -> list[tuple[str, float]]:
+        """Indexed tokens similar to `query_token`, with their similarity."""
+        query_trigrams = trigrams(query_token)
+        shared: Counter[str] = Counter()
+        for trigram in query_trigrams:
+            shared.update(self._tokens_by_trigram.get(trigram, ()))
+        matches = []
+        for token, count in shared.items():
+            if token == query_token:
+                similarity = 1.0
+            else:
+                # Jaccard similarity of the trigrams
+                similarity = count / (
+                    len(query_trigrams) + len(trigrams(token)) - count
+                )
+                if len(query_token) >= 3 and token.startswith(query_token):
+                    similarity = max(similarity, PREFIX_SIMILARITY)
+            if similarity >= MIN_SIMILARITY:
+                matches.append((token, similarity))
+        return matches
+
+
+class ModelSearchIndexFetcher:
+    """Keeps the search index of the models of an environment in memory,
+    rebuilt whenever the environment is updated, see EnvironmentSnapshot."""
+
+    def __init__(
+        self,
+        models_fetcher: AsyncModelsFetcher,
+        check_interval: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.models_fetcher = models_fetcher
+        self._num_models = 0
+        self._snapshot = EnvironmentSnapshot(
+            models_fetcher.api_client,
+            models_fetcher.environment_id,
+            build=self._build_index,
+            check_interval=check_interval,
+            name="search index",
+            clock=clock,
+        )
+
+    async def get_index(self) -> ModelSearchIndex:
+        return await self._snapshot.get()
+
+    def stats(self) -> dict[str, Any]:
+        return {"models": self._num_models, **self._snapshot.stats()}
+
+    async def _build_index(self) -> ModelSearchIndex:
+        models: list[dict] = []
+        async for page in self.models_fetcher.iter_models_pages(
+            query=GraphQLQueries.GET_MODELS_SEARCH_FIELDS
+        ):
+            models.extend(page["models"])
+        index = ModelSearchIndex(models)
+        self._num_models = len(index)
+        return index
@@ -1,11 +1,23 @@
 import logging
 from collections.abc import Sequence
+from typing import Literal
 
 from mcp.server.fastmcp import FastMCP
 
 from dbt_mcp.config.config import DiscoveryConfig
-from dbt_mcp.discovery.client import MetadataAPIClient, ModelsFetcher
+from dbt_mcp.discovery.cache import CachedMetadataAPIClient
+from dbt_mcp.discovery.client import (
+    PAGE_SIZE,
+    AsyncMetadataAPIClient,
+    AsyncModelsFetcher,
+    AsyncQueryExecutor,
+    ModelDetailsField,
+    ModelsPage,
+)
+from dbt_mcp.discovery.lineage import LineageFetcher
+from dbt_mcp.discovery.search import ModelSearchIndexFetcher
 from dbt_mcp.prompts.prompts import get_prompt
+from dbt_mcp.stats.stats import register_stats
 from dbt_mcp.tools.definitions import ToolDefinition
 from dbt_mcp.tools.register import register_tools
 from dbt_mcp.tools.tool_names import ToolName
@@ -14,48 +26,173 @@ logger = logging.getLogger(__name__)
 
 
 def create_discovery_tool_definitions(config: DiscoveryConfig) -> list[ToolDefinition]:
-    api_client = MetadataAPIClient(
+    metadata_api_client = AsyncMetadataAPIClient(
         url=config.url,
         headers=config.headers,
+        http_client_config=config.http_client,
     )
-    models_fetcher = ModelsFetcher(
+    api_client: AsyncQueryExecutor = metadata_api_client
+    if config.cache_ttl > 0:
+        cached_api_client = CachedMetadataAPIClient(
+            api_client,
+            environment_id=config.environment_id,
+            ttl_seconds=config.cache_ttl,
+            max_entries=config.cache_max_entries,
+            check_interval=config.cache_check_interval,
+        )
+        register_stats("discovery_cache", cached_api_client.stats)
+        api_client = cached_api_client
+    models_fetcher = AsyncModelsFetcher(
         api_client=api_client, environment_id=config.environment_id
     )
+    # The lineage and the search index are kept in memory, caching their
+    # pages would be redundant
+    lineage_fetcher = LineageFetcher(
+        AsyncModelsFetcher(
+            api_client=metadata_api_client, environment_id=config.environment_id
+        ),
+        check_interval=config.cache_check_interval,
+    )
+    register_stats("discovery_lineage", lineage_fetcher.stats)
+    search_index_fetcher = ModelSearchIndexFetcher(
+        AsyncModelsFetcher(
+            api_client=metadata_api_client, environment_id=config.environment_id
+        ),
+        check_interval=config.cache_check_interval,
+    )
+    register_stats("discovery_search_index", search_index_fetcher.stats)
 
-    def get_mart_models() -> list[dict] | str:
+    async def get_mart_models() -> list[dict] | str:
         try:
-            mart_models = models_fetcher.fetch_models(
+            mart_models = await models_fetcher.fetch_models(
                 model_filter={"modelingLayer": "marts"}
             )
             return [m for m in mart_models if m["name"] != "metricflow_time_spine"]
         except Exception as e:
             return str(e)
 
-    def get_all_models() -> list[dict] | str:
+    async def get_all_models() -> list[dict] | str:
+        try:
+            return await models_fetcher.fetch_models()
+        except Exception as e:
+            return str(e)
+
+    async def get_models_page(
+        cursor: str | None = None, page_size: int = PAGE_SIZE
+    ) -> ModelsPage | str:
         try:
-            return models_fetcher.fetch_models()
+            if not 1 <= page_size <= PAGE_SIZE:
+                raise ValueError(f"page_size must be between 1 and {PAGE_SIZE}")
+            return await models_fetcher.fetch_models_page(
+                cursor=cursor, page_size=page_size
+            )
+        except Exception as e:
+            return str(e)
+
+    async def search_models(query: str, top_k: int = 10) -> list[dict] | str:
+        try:
+            index = await search_index_fetcher.get_index()
+            return index.search(query, top_k)
         except Exception as e:
             return str(e)
 
-    def get_model_details(model_name: str, unique_id: str | None = None) -> dict | str:
+    async def get_model_details(
+        model_name: str,
+        unique_id: str | None = None,
+        fields: list[ModelDetailsField] | None = None,
+    ) -> dict | str:
         try:
-            return models_fetcher.fetch_model_details(model_name, unique_id)
+            return await models_fetcher.fetch_model_details(
+                model_name, unique_id, fields
+            )
         except Exception as e:
             return str(e)
 
-    def get_model_parents(
+    async def get_model_parents(
         model_name: str, unique_id: str | None = None
     ) -> list[dict] | str:
         try:
-            return models_fetcher.fetch_model_parents(model_name, unique_id)
+            return await models_fetcher.fetch_model_parents(model_name, unique_id)
         except Exception as e:
             return str(e)
 
-    def get_model_children(
+    async def get_model_children(
         model_name: str, unique_id: str | None = None
     ) -> list[dict] | str:
         try:
-            return models_fetcher.fetch_model_children(model_name, unique_id)
+            return await models_fetcher.fetch_model_children(model_name, unique_id)
+        except Exception as e:
+            return str(e)
+
+    async def get_model_details_batch(
+        model_names: list[str] | None = None,
+        unique_ids: list[str] | None = None,
+        fields: list[ModelDetailsField] | None = None,
+    ) -> dict[str, dict] | str:
+        try:
+            return await models_fetcher.fetch_models_details(
+                model_names or [], unique_ids or [], fields
+            )
+        except Exception as e:
+            return str(e)
+
+    async def get_model_parents_batch(
+        model_names: list[str] | None = None, unique_ids: list[str] | None = None
+    ) -> dict[str, list[dict]] | str:
+        try:
+            return await models_fetcher.fetch_models_parents(
+                model_names or [], unique_ids or []
+            )
+        except Exception as e:
+            return str(e)
+
+    async def get_model_children_batch(
+        model_names: list[str] | None = None, unique_ids: list[str] | None = None
+    ) -> dict[str, list[dict]] | str:
+        try:
+            return await models_fetcher.fetch_models_children(
+                model_names or [], unique_ids or []
+            )
+        except Exception as e:
+            return str(e)
+
+    async def get_model_lineage(
+        model_name: str,
+        unique_id: str | None = None,
+        direction: Literal["upstream", "downstream"] = "downstream",
+        max_depth: int | None = None,
+    ) -> list[dict] | str:
+        try:
+            graph = await lineage_fetcher.get_graph()
+            nodes = graph.traverse(
+                graph.find(model_name, unique_id), direction, max_depth
+            )
+            return [node.to_dict() | {"depth": depth} for node, depth in nodes]
+        except Exception as e:
+            return str(e)
+
+    async def get_lineage_path(
+        from_model_name: str,
+        to_model_name: str,
+        from_unique_id: str | None = None,
+        to_unique_id: str | None = None,
+    ) -> list[dict] | str:
+        try:
+            graph = await lineage_fetcher.get_graph()
+            path = graph.shortest_path(
+                graph.find(from_model_name, from_unique_id),
+                graph.find(to_model_name, to_unique_id),
+            )
+            return [node.to_dict() for node in path] if path is not None else []
+        except Exception as e:
+            return str(e)
+
+    async def get_model_impact(
+        model_name: str, unique_id: str | None = None, max_depth: int | None = None
+    ) -> dict | str:
+        try:
+            graph = await lineage_fetcher.get_graph()
+            return graph.impact(graph.find(model_name, unique_id), max_depth)
         except Exception as e:
             return str(e)
 
@@ -68,6 +205,14 @@ def create_discovery_tool_definitions(config: DiscoveryConfig) -> list[ToolDefin
             description=get_prompt("discovery/get_all_models"),
             fn=get_all_models,
         ),
+        ToolDefinition(
+            description=get_prompt("discovery/get_models_page"),
+            fn=get_models_page,
+        ),
+        ToolDefinition(
+            description=get_prompt("discovery/search_models"),
+            fn=search_models,
+        ),
         ToolDefinition(
             description=get_prompt("discovery/get_model_details"),
             fn=get_model_details,
@@ -80,6 +225,30 @@ def create_discovery_tool_definitions(config: DiscoveryConfig) -> list[ToolDefin
             description=get_prompt("discovery/get_model_children"),
             fn=get_model_children,
         ),
+        ToolDefinition(
+            description=get_prompt("discovery/get_model_details_batch"),
+            fn=get_model_details_batch,
+        ),
+        ToolDefinition(
+            description=get_prompt("discovery/get_model_parents_batch"),
+            fn=get_model_parents_batch,
+        ),
+        ToolDefinition(
+            description=get_prompt("discovery/get_model_children_batch"),
+            fn=get_model_children_batch,
+        ),
+        ToolDefinition(
+            description=get_prompt("discovery/get_model_lineage"),
+            fn=get_model_lineage,
+        ),
+        ToolDefinition(
+            description=get_prompt("discovery/get_lineage_path"),
+            fn=get_lineage_path,
+        ),
+        ToolDefinition(
+            description=get_prompt("discovery/get_model_impact"),
+            fn=get_model_impact,
+        ),
     ]
 
 
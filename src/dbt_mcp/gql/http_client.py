@@ -0,0 +1,72 @@
+import asyncio
+import logging
+
+import httpx
+
+from dbt_mcp.config.config import HttpClientConfig
+
+logger = logging.getLogger(__name__)
+
+# Rate limiting and transient server errors. GraphQL queries don't have
+# side effects, so they are safe to send again.
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def _use_http2(config: HttpClientConfig) -> bool:
+    if not config.http2:
+        return False
+    try:
+        import h2  # type: ignore[import-not-found]  # noqa: F401
+    except ImportError:
+        logger.warning("h2 is not installed, falling back to HTTP/1.1")
+        return False
+    return True
+
+
+def create_async_http_client(config: HttpClientConfig) -> httpx.AsyncClient:
+    """Client reusing keep-alive connections across requests."""
+    return httpx.AsyncClient(
+        http2=_use_http2(config),
+        limits=httpx.Limits(
+            max_connections=config.pool_size,
+            max_keepalive_connections=config.pool_size,
+        ),
+        timeout=httpx.Timeout(config.timeout, connect=config.connect_timeout),
+    )
+
+
+def retry_delay(
+    config: HttpClientConfig, attempt: int, response: httpx.Response | None
+) -> float:
+    """Exponential backoff, unless the server sent a Retry-After in seconds,
+    up to `retry_max_backoff`."""
+    delay = config.retry_backoff * 2**attempt
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            delay = float(retry_after)
+    return min(delay, config.retry_max_backoff)
+
+
+async def async_post_with_retries(
+    client: httpx.AsyncClient,
+    config: HttpClientConfig,
+    url: str,
+    json: dict,
+    headers: dict[str, str],
+) -> httpx.Response:
+    for attempt in range(config.max_retries + 1):
+        is_last_attempt = attempt == config.max_retries
+        try:
+            response = await client.post(url, json=json, headers=headers)
+        except httpx.TransportError as e:
+            if is_last_attempt:
+                raise
+            logger.info(f"Retrying request to {url} after error: {e}")
+            await asyncio.sleep(retry_delay(config, attempt, None))
+            continue
+        if response.status_code not in RETRY_STATUS_CODES or is_last_attempt:
+            return response
+        logger.info(f"Retrying request to {url} after {response.status_code}")
+        await asyncio.sleep(retry_delay(config, attempt, response))
+    raise AssertionError("unreachable")
@@ -4,17 +4,25 @@ HTTP server entry point for dbt-mcp.
 This serves the MCP server over HTTP instead of stdio.
 """
 import asyncio
+import json
 import logging
 import os
 import subprocess
+from collections.abc import Mapping
 from contextlib import asynccontextmanager
+from typing import Any
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from mcp.server.fastmcp import FastMCP
 
 from dbt_mcp.config.config import load_config
+from dbt_mcp.discovery.client import AsyncMetadataAPIClient, AsyncModelsFetcher
 from dbt_mcp.mcp.server import create_dbt_mcp
+from dbt_mcp.stats.stats import get_stats
+from dbt_mcp.tools.streaming import OutputEvent, output_listener
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +30,15 @@ logger = logging.getLogger(__name__)
 # Global variable to store the MCP server instance
 dbt_mcp_server = None
 
+# Fetcher of the models streamed by /discovery/models and its client, set
+# if the Discovery API is configured
+discovery_models_fetcher = None
+discovery_api_client = None
+
+# Maximum number of output events buffered for a slow streaming client.
+# The oldest events are dropped first so memory stays bounded.
+STREAM_QUEUE_SIZE = 1000
+
 # Add this after your imports and before initialize_mcp_server
 
 async def refresh_dbt_project_internal():
@@ -99,7 +116,7 @@ async def refresh_dbt_project_internal():
 
 async def initialize_mcp_server():
     """Initialize the dbt MCP server"""
-    global dbt_mcp_server
+    global dbt_mcp_server, discovery_models_fetcher, discovery_api_client
     if dbt_mcp_server is None:
         config = load_config()
         # Create MCP server without FastAPI lifespan since it's not an HTTP server
@@ -125,6 +142,17 @@ async def initialize_mcp_server():
         if config.discovery_config:
             logger.info("Registering discovery tools")
             register_discovery_tools(dbt_mcp_server, config.discovery_config, config.disable_tools)
+            # Not cached, streaming the whole catalog would evict every
+            # other query result
+            discovery_api_client = AsyncMetadataAPIClient(
+                url=config.discovery_config.url,
+                headers=config.discovery_config.headers,
+                http_client_config=config.discovery_config.http_client,
+            )
+            discovery_models_fetcher = AsyncModelsFetcher(
+                api_client=discovery_api_client,
+                environment_id=config.discovery_config.environment_id,
+            )
 
         if config.dbt_cli_config:
             logger.info("Registering dbt cli tools")
@@ -157,6 +185,76 @@ async def app_lifespan(app: FastAPI):
         yield
     finally:
         logger.info("Shutting down dbt-mcp HTTP server")
+        if discovery_api_client:
+            await discovery_api_client.close()
+
+def format_tool_result(result) -> dict:
+    """Format the result of a tool call for the HTTP response"""
+    return {
+        "result": {
+            "content": [
+                item.model_dump() if hasattr(item, 'model_dump') else item
+                for item in result
+            ]
+        }
+    }
+
+
+def format_sse(event: str, data: Mapping[str, Any]) -> str:
+    """Format a server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def stream_tool_call(server: FastMCP, tool_name: str, arguments: dict):
+    """Call a tool, streaming its output as server-sent events while it runs"""
+    queue: asyncio.Queue[OutputEvent] = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+
+    async def listener(event: OutputEvent) -> None:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+    # The listener is picked up by the tool through the task's context
+    listener_token = output_listener.set(listener)
+    try:
+        tool_task = asyncio.create_task(server.call_tool(tool_name, arguments))
+    finally:
+        output_listener.reset(listener_token)
+
+    while not tool_task.done():
+        next_event = asyncio.ensure_future(queue.get())
+        await asyncio.wait({next_event, tool_task}, return_when=asyncio.FIRST_COMPLETED)
+        if next_event.done():
+            event = next_event.result()
+            yield format_sse("output", {"message": event.message, "data": event.data})
+        else:
+            next_event.cancel()
+    while not queue.empty():
+        event = queue.get_nowait()
+        yield format_sse("output", {"message": event.message, "data": event.data})
+
+    try:
+        yield format_sse("result", format_tool_result(tool_task.result()))
+    except Exception as e:
+        logger.error(f"Error calling tool {tool_name}: {e}")
+        yield format_sse("error", {"code": -1, "message": str(e)})
+
+
+async def stream_models_pages(models_fetcher: AsyncModelsFetcher, cursor: str | None):
+    """Stream every page of models as server-sent events, one page in memory at a time"""
+    num_models = 0
+    try:
+        async for page in models_fetcher.iter_models_pages(cursor=cursor):
+            num_models += len(page["models"])
+            yield format_sse("page", page)
+            cursor = page["next_cursor"]
+    except Exception as e:
+        logger.error(f"Error streaming models: {e}")
+        # The cursor lets the client resume after the last page it received
+        yield format_sse("error", {"code": -1, "message": str(e), "cursor": cursor})
+        return
+    yield format_sse("done", {"num_models": num_models})
+
 
 def create_http_app() -> FastAPI:
     """Create the FastAPI application with the dbt-mcp server."""
@@ -183,6 +281,26 @@ def create_http_app() -> FastAPI:
     async def health_check():
         return {"status": "ok", "service": "dbt-mcp"}
     
+    # Cache and performance counters of the tools
+    @app.get("/stats")
+    async def stats():
+        return {"stats": get_stats()}
+    
+    # Streams all the models of the Discovery API as server-sent events,
+    # one "page" event per page of models, starting after the given cursor
+    @app.get("/discovery/models")
+    async def stream_models(cursor: str | None = None):
+        if not dbt_mcp_server:
+            await initialize_mcp_server()
+        
+        if not discovery_models_fetcher:
+            return {"error": "The Discovery API is not configured"}
+        
+        return StreamingResponse(
+            stream_models_pages(discovery_models_fetcher, cursor),
+            media_type="text/event-stream"
+        )
+    
     # MCP tools list endpoint
     @app.get("/tools/list")
     async def list_tools():
@@ -198,8 +316,10 @@ def create_http_app() -> FastAPI:
         return {"tools": [tool.model_dump() for tool in tools]}
     
     # MCP tool call endpoint
+    # Set "stream": true in the params or send "Accept: text/event-stream"
+    # to receive the tool output as server-sent events while it runs.
     @app.post("/tools/call")
-    async def call_tool(request: dict):
+    async def call_tool(request: dict, http_request: Request):
         global dbt_mcp_server
         if not dbt_mcp_server:
             # Try to initialize if not already done
@@ -214,16 +334,18 @@ def create_http_app() -> FastAPI:
         if not tool_name:
             return {"error": "Tool name is required"}
         
+        stream = request.get("params", {}).get("stream", False) or (
+            "text/event-stream" in http_request.headers.get("accept", "")
+        )
+        if stream:
+            return StreamingResponse(
+                stream_tool_call(dbt_mcp_server, tool_name, arguments),
+                media_type="text/event-stream"
+            )
+
         try:
             result = await dbt_mcp_server.call_tool(tool_name, arguments)
-            return {
-                "result": {
-                    "content": [
-                        item.model_dump() if hasattr(item, 'model_dump') else item
-                        for item in result
-                    ]
-                }
-            }
+            return format_tool_result(result)
         except Exception as e:
             logger.error(f"Error calling tool {tool_name}: {e}")
             return {
@@ -18,6 +18,7 @@ from dbt_mcp.dbt_cli.tools import register_dbt_cli_tools
 from dbt_mcp.discovery.tools import register_discovery_tools
 from dbt_mcp.remote.tools import register_remote_tools
 from dbt_mcp.semantic_layer.tools import register_sl_tools
+from dbt_mcp.tools.streaming import OutputEvent, OutputListener, output_listener
 from dbt_mcp.tracking.tracking import UsageTracker
 
 logger = logging.getLogger(__name__)
@@ -48,12 +49,33 @@ class DbtMCP(FastMCP):
         self.usage_tracker = usage_tracker
         self.config = config
 
+    def _progress_listener(self) -> OutputListener | None:
+        """Sends tool output as progress notifications if the client asked for it."""
+        try:
+            context = self.get_context()
+            meta = context.request_context.meta
+        except ValueError:
+            # Not called within an MCP request
+            return None
+        if meta is None or meta.progressToken is None:
+            return None
+        progress = 0
+
+        async def listener(event: OutputEvent) -> None:
+            nonlocal progress
+            progress += 1
+            await context.report_progress(progress=progress, message=event.message)
+
+        return listener
+
     async def call_tool(
         self, name: str, arguments: dict[str, Any]
     ) -> Sequence[ContentBlock] | dict[str, Any]:
         logger.info(f"Calling tool: {name}")
         result = None
         start_time = int(time.time() * 1000)
+        listener = self._progress_listener()
+        listener_token = output_listener.set(listener) if listener else None
         try:
             result = await super().call_tool(
                 name,
@@ -79,6 +101,9 @@ class DbtMCP(FastMCP):
                     text=str(e),
                 )
             ]
+        finally:
+            if listener_token is not None:
+                output_listener.reset(listener_token)
         end_time = int(time.time() * 1000)
         logger.info(f"Tool {name} called successfully in {end_time - start_time}ms")
         self.usage_tracker.emit_tool_called_event(
@@ -1,8 +1,11 @@
-from contextlib import AbstractContextManager
-from functools import cache
-from typing import Any, Protocol
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
 
+import dbtsl.env
 import pyarrow as pa
+from dbtsl.api.adbc.client.asyncio import AsyncADBCClient
 from dbtsl.api.shared.query_params import (
     GroupByParam,
     OrderByGroupBy,
@@ -11,10 +14,23 @@ from dbtsl.api.shared.query_params import (
 )
 from dbtsl.error import QueryFailedError
 
+from dbt_mcp.cache.cache import TTLCache
 from dbt_mcp.config.config import SemanticLayerConfig
 from dbt_mcp.semantic_layer.gql.gql import GRAPHQL_QUERIES
-from dbt_mcp.semantic_layer.gql.gql_request import submit_request
-from dbt_mcp.semantic_layer.levenshtein import get_misspellings
+from dbt_mcp.semantic_layer.gql.gql_request import SemanticLayerGraphQLClient
+from dbt_mcp.semantic_layer.levenshtein import WordMatcher
+from dbt_mcp.semantic_layer.paging import ResultPageNotFoundError, ResultPages
+from dbt_mcp.semantic_layer.result_cache import (
+    QueryResultCache,
+    query_fingerprint,
+    with_metric_order,
+)
+from dbt_mcp.semantic_layer.serialization import ResultFormat
+from dbt_mcp.semantic_layer.session_pool import (
+    SemanticLayerClientFactory,
+    SemanticLayerClientProtocol,
+    SemanticLayerSessionPool,
+)
 from dbt_mcp.semantic_layer.types import (
     DimensionToolResponse,
     EntityToolResponse,
@@ -26,36 +42,135 @@ from dbt_mcp.semantic_layer.types import (
 )
 
 
-class SemanticLayerClientProtocol(Protocol):
-    def session(self) -> AbstractContextManager[Any]: ...
+def create_sl_client(config: SemanticLayerConfig) -> SemanticLayerClientProtocol:
+    # Only the ADBC API of the SDK is used, for queries. Metadata is fetched
+    # with SemanticLayerGraphQLClient.
+    return AsyncADBCClient(
+        server_host=config.host,
+        environment_id=config.prod_environment_id,
+        auth_token=config.service_token,
+        url_format=dbtsl.env.ADBC_URL_FORMAT,
+    )
 
-    def query(
-        self,
-        metrics: list[str],
-        group_by: list[GroupByParam | str] | None = None,
-        limit: int | None = None,
-        order_by: list[str | OrderByGroupBy | OrderByMetric] | None = None,
-        where: list[str] | None = None,
-        read_cache: bool = True,
-    ) -> pa.Table: ...
+
+# Kind of metadata ("metrics", "dimensions", ...) and the sorted names of
+# the metrics it belongs to
+MetadataCacheKey = tuple[str, str]
+
+MetadataResponse = MetricToolResponse | DimensionToolResponse | EntityToolResponse
+
+
+def _metrics_key(metrics: list[str]) -> str:
+    return ",".join(sorted(metrics))
+
+
+def _sizeof_metadata(responses: list[MetadataResponse]) -> int:
+    # An estimate, the cached responses are mostly made of short strings
+    return sum(len(repr(response)) for response in responses)
+
+
+def _parse_dimensions(result: dict) -> list[DimensionToolResponse]:
+    return [
+        DimensionToolResponse(
+            name=d.get("name"),
+            type=d.get("type"),
+            description=d.get("description"),
+            label=d.get("label"),
+            granularities=d.get("queryableGranularities")
+            + d.get("queryableTimeGranularities"),
+        )
+        for d in result["data"]["dimensions"]
+    ]
+
+
+def _parse_entities(result: dict) -> list[EntityToolResponse]:
+    return [
+        EntityToolResponse(
+            name=e.get("name"),
+            type=e.get("type"),
+            description=e.get("description"),
+        )
+        for e in result["data"]["entities"]
+    ]
 
 
 class SemanticLayerFetcher:
+    """Fetches the metrics of the Semantic Layer and their dimensions and
+    entities, which are cached until the TTL of the config expires or
+    `invalidate` is called, e.g. after metrics were deployed."""
+
     def __init__(
         self,
-        sl_client: SemanticLayerClientProtocol,
+        sl_client_factory: SemanticLayerClientFactory,
         config: SemanticLayerConfig,
+        gql_client: SemanticLayerGraphQLClient | None = None,
+        clock: Callable[[], float] = time.monotonic,
     ):
-        self.sl_client = sl_client
         self.config = config
-        self.entities_cache: dict[str, list[EntityToolResponse]] = {}
-        self.dimensions_cache: dict[str, list[DimensionToolResponse]] = {}
-
-    @cache
-    def list_metrics(self) -> list[MetricToolResponse]:
-        metrics_result = submit_request(
-            self.config,
-            {"query": GRAPHQL_QUERIES["metrics"]},
+        self.gql_client = gql_client or SemanticLayerGraphQLClient(config)
+        self.session_pool = SemanticLayerSessionPool(
+            sl_client_factory,
+            max_sessions=config.session_pool_size,
+            idle_timeout=config.session_idle_timeout,
+            clock=clock,
+        )
+        self._metadata_cache: TTLCache[MetadataCacheKey, list[Any]] = TTLCache(
+            ttl_seconds=config.cache_ttl,
+            max_entries=config.cache_max_entries,
+            max_bytes=config.cache_max_bytes,
+            sizeof=_sizeof_metadata,
+            clock=clock,
+        )
+        # Results of metric queries, if enabled
+        self.result_cache = (
+            QueryResultCache(
+                ttl_seconds=config.result_cache_ttl,
+                stale_seconds=config.result_cache_stale_ttl,
+                max_entries=config.result_cache_max_entries,
+                max_bytes=config.result_cache_max_bytes,
+                clock=clock,
+            )
+            if config.result_cache_ttl > 0
+            else None
+        )
+        # Results too large for a single response, returned page by page
+        self.result_pages = ResultPages(
+            max_rows=config.result_max_rows,
+            max_bytes=config.result_max_bytes,
+            ttl_seconds=config.result_pages_ttl,
+            max_retained_bytes=config.result_pages_max_bytes,
+            clock=clock,
+        )
+        # Names of the metrics, and of the dimensions and entities of each
+        # set of metrics, for validating queries and suggesting the closest
+        # names. They are bounded by the number of cached metadata entries.
+        self._matchers_cache: TTLCache[MetadataCacheKey, WordMatcher] = TTLCache(
+            ttl_seconds=config.cache_ttl,
+            max_entries=config.cache_max_entries,
+            clock=clock,
+        )
+
+    def invalidate(self) -> None:
+        self._metadata_cache.invalidate()
+        self._matchers_cache.invalidate()
+        if self.result_cache is not None:
+            self.result_cache.invalidate()
+
+    def stats(self) -> dict[str, Any]:
+        stats = {
+            "metadata": self._metadata_cache.stats(),
+            "matchers": self._matchers_cache.stats(),
+        }
+        if self.result_cache is not None:
+            stats["results"] = self.result_cache.stats()
+        return stats
+
+    async def list_metrics(self) -> list[MetricToolResponse]:
+        return await self._cached_metadata(("metrics", ""), self._fetch_metrics)
+
+    async def _fetch_metrics(self) -> list[MetricToolResponse]:
+        metrics_result = await self.gql_client.submit_request(
+            {"query": GRAPHQL_QUERIES["metrics"]}
         )
         return [
             MetricToolResponse(
@@ -67,60 +182,88 @@ class SemanticLayerFetcher:
             for m in metrics_result["data"]["metrics"]
         ]
 
-    def get_dimensions(self, metrics: list[str]) -> list[DimensionToolResponse]:
-        metrics_key = ",".join(sorted(metrics))
-        if metrics_key not in self.dimensions_cache:
-            dimensions_result = submit_request(
-                self.config,
-                {
-                    "query": GRAPHQL_QUERIES["dimensions"],
-                    "variables": {"metrics": [{"name": m} for m in metrics]},
-                },
+    async def metrics_matcher(self) -> WordMatcher:
+        key = ("metrics", "")
+        matcher = self._matchers_cache.get(key)
+        if matcher is None:
+            matcher = WordMatcher([m.name for m in await self.list_metrics()])
+            self._matchers_cache.set(key, matcher)
+        return matcher
+
+    async def group_by_matcher(self, metrics: list[str]) -> WordMatcher:
+        key = ("group_by", _metrics_key(metrics))
+        matcher = self._matchers_cache.get(key)
+        if matcher is None:
+            dimensions, entities = await self.get_dimensions_and_entities(metrics)
+            matcher = WordMatcher(
+                [d.name for d in dimensions] + [e.name for e in entities]
             )
-            dimensions = []
-            for d in dimensions_result["data"]["dimensions"]:
-                dimensions.append(
-                    DimensionToolResponse(
-                        name=d.get("name"),
-                        type=d.get("type"),
-                        description=d.get("description"),
-                        label=d.get("label"),
-                        granularities=d.get("queryableGranularities")
-                        + d.get("queryableTimeGranularities"),
-                    )
-                )
-            self.dimensions_cache[metrics_key] = dimensions
-        return self.dimensions_cache[metrics_key]
-
-    def get_entities(self, metrics: list[str]) -> list[EntityToolResponse]:
-        metrics_key = ",".join(sorted(metrics))
-        if metrics_key not in self.entities_cache:
-            entities_result = submit_request(
-                self.config,
-                {
-                    "query": GRAPHQL_QUERIES["entities"],
-                    "variables": {"metrics": [{"name": m} for m in metrics]},
-                },
+            self._matchers_cache.set(key, matcher)
+        return matcher
+
+    async def get_dimensions(self, metrics: list[str]) -> list[DimensionToolResponse]:
+        async def fetch() -> list[DimensionToolResponse]:
+            return _parse_dimensions(
+                await self._submit_metrics_request("dimensions", metrics)
             )
-            entities = [
-                EntityToolResponse(
-                    name=e.get("name"),
-                    type=e.get("type"),
-                    description=e.get("description"),
-                )
-                for e in entities_result["data"]["entities"]
-            ]
-            self.entities_cache[metrics_key] = entities
-        return self.entities_cache[metrics_key]
 
-    def validate_query_metrics_params(
+        return await self._cached_metadata(("dimensions", _metrics_key(metrics)), fetch)
+
+    async def get_entities(self, metrics: list[str]) -> list[EntityToolResponse]:
+        async def fetch() -> list[EntityToolResponse]:
+            return _parse_entities(
+                await self._submit_metrics_request("entities", metrics)
+            )
+
+        return await self._cached_metadata(("entities", _metrics_key(metrics)), fetch)
+
+    async def get_dimensions_and_entities(
+        self, metrics: list[str]
+    ) -> tuple[list[DimensionToolResponse], list[EntityToolResponse]]:
+        """Same as `get_dimensions` and `get_entities`, with a single request
+        when neither is cached."""
+        metrics_key = _metrics_key(metrics)
+        dimensions = self._metadata_cache.get(("dimensions", metrics_key))
+        entities = self._metadata_cache.get(("entities", metrics_key))
+        if dimensions is not None and entities is not None:
+            return dimensions, entities
+        if dimensions is not None:
+            return dimensions, await self.get_entities(metrics)
+        if entities is not None:
+            return await self.get_dimensions(metrics), entities
+
+        result = await self._submit_metrics_request("dimensions_and_entities", metrics)
+        dimensions = _parse_dimensions(result)
+        entities = _parse_entities(result)
+        self._metadata_cache.set(("dimensions", metrics_key), dimensions)
+        self._metadata_cache.set(("entities", metrics_key), entities)
+        return dimensions, entities
+
+    async def _cached_metadata(
+        self, key: MetadataCacheKey, fetch: Callable[[], Awaitable[list[Any]]]
+    ) -> list[Any]:
+        metadata = self._metadata_cache.get(key)
+        if metadata is None:
+            metadata = await fetch()
+            self._metadata_cache.set(key, metadata)
+        return metadata
+
+    async def _submit_metrics_request(
+        self, query_name: str, metrics: list[str]
+    ) -> dict:
+        return await self.gql_client.submit_request(
+            {
+                "query": GRAPHQL_QUERIES[query_name],
+                "variables": {"metrics": [{"name": m} for m in metrics]},
+            },
+        )
+
+    async def validate_query_metrics_params(
         self, metrics: list[str], group_by: list[GroupByParam] | None
     ) -> str | None:
         errors = []
-        available_metrics_names = [m.name for m in self.list_metrics()]
-        metric_misspellings = get_misspellings(
+        metric_misspellings = (await self.metrics_matcher()).misspellings(
             targets=metrics,
-            words=available_metrics_names,
             top_k=5,
         )
         for metric_misspelling in metric_misspellings:
@@ -135,12 +278,8 @@ class SemanticLayerFetcher:
         if errors:
             return f"Errors: {', '.join(errors)}"
 
-        available_group_by = [d.name for d in self.get_dimensions(metrics)] + [
-            e.name for e in self.get_entities(metrics)
-        ]
-        group_by_misspellings = get_misspellings(
+        group_by_misspellings = (await self.group_by_matcher(metrics)).misspellings(
             targets=[g.name for g in group_by or []],
-            words=available_group_by,
             top_k=5,
         )
         for group_by_misspelling in group_by_misspellings:
@@ -207,15 +346,18 @@ class SemanticLayerFetcher:
                 )
         return result
 
-    def query_metrics(
+    async def query_metrics(
         self,
         metrics: list[str],
         group_by: list[GroupByParam] | None = None,
         order_by: list[OrderByParam] | None = None,
         where: str | None = None,
         limit: int | None = None,
+        result_format: ResultFormat = "json",
+        read_cache: bool = True,
+        use_cache: bool = True,
     ) -> QueryMetricsResult:
-        validation_error = self.validate_query_metrics_params(
+        validation_error = await self.validate_query_metrics_params(
             metrics=metrics,
             group_by=group_by,
         )
@@ -223,31 +365,55 @@ class SemanticLayerFetcher:
             return QueryMetricsError(error=validation_error)
 
         try:
-            query_error = None
-            with self.sl_client.session():
-                # Catching any exception within the session
-                # to ensure it is closed properly
-                try:
-                    parsed_order_by: list[OrderBySpec] = (
-                        self.get_order_bys(
-                            order_by=order_by, metrics=metrics, group_by=group_by
-                        )
-                        if order_by is not None
-                        else []
-                    )
-                    query_result = self.sl_client.query(
-                        metrics=metrics,
-                        # TODO: remove this type ignore once this PR is merged: https://github.com/dbt-labs/semantic-layer-sdk-python/pull/80
-                        group_by=group_by,  # type: ignore
-                        order_by=parsed_order_by,  # type: ignore
-                        where=[where] if where else None,
-                        limit=limit,
-                    )
-                except Exception as e:
-                    query_error = e
-            if query_error:
-                return self._format_query_failed_error(query_error)
-            json_result = query_result.to_pandas().to_json(orient="records", indent=2)
-            return QueryMetricsSuccess(result=json_result or "")
+            parsed_order_by: list[OrderBySpec] = (
+                self.get_order_bys(
+                    order_by=order_by, metrics=metrics, group_by=group_by
+                )
+                if order_by is not None
+                else []
+            )
+
+            async def fetch() -> pa.Table:
+                return await self.session_pool.query(
+                    metrics=metrics,
+                    # TODO: remove this type ignore once this PR is merged: https://github.com/dbt-labs/semantic-layer-sdk-python/pull/80
+                    group_by=group_by,  # type: ignore
+                    order_by=parsed_order_by,  # type: ignore
+                    where=[where] if where else None,  # type: ignore
+                    limit=limit,  # type: ignore
+                    read_cache=read_cache,
+                )
+
+            if self.result_cache is None:
+                query_result = await fetch()
+            else:
+                # Results the Semantic Layer shouldn't read from its cache
+                # aren't read from this one either
+                query_result = with_metric_order(
+                    await self.result_cache.get(
+                        query_fingerprint(metrics, group_by, order_by, where, limit),
+                        fetch,
+                        use_cache=use_cache and read_cache,
+                    ),
+                    metrics,
+                )
+            # Large results take a while to encode, Arrow releases the GIL
+            return QueryMetricsSuccess(
+                result=await asyncio.to_thread(
+                    self.result_pages.first_page, query_result, result_format
+                )
+            )
         except Exception as e:
             return self._format_query_failed_error(e)
+
+    async def get_query_metrics_page(
+        self, cursor: str, result_format: ResultFormat = "json"
+    ) -> QueryMetricsResult:
+        try:
+            return QueryMetricsSuccess(
+                result=await asyncio.to_thread(
+                    self.result_pages.page, cursor, result_format
+                )
+            )
+        except ResultPageNotFoundError as e:
+            return QueryMetricsError(error=str(e))
@@ -27,6 +27,22 @@ query GetEntities($environmentId: BigInt!, $metrics: [MetricInput!]!) {
     name
     type
   }
+}
+    """,
+    "dimensions_and_entities": """
+query GetDimensionsAndEntities($environmentId: BigInt!, $metrics: [MetricInput!]!) {
+  dimensions(environmentId: $environmentId, metrics: $metrics) {
+    description
+    name
+    type
+    queryableGranularities
+    queryableTimeGranularities
+  }
+  entities(environmentId: $environmentId, metrics: $metrics) {
+    description
+    name
+    type
+  }
 }
     """,
 }
@@ -1,17 +1,97 @@
-import requests
+import asyncio
+import re
+import statistics
+import time
+from collections import Counter, defaultdict, deque
+from typing import Any
 
-from dbt_mcp.config.config import SemanticLayerConfig
+from dbt_mcp.config.config import HttpClientConfig, SemanticLayerConfig
 from dbt_mcp.gql.errors import raise_gql_error
+from dbt_mcp.gql.http_client import (
+    async_post_with_retries,
+    create_async_http_client,
+)
 
+# Number of recent request latencies kept per operation to compute percentiles
+LATENCY_SAMPLES = 1000
 
-def submit_request(
-    sl_config: SemanticLayerConfig,
-    payload: dict,
-) -> dict:
-    if "variables" not in payload:
-        payload["variables"] = {}
-    payload["variables"]["environmentId"] = sl_config.prod_environment_id
-    r = requests.post(sl_config.url, json=payload, headers=sl_config.headers)
-    result = r.json()
-    raise_gql_error(result)
-    return result
+_OPERATION_NAME_PATTERN = re.compile(r"^\s*(?:query|mutation)\s+(\w+)")
+
+
+def operation_name(query: str) -> str:
+    match = _OPERATION_NAME_PATTERN.match(query)
+    return match.group(1) if match else "anonymous"
+
+
+class SemanticLayerGraphQLClient:
+    """Sends GraphQL requests to the Semantic Layer API.
+
+    Requests share keep-alive connections, are retried when the API is
+    rate limiting or temporarily unavailable, and at most `pool_size` are
+    sent at once. The latency of each operation is recorded for `stats`.
+    """
+
+    def __init__(
+        self,
+        sl_config: SemanticLayerConfig,
+        http_client_config: HttpClientConfig | None = None,
+    ):
+        self.sl_config = sl_config
+        self.http_client_config = http_client_config or sl_config.http_client
+        self.http_client = create_async_http_client(self.http_client_config)
+        # Requests beyond the size of the pool would wait for a connection
+        # and could time out before being sent
+        self._concurrency_limit = asyncio.Semaphore(self.http_client_config.pool_size)
+        self._latencies: defaultdict[str, deque[float]] = defaultdict(
+            lambda: deque(maxlen=LATENCY_SAMPLES)
+        )
+        self._requests: Counter[str] = Counter()
+        self._errors: Counter[str] = Counter()
+
+    async def submit_request(self, payload: dict) -> dict:
+        operation = operation_name(payload["query"])
+        variables = {
+            **payload.get("variables", {}),
+            "environmentId": self.sl_config.prod_environment_id,
+        }
+        start = time.perf_counter()
+        try:
+            async with self._concurrency_limit:
+                response = await async_post_with_retries(
+                    self.http_client,
+                    self.http_client_config,
+                    url=self.sl_config.url,
+                    json={**payload, "variables": variables},
+                    headers=self.sl_config.headers,
+                )
+            result = response.json()
+            raise_gql_error(result)
+        except Exception:
+            self._record(operation, time.perf_counter() - start, failed=True)
+            raise
+        self._record(operation, time.perf_counter() - start, failed=False)
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        operations = {}
+        for operation, samples in self._latencies.items():
+            latencies = sorted(samples)
+            operations[operation] = {
+                "requests": self._requests[operation],
+                "errors": self._errors[operation],
+                "latency_seconds": {
+                    "p50": statistics.median(latencies),
+                    "p95": latencies[int(len(latencies) * 0.95)],
+                    "max": latencies[-1],
+                },
+            }
+        return {"operations": operations}
+
+    async def close(self) -> None:
+        await self.http_client.aclose()
+
+    def _record(self, operation: str, latency: float, failed: bool) -> None:
+        self._requests[operation] += 1
+        if failed:
+            self._errors[operation] += 1
+        self._latencies[operation].append(latency)
@@ -1,3 +1,6 @@
+import heapq
+from collections import Counter, defaultdict
+from collections.abc import Sequence
 from dataclasses import dataclass
 
 
@@ -7,24 +10,63 @@ class Misspelling:
     similar_words: list[str]
 
 
+def _pattern_masks(pattern: str) -> dict[str, int]:
+    """Bitmask of the positions of each character in `pattern`."""
+    masks: dict[str, int] = defaultdict(int)
+    for i, char in enumerate(pattern):
+        masks[char] |= 1 << i
+    return dict(masks)
+
+
+def _bit_parallel_levenshtein(
+    pattern_masks: dict[str, int], pattern_length: int, text: str
+) -> int:
+    """Levenshtein distance between a pattern and `text`, with Myers'
+    bit-parallel algorithm (in the variant of Hyyrö for the distance
+    between whole strings). A column of the dynamic programming matrix is
+    encoded as bitmasks of its vertical differences, so each character of
+    `text` is processed with a few integer operations."""
+    if pattern_length == 0:
+        return len(text)
+    mask = (1 << pattern_length) - 1
+    last_bit = 1 << (pattern_length - 1)
+    positive_vertical = mask
+    negative_vertical = 0
+    distance = pattern_length
+    for char in text:
+        equal = pattern_masks.get(char, 0)
+        x_vertical = equal | negative_vertical
+        carry = ((equal & positive_vertical) + positive_vertical) & mask
+        x_horizontal = (carry ^ positive_vertical) | equal
+        positive_horizontal = negative_vertical | (
+            ~(x_horizontal | positive_vertical) & mask
+        )
+        negative_horizontal = positive_vertical & x_horizontal
+        if positive_horizontal & last_bit:
+            distance += 1
+        elif negative_horizontal & last_bit:
+            distance -= 1
+        # The first row of the matrix increases by one for each character
+        positive_horizontal = ((positive_horizontal << 1) | 1) & mask
+        negative_horizontal = (negative_horizontal << 1) & mask
+        positive_vertical = negative_horizontal | (
+            ~(x_vertical | positive_horizontal) & mask
+        )
+        negative_vertical = positive_horizontal & x_vertical
+    return distance
+
+
 def levenshtein(s1: str, s2: str) -> int:
-    len_s1, len_s2 = len(s1), len(s2)
-    dp = [[0] * (len_s2 + 1) for _ in range(len_s1 + 1)]
-
-    for i in range(len_s1 + 1):
-        dp[i][0] = i
-    for j in range(len_s2 + 1):
-        dp[0][j] = j
-
-    for i in range(1, len_s1 + 1):
-        for j in range(1, len_s2 + 1):
-            cost = 0 if s1[i - 1] == s2[j - 1] else 1
-            dp[i][j] = min(
-                dp[i - 1][j] + 1,  # Deletion
-                dp[i][j - 1] + 1,  # Insertion
-                dp[i - 1][j - 1] + cost,  # Substitution
-            )
-    return dp[len_s1][len_s2]
+    return _bit_parallel_levenshtein(_pattern_masks(s1), len(s1), s2)
+
+
+def _sorted_closest(
+    distances: list[tuple[int, int]], top_k: int | None
+) -> list[tuple[int, int]]:
+    """Sorts (distance, index) pairs, so words at the same distance keep
+    their order, and keeps the `top_k` first ones."""
+    distances.sort()
+    return distances[: max(top_k, 0)] if top_k is not None else distances
 
 
 def get_closest_words(
@@ -33,20 +75,16 @@ def get_closest_words(
     top_k: int | None = None,
     threshold: int | None = None,
 ) -> list[str]:
-    distances = [(word, levenshtein(target, word)) for word in words]
-
-    # Filter by threshold if provided
+    pattern_masks = _pattern_masks(target)
+    distances = [
+        (_bit_parallel_levenshtein(pattern_masks, len(target), word), i)
+        for i, word in enumerate(words)
+        # The distance is at least the difference of the lengths
+        if threshold is None or abs(len(word) - len(target)) <= threshold
+    ]
     if threshold is not None:
-        distances = [(word, dist) for word, dist in distances if dist <= threshold]
-
-    # Sort by distance
-    distances.sort(key=lambda x: x[1])
-
-    # Limit by top_k if provided
-    if top_k is not None:
-        distances = distances[:top_k]
-
-    return [word for word, _ in distances]
+        distances = [(dist, i) for dist, i in distances if dist <= threshold]
+    return [words[i] for _, i in _sorted_closest(distances, top_k)]
 
 
 def get_misspellings(
@@ -54,18 +92,130 @@ def get_misspellings(
     words: list[str],
     top_k: int | None = None,
 ) -> list[Misspelling]:
-    misspellings = []
-    for target in targets:
-        if target not in words:
-            misspellings.append(
-                Misspelling(
-                    word=target,
-                    similar_words=get_closest_words(
-                        target=target,
-                        words=words,
-                        top_k=top_k,
-                        threshold=max(1, len(target) // 2),
-                    ),
+    word_set = set(words)
+    return [
+        Misspelling(
+            word=target,
+            similar_words=get_closest_words(
+                target=target,
+                words=words,
+                top_k=top_k,
+                threshold=max(1, len(target) // 2),
+            ),
+        )
+        for target in targets
+        if target not in word_set
+    ]
+
+
+def _bigrams(word: str) -> Counter[str]:
+    # Padded, so that a word of length n has n + 1 bigrams
+    padded = f" {word} "
+    return Counter(padded[i : i + 2] for i in range(len(padded) - 1))
+
+
+class WordMatcher:
+    """Finds the words closest to a target, with the same results as
+    `get_closest_words` and `get_misspellings`, for a list of words that is
+    searched many times.
+
+    Each edit changes at most two (padded) bigrams, so two words of lengths
+    n and m at distance k share at least max(n, m) + 1 - 2k bigrams. The
+    number of bigrams each word shares with the target, counted with an
+    index of the bigrams of the words, gives a lower bound of its distance.
+    Distances are computed by increasing lower bound, and once `top_k`
+    words were found, the words whose lower bound is above the distance of
+    the farthest of them are skipped.
+    """
+
+    def __init__(self, words: Sequence[str]):
+        self.words = list(words)
+        self.word_set = set(self.words)
+        self._lengths = [len(word) for word in self.words]
+        # Indices of the words containing each bigram, with their count
+        self._bigram_postings: defaultdict[str, list[tuple[int, int]]] = defaultdict(
+            list
+        )
+        for i, word in enumerate(self.words):
+            for bigram, count in _bigrams(word).items():
+                self._bigram_postings[bigram].append((i, count))
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.word_set
+
+    def closest(
+        self,
+        target: str,
+        top_k: int | None = None,
+        threshold: int | None = None,
+    ) -> list[str]:
+        """Same as `get_closest_words(target, words, top_k, threshold)`."""
+        if top_k is not None and top_k <= 0:
+            return []
+        if threshold is None:
+            return get_closest_words(target, self.words, top_k)
+
+        pattern_masks = _pattern_masks(target)
+        matches: list[tuple[int, int]] = []
+        # Negated distances of the top_k closest words found so far
+        closest: list[int] = []
+        bound = threshold
+        for lower_bound, candidates in enumerate(
+            self._candidates_by_lower_bound(target, threshold)
+        ):
+            if lower_bound > bound:
+                break
+            for i in candidates:
+                distance = _bit_parallel_levenshtein(
+                    pattern_masks, len(target), self.words[i]
                 )
+                if distance > bound:
+                    continue
+                matches.append((distance, i))
+                if top_k is not None:
+                    heapq.heappush(closest, -distance)
+                    if len(closest) > top_k:
+                        heapq.heappop(closest)
+                    if len(closest) == top_k:
+                        bound = min(bound, -closest[0])
+        matches = [(distance, i) for distance, i in matches if distance <= bound]
+        return [self.words[i] for _, i in _sorted_closest(matches, top_k)]
+
+    def misspellings(
+        self, targets: list[str], top_k: int | None = None
+    ) -> list[Misspelling]:
+        """Same as `get_misspellings(targets, words, top_k)`."""
+        return [
+            Misspelling(
+                word=target,
+                similar_words=self.closest(
+                    target=target,
+                    top_k=top_k,
+                    threshold=max(1, len(target) // 2),
+                ),
+            )
+            for target in targets
+            if target not in self.word_set
+        ]
+
+    def _candidates_by_lower_bound(
+        self, target: str, threshold: int
+    ) -> list[list[int]]:
+        """Indices of the words, grouped by the lower bound of their distance
+        to `target`, up to `threshold`."""
+        shared = [0] * len(self.words)
+        for bigram, target_count in _bigrams(target).items():
+            for i, count in self._bigram_postings.get(bigram, ()):
+                shared[i] += min(target_count, count)
+
+        target_length = len(target)
+        candidates: list[list[int]] = [[] for _ in range(threshold + 1)]
+        for i, length in enumerate(self._lengths):
+            lower_bound = max(
+                abs(length - target_length),
+                # Rounded up
+                (max(length, target_length) + 2 - shared[i]) // 2,
             )
-    return misspellings
+            if lower_bound <= threshold:
+                candidates[lower_bound].append(i)
+        return candidates
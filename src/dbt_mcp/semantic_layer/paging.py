@@ -0,0 +1,125 @@
+import json
+import time
+import uuid
+from collections.abc import Callable
+
+import pyarrow as pa
+
+from dbt_mcp.cache.cache import TTLCache
+from dbt_mcp.semantic_layer.serialization import ResultFormat, serialize_table
+
+# Results are retained for paging until they expire or, with the least
+# recently used first, there are more than this many
+MAX_RETAINED_RESULTS = 100
+
+
+class ResultPageNotFoundError(Exception):
+    pass
+
+
+def serialize_page(
+    table: pa.Table,
+    offset: int,
+    result_format: ResultFormat,
+    max_rows: int,
+    max_bytes: int,
+) -> tuple[str, int]:
+    """The rows of `table` from `offset`, as many as fit in `max_rows` rows
+    and approximately `max_bytes` bytes (unbounded if 0), serialized, and
+    their number. At least one row is returned if there are any left."""
+    rows = table.num_rows - offset
+    if max_rows:
+        rows = min(rows, max_rows)
+    # Only the rows of the page are serialized
+    serialized = serialize_table(table.slice(offset, rows), result_format)
+    while max_bytes and len(serialized) > max_bytes and rows > 1:
+        # Rows have roughly the same size
+        rows = max(1, min(rows - 1, rows * max_bytes // len(serialized)))
+        serialized = serialize_table(table.slice(offset, rows), result_format)
+    return serialized, rows
+
+
+def page_response(
+    page: str,
+    result_format: ResultFormat,
+    offset: int,
+    rows: int,
+    total_rows: int,
+    next_cursor: str | None,
+) -> str:
+    """A page of results with where it is in the whole result. The rows of
+    JSON results are included as is, other formats as a string."""
+    metadata = json.dumps(
+        {
+            "offset": offset,
+            "rows": rows,
+            "total_rows": total_rows,
+            "truncated": offset + rows < total_rows,
+            "next_cursor": next_cursor,
+        }
+    )
+    result = page if result_format == "json" else json.dumps(page)
+    return '{"result":' + result + "," + metadata[1:]
+
+
+class ResultPages:
+    """Retains query results that didn't fit in a response, so that the
+    following pages are returned without running the query again."""
+
+    def __init__(
+        self,
+        max_rows: int,
+        max_bytes: int,
+        ttl_seconds: float,
+        max_retained_bytes: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.max_retained_bytes = max_retained_bytes
+        self._results: TTLCache[str, pa.Table] = TTLCache(
+            ttl_seconds=ttl_seconds,
+            max_entries=MAX_RETAINED_RESULTS,
+            max_bytes=max_retained_bytes,
+            sizeof=lambda table: table.nbytes,
+            clock=clock,
+        )
+
+    def first_page(self, table: pa.Table, result_format: ResultFormat) -> str:
+        """The first page of `table`, which is all of it if it fits in the
+        budget. Otherwise, the page has a cursor to the next one unless
+        `table` is too large to be retained."""
+        page, rows = serialize_page(
+            table, 0, result_format, self.max_rows, self.max_bytes
+        )
+        next_cursor = None
+        if rows < table.num_rows and table.nbytes <= self.max_retained_bytes:
+            handle = uuid.uuid4().hex
+            self._results.set(handle, table)
+            next_cursor = f"{handle}:{rows}"
+        return page_response(page, result_format, 0, rows, table.num_rows, next_cursor)
+
+    def page(self, cursor: str, result_format: ResultFormat) -> str:
+        handle, _, offset = cursor.rpartition(":")
+        table = self._results.get(handle)
+        if table is None or not offset.isdigit():
+            raise ResultPageNotFoundError(
+                "The results of this cursor expired or don't exist, "
+                + "run the query again."
+            )
+        start = min(int(offset), table.num_rows)
+        page, rows = serialize_page(
+            table, start, result_format, self.max_rows, self.max_bytes
+        )
+        end = start + rows
+        return page_response(
+            page,
+            result_format,
+            start,
+            rows,
+            table.num_rows,
+            f"{handle}:{end}" if end < table.num_rows else None,
+        )
+
+    def stats(self) -> dict[str, int]:
+        return self._results.stats()
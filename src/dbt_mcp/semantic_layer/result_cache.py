@@ -0,0 +1,156 @@
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import pyarrow as pa
+from dbtsl.api.shared.query_params import GroupByParam
+
+from dbt_mcp.cache.cache import TTLCache
+from dbt_mcp.semantic_layer.types import OrderByParam
+from dbt_mcp.sql.normalize import normalize_sql
+
+logger = logging.getLogger(__name__)
+
+
+def query_fingerprint(
+    metrics: list[str],
+    group_by: list[GroupByParam] | None,
+    order_by: list[OrderByParam] | None,
+    where: str | None,
+    limit: int | None,
+) -> str:
+    """Identifies the results of a query. Queries that only differ in the
+    order of their metrics or in the whitespace of `where` have the same
+    fingerprint."""
+    return json.dumps(
+        [
+            sorted(set(metrics)),
+            [[g.name, g.type.value, (g.grain or "").lower()] for g in group_by or []],
+            [[o.name, o.descending] for o in order_by or []],
+            normalize_sql(where) if where else "",
+            limit,
+        ]
+    )
+
+
+def with_metric_order(table: pa.Table, metrics: list[str]) -> pa.Table:
+    """`table` with its metric columns in the order of `metrics`, which can
+    differ from the order of the query it was cached for."""
+    # Some data platforms return upper case column names
+    positions = {name.lower(): i for i, name in enumerate(table.column_names)}
+    if any(metric.lower() not in positions for metric in metrics):
+        return table
+    metric_positions = [positions[metric.lower()] for metric in metrics]
+    if len(set(metric_positions)) != len(metric_positions):
+        return table
+    columns = list(range(table.num_columns))
+    for position, metric_position in zip(sorted(metric_positions), metric_positions):
+        columns[position] = metric_position
+    return table.select(columns)
+
+
+class QueryResultCache:
+    """Caches the results of Semantic Layer queries by fingerprint.
+
+    Results are fresh for `ttl_seconds`. For `stale_seconds` after that,
+    they are still returned, but the query is sent again in the background
+    to refresh them. Concurrent identical queries are sent only once.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        stale_seconds: float,
+        max_entries: int,
+        max_bytes: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        # Results are stored with the time they were fetched at
+        self._cache: TTLCache[str, tuple[pa.Table, float]] = TTLCache(
+            ttl_seconds=ttl_seconds + stale_seconds,
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            sizeof=lambda entry: entry[0].nbytes,
+            clock=clock,
+        )
+        self._in_flight: dict[str, asyncio.Task[pa.Table]] = {}
+        # Incremented on invalidation, so queries sent before don't store
+        # their (possibly outdated) results
+        self._generation = 0
+        self._stale_hits = 0
+        self._refreshes = 0
+        self._deduplicated = 0
+
+    async def get(
+        self,
+        fingerprint: str,
+        fetch: Callable[[], Awaitable[pa.Table]],
+        use_cache: bool = True,
+    ) -> pa.Table:
+        """Cached results of the query, or the results of `fetch`, which
+        are cached even when `use_cache` is false."""
+        if not use_cache:
+            return await self._fetch(fingerprint, fetch)
+        cached = self._cache.get(fingerprint)
+        if cached is not None:
+            table, fetched_at = cached
+            if self._clock() - fetched_at >= self.ttl_seconds:
+                self._stale_hits += 1
+                self._refresh(fingerprint, fetch)
+            return table
+
+        # A caller being cancelled doesn't cancel the query for the others
+        task = self._in_flight.get(fingerprint)
+        if task is None:
+            task = self._start_fetch(fingerprint, fetch)
+        else:
+            self._deduplicated += 1
+        return await asyncio.shield(task)
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._cache.invalidate()
+
+    def stats(self) -> dict[str, Any]:
+        return self._cache.stats() | {
+            "stale_hits": self._stale_hits,
+            "refreshes": self._refreshes,
+            "deduplicated": self._deduplicated,
+        }
+
+    def _refresh(
+        self, fingerprint: str, fetch: Callable[[], Awaitable[pa.Table]]
+    ) -> None:
+        if fingerprint in self._in_flight:
+            return
+        self._refreshes += 1
+        task = self._start_fetch(fingerprint, fetch)
+        task.add_done_callback(self._log_refresh_error)
+
+    def _start_fetch(
+        self, fingerprint: str, fetch: Callable[[], Awaitable[pa.Table]]
+    ) -> asyncio.Task[pa.Table]:
+        task = asyncio.ensure_future(self._fetch(fingerprint, fetch))
+        self._in_flight[fingerprint] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(fingerprint, None))
+        return task
+
+    async def _fetch(
+        self, fingerprint: str, fetch: Callable[[], Awaitable[pa.Table]]
+    ) -> pa.Table:
+        generation = self._generation
+        table = await fetch()
+        if generation == self._generation:
+            self._cache.set(fingerprint, (table, self._clock()))
+        return table
+
+    @staticmethod
+    def _log_refresh_error(task: asyncio.Task[pa.Table]) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            # The stale results are returned until they expire
+            logger.warning(f"Failed to refresh query results: {task.exception()}")
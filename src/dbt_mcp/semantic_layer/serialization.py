@@ -0,0 +1,146 @@
+import base64
+import json
+from typing import Literal, cast
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+
+ResultFormat = Literal["json", "csv", "arrow"]
+
+# Rows encoded at once, which bounds the memory used by intermediate arrays
+JSON_BATCH_SIZE = 65_536
+
+# Strings with control characters need \u escapes, which are left to `json`
+_CONTROL_CHARACTERS_PATTERN = r"[\x00-\x1f]"
+
+_EMPTY = pa.scalar("")
+
+
+def _concat(*parts: pa.Array | pa.Scalar) -> pa.Array:
+    """Concatenation of strings, element-wise for arrays."""
+    # The type stubs of binary_join_element_wise don't allow mixing arrays
+    # and scalars
+    return pc.call_function("binary_join_element_wise", [*parts, _EMPTY])
+
+
+def _has_control_characters(strings: pa.Array) -> bool:
+    # Checking for printable ASCII first is much faster than the regex
+    if pc.all(pc.ascii_is_printable(strings)).as_py() is not False:
+        return False
+    return bool(
+        pc.any(pc.match_substring_regex(strings, _CONTROL_CHARACTERS_PATTERN)).as_py()
+    )
+
+
+def _json_quote(strings: pa.Array, escape: bool = True) -> pa.Array:
+    if escape and _has_control_characters(strings):
+        return pa.array(
+            [
+                None if s is None else json.dumps(s, ensure_ascii=False)
+                for s in strings.to_pylist()
+            ],
+            pa.string(),
+        )
+    if escape:
+        for char in ("\\", '"'):
+            if pc.any(pc.match_substring(strings, char)).as_py():
+                strings = pc.replace_substring(strings, char, "\\" + char)
+    return _concat(pa.scalar('"'), strings, pa.scalar('"'))
+
+
+def _json_values(column: pa.Array) -> pa.Array:
+    """JSON encoding of each value of `column`, as strings."""
+    column_type = column.type
+    if pa.types.is_dictionary(column_type):
+        # Only the distinct values are encoded. The type stubs don't declare
+        # the dictionary and indices of dictionary arrays.
+        dictionary = column.dictionary  # type: ignore[attr-defined]
+        indices = column.indices  # type: ignore[attr-defined]
+        values = pc.take(_json_values(dictionary), indices)
+        return values.fill_null("null")
+    if pa.types.is_null(column_type):
+        values = pa.nulls(len(column), pa.string())
+    elif (
+        pa.types.is_integer(column_type)
+        or pa.types.is_decimal(column_type)
+        or pa.types.is_boolean(column_type)
+    ):
+        values = pc.cast(column, pa.string())
+    elif pa.types.is_floating(column_type):
+        # NaN and infinity aren't valid JSON
+        values = pc.if_else(
+            pc.is_finite(column),
+            pc.cast(column, pa.string()),
+            pa.scalar(None, pa.string()),
+        )
+    elif pa.types.is_string(column_type) or pa.types.is_large_string(column_type):
+        values = _json_quote(pc.cast(column, pa.string()))
+    elif pa.types.is_temporal(column_type) and not pa.types.is_duration(column_type):
+        # Dates and timestamps in ISO 8601 like the CSV format, which never
+        # need to be escaped
+        values = _json_quote(pc.cast(column, pa.string()), escape=False)
+    else:
+        values = pa.array(
+            [
+                None if v is None else json.dumps(v, default=str, ensure_ascii=False)
+                for v in column.to_pylist()
+            ],
+            pa.string(),
+        )
+    return values.fill_null("null")
+
+
+def _batch_to_json(batch: pa.RecordBatch) -> str:
+    """Rows of `batch` as JSON objects separated by commas."""
+    if batch.num_columns == 0:
+        return ",".join("{}" for _ in range(batch.num_rows))
+    # Each row is built by concatenating the keys, values and separators
+    parts: list[pa.Array | pa.Scalar] = []
+    for i, (name, column) in enumerate(zip(batch.schema.names, batch.columns)):
+        parts.append(pa.scalar(("{" if i == 0 else ",") + json.dumps(name) + ":"))
+        parts.append(_json_values(column))
+    parts.append(pa.scalar("}"))
+    rows = pc.cast(_concat(*parts), pa.large_string())
+    # All the rows as the one list of a list array, to be joined at once
+    rows_list = pa.LargeListArray.from_arrays(
+        cast(pa.Int64Array, pa.array([0, len(rows)], pa.int64())), rows
+    )
+    joined = pc.binary_join(rows_list, pa.scalar(",", pa.large_string()))
+    return cast(pa.LargeStringArray, joined)[0].as_py()
+
+
+def table_to_json(table: pa.Table) -> str:
+    """Compact JSON list of the rows of `table`, encoded batch by batch
+    with Arrow compute functions instead of converting to Python objects."""
+    parts = ["["]
+    for batch in table.to_batches(max_chunksize=JSON_BATCH_SIZE):
+        if batch.num_rows == 0:
+            continue
+        if len(parts) > 1:
+            parts.append(",")
+        parts.append(_batch_to_json(batch))
+    parts.append("]")
+    return "".join(parts)
+
+
+def table_to_csv(table: pa.Table) -> str:
+    sink = pa.BufferOutputStream()
+    pa_csv.write_csv(table, sink)
+    return sink.getvalue().to_pybytes().decode()
+
+
+def table_to_arrow_base64(table: pa.Table) -> str:
+    """Base64 encoded Arrow IPC stream of `table`."""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return base64.b64encode(sink.getvalue()).decode("ascii")
+
+
+def serialize_table(table: pa.Table, result_format: ResultFormat = "json") -> str:
+    if result_format == "csv":
+        return table_to_csv(table)
+    if result_format == "arrow":
+        return table_to_arrow_base64(table)
+    return table_to_json(table)
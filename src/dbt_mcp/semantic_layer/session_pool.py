@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass
+from typing import Any, Protocol, Unpack
+
+import pyarrow as pa
+from dbtsl.api.shared.query_params import QueryParameters
+from dbtsl.error import QueryFailedError
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticLayerClientProtocol(Protocol):
+    def session(self) -> AbstractAsyncContextManager[Any]: ...
+
+    async def query(self, **query_params: Unpack[QueryParameters]) -> pa.Table: ...
+
+
+# Clients only have one session at a time, so each pooled session has its
+# own client
+SemanticLayerClientFactory = Callable[[], SemanticLayerClientProtocol]
+
+
+@dataclass
+class _PooledSession:
+    client: SemanticLayerClientProtocol
+    context: AbstractAsyncContextManager[Any]
+    last_used_at: float
+
+
+class SemanticLayerSessionPool:
+    """Keeps Semantic Layer sessions open between queries.
+
+    Opening a session connects to the ADBC API, so sessions are reused by
+    the following queries instead of being closed after each one. At most
+    `max_sessions` queries run at once, and sessions that weren't used for
+    `idle_timeout` seconds are closed.
+
+    A session is only kept if its query succeeded or failed because of the
+    query itself. When a reused session fails otherwise, e.g. because the
+    server closed the connection in the meantime, the query is retried once
+    on a new session.
+    """
+
+    def __init__(
+        self,
+        client_factory: SemanticLayerClientFactory,
+        max_sessions: int,
+        idle_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.client_factory = client_factory
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._clock = clock
+        self._concurrency_limit = asyncio.Semaphore(max_sessions)
+        # Most recently used last, which is reused first so that the others
+        # can idle out
+        self._idle: list[_PooledSession] = []
+        self._in_use = 0
+        self._close_idle_task: asyncio.Task[None] | None = None
+        self._closing: set[asyncio.Task[None]] = set()
+        self._opened = 0
+        self._reused = 0
+        self._reconnects = 0
+        self._closed_idle = 0
+        self._closed_failed = 0
+
+    async def query(self, **query_params: Unpack[QueryParameters]) -> pa.Table:
+        async with self._concurrency_limit:
+            self._in_use += 1
+            try:
+                session = self._pop_idle_session()
+                if session is not None:
+                    try:
+                        return await self._query(session, query_params)
+                    except QueryFailedError:
+                        raise
+                    except Exception:
+                        logger.info(
+                            "Reconnecting after a Semantic Layer session failed"
+                        )
+                        self._reconnects += 1
+                return await self._query(await self._open(), query_params)
+            finally:
+                self._in_use -= 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "idle": len(self._idle),
+            "in_use": self._in_use,
+            "opened": self._opened,
+            "reused": self._reused,
+            "reconnects": self._reconnects,
+            "closed_idle": self._closed_idle,
+            "closed_failed": self._closed_failed,
+        }
+
+    async def close(self) -> None:
+        if self._close_idle_task is not None:
+            self._close_idle_task.cancel()
+            self._close_idle_task = None
+        idle, self._idle = self._idle, []
+        for session in idle:
+            await self._close(session)
+        await asyncio.gather(*self._closing)
+
+    async def _query(
+        self, session: _PooledSession, query_params: QueryParameters
+    ) -> pa.Table:
+        try:
+            result = await session.client.query(**query_params)
+        except QueryFailedError:
+            self._release(session)
+            raise
+        except BaseException:
+            # Including cancellations, which leave the connection in an
+            # unknown state
+            self._closed_failed += 1
+            await self._close(session)
+            raise
+        self._release(session)
+        return result
+
+    async def _open(self) -> _PooledSession:
+        client = self.client_factory()
+        context = client.session()
+        await context.__aenter__()
+        self._opened += 1
+        return _PooledSession(
+            client=client, context=context, last_used_at=self._clock()
+        )
+
+    async def _close(self, session: _PooledSession) -> None:
+        try:
+            await session.context.__aexit__(None, None, None)
+        except Exception:
+            logger.warning("Failed to close a Semantic Layer session", exc_info=True)
+
+    def _pop_idle_session(self) -> _PooledSession | None:
+        self._close_expired_sessions()
+        if not self._idle:
+            return None
+        self._reused += 1
+        return self._idle.pop()
+
+    def _release(self, session: _PooledSession) -> None:
+        session.last_used_at = self._clock()
+        self._idle.append(session)
+        if self._close_idle_task is None or self._close_idle_task.done():
+            self._close_idle_task = asyncio.create_task(self._close_idle_sessions())
+
+    def _close_expired_sessions(self) -> None:
+        now = self._clock()
+        expired = [s for s in self._idle if now - s.last_used_at >= self.idle_timeout]
+        if not expired:
+            return
+        self._idle = [s for s in self._idle if s not in expired]
+        self._closed_idle += len(expired)
+        for session in expired:
+            # Closing waits for the server, queries don't have to
+            task = asyncio.create_task(self._close(session))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    async def _close_idle_sessions(self) -> None:
+        """Closes idle sessions as they expire, until none are left."""
+        while self._idle:
+            oldest = min(s.last_used_at for s in self._idle)
+            await asyncio.sleep(max(0.0, oldest + self.idle_timeout - self._clock()))
+            self._close_expired_sessions()
@@ -2,15 +2,13 @@ import logging
 from collections.abc import Sequence
 
 from dbtsl.api.shared.query_params import GroupByParam
-from dbtsl.client.sync import SyncSemanticLayerClient
 from mcp.server.fastmcp import FastMCP
 
 from dbt_mcp.config.config import SemanticLayerConfig
 from dbt_mcp.prompts.prompts import get_prompt
-from dbt_mcp.semantic_layer.client import (
-    SemanticLayerClientProtocol,
-    SemanticLayerFetcher,
-)
+from dbt_mcp.semantic_layer.client import SemanticLayerFetcher, create_sl_client
+from dbt_mcp.semantic_layer.serialization import ResultFormat
+from dbt_mcp.semantic_layer.session_pool import SemanticLayerClientFactory
 from dbt_mcp.semantic_layer.types import (
     DimensionToolResponse,
     EntityToolResponse,
@@ -18,6 +16,7 @@ from dbt_mcp.semantic_layer.types import (
     OrderByParam,
     QueryMetricsSuccess,
 )
+from dbt_mcp.stats.stats import register_stats
 from dbt_mcp.tools.definitions import ToolDefinition
 from dbt_mcp.tools.register import register_tools
 from dbt_mcp.tools.tool_names import ToolName
@@ -26,45 +25,71 @@ logger = logging.getLogger(__name__)
 
 
 def create_sl_tool_definitions(
-    config: SemanticLayerConfig, sl_client: SemanticLayerClientProtocol
+    config: SemanticLayerConfig, sl_client_factory: SemanticLayerClientFactory
 ) -> list[ToolDefinition]:
     semantic_layer_fetcher = SemanticLayerFetcher(
-        sl_client=sl_client,
+        sl_client_factory=sl_client_factory,
         config=config,
     )
+    register_stats("semantic_layer_cache", semantic_layer_fetcher.stats)
+    register_stats("semantic_layer_api", semantic_layer_fetcher.gql_client.stats)
+    register_stats("semantic_layer_sessions", semantic_layer_fetcher.session_pool.stats)
+    register_stats(
+        "semantic_layer_result_pages", semantic_layer_fetcher.result_pages.stats
+    )
 
-    def list_metrics() -> list[MetricToolResponse] | str:
+    async def list_metrics() -> list[MetricToolResponse] | str:
         try:
-            return semantic_layer_fetcher.list_metrics()
+            return await semantic_layer_fetcher.list_metrics()
         except Exception as e:
             return str(e)
 
-    def get_dimensions(metrics: list[str]) -> list[DimensionToolResponse] | str:
+    async def get_dimensions(metrics: list[str]) -> list[DimensionToolResponse] | str:
         try:
-            return semantic_layer_fetcher.get_dimensions(metrics=metrics)
+            return await semantic_layer_fetcher.get_dimensions(metrics=metrics)
         except Exception as e:
             return str(e)
 
-    def get_entities(metrics: list[str]) -> list[EntityToolResponse] | str:
+    async def get_entities(metrics: list[str]) -> list[EntityToolResponse] | str:
         try:
-            return semantic_layer_fetcher.get_entities(metrics=metrics)
+            return await semantic_layer_fetcher.get_entities(metrics=metrics)
         except Exception as e:
             return str(e)
 
-    def query_metrics(
+    async def query_metrics(
         metrics: list[str],
         group_by: list[GroupByParam] | None = None,
         order_by: list[OrderByParam] | None = None,
         where: str | None = None,
         limit: int | None = None,
+        result_format: ResultFormat = "json",
+        read_cache: bool = True,
+        use_cache: bool = True,
     ) -> str:
         try:
-            result = semantic_layer_fetcher.query_metrics(
+            result = await semantic_layer_fetcher.query_metrics(
                 metrics=metrics,
                 group_by=group_by,
                 order_by=order_by,
                 where=where,
                 limit=limit,
+                result_format=result_format,
+                read_cache=read_cache,
+                use_cache=use_cache,
+            )
+            if isinstance(result, QueryMetricsSuccess):
+                return result.result
+            else:
+                return result.error
+        except Exception as e:
+            return str(e)
+
+    async def get_query_metrics_page(
+        cursor: str, result_format: ResultFormat = "json"
+    ) -> str:
+        try:
+            result = await semantic_layer_fetcher.get_query_metrics_page(
+                cursor=cursor, result_format=result_format
             )
             if isinstance(result, QueryMetricsSuccess):
                 return result.result
@@ -90,6 +115,10 @@ def create_sl_tool_definitions(
             description=get_prompt("semantic_layer/query_metrics"),
             fn=query_metrics,
         ),
+        ToolDefinition(
+            description=get_prompt("semantic_layer/get_query_metrics_page"),
+            fn=get_query_metrics_page,
+        ),
     ]
 
 
@@ -102,11 +131,7 @@ def register_sl_tools(
         dbt_mcp,
         create_sl_tool_definitions(
             config,
-            SyncSemanticLayerClient(
-                environment_id=config.prod_environment_id,
-                auth_token=config.service_token,
-                host=config.host,
-            ),
+            lambda: create_sl_client(config),
         ),
         exclude_tools,
     )
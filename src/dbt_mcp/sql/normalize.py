@@ -0,0 +1,17 @@
+import re
+
+# Quoted strings and identifiers are kept as is, other whitespace is collapsed
+# along with comments, which would otherwise swallow the following lines
+SQL_WHITESPACE_PATTERN = re.compile(
+    r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")|(?:\s|--[^\n]*|/\*.*?\*/)+",
+    re.DOTALL,
+)
+
+
+def normalize_sql(sql: str) -> str:
+    """`sql` without comments, insignificant whitespace and trailing
+    semicolons, so that equivalent queries can share cache keys."""
+    normalized = SQL_WHITESPACE_PATTERN.sub(
+        lambda match: match.group(1) or " ", sql
+    ).strip()
+    return normalized.rstrip(";").rstrip()
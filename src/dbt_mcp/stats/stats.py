@@ -0,0 +1,17 @@
+from collections.abc import Callable
+from typing import Any
+
+StatsProvider = Callable[[], dict[str, Any]]
+
+# Components register a function returning their current counters, which
+# the server exposes (e.g. on the /stats endpoint of the HTTP server).
+_providers: dict[str, StatsProvider] = {}
+
+
+def register_stats(name: str, provider: StatsProvider) -> None:
+    """Registers the stats of a component, replacing any with the same name."""
+    _providers[name] = provider
+
+
+def get_stats() -> dict[str, dict[str, Any]]:
+    return {name: provider() for name, provider in _providers.items()}
@@ -0,0 +1,61 @@
+import logging
+from collections import deque
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OutputEvent:
+    message: str
+    data: dict[str, Any] | None = None
+
+
+OutputListener = Callable[[OutputEvent], Awaitable[None]]
+
+# Set by the caller of a tool (MCP progress notifications, HTTP streaming)
+# to receive the output of long-running tools while they are running.
+output_listener: ContextVar[OutputListener | None] = ContextVar(
+    "output_listener", default=None
+)
+
+
+async def publish_output(listener: OutputListener | None, event: OutputEvent) -> None:
+    if listener is None:
+        return
+    try:
+        await listener(event)
+    except Exception as e:
+        # A client going away must not interrupt the tool itself
+        logger.warning(f"Failed to publish tool output: {e}")
+
+
+class OutputRingBuffer:
+    """Keeps the most recent output up to `max_bytes`, dropping the oldest lines."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lines: deque[tuple[str, int]] = deque()
+        self._size = 0
+        self.dropped_lines = 0
+
+    def append(self, line: str) -> None:
+        # Lines are stored with their size once encoded, which is what the
+        # limit is in
+        self._lines.append((line, len(line.encode())))
+        self._size += self._lines[-1][1]
+        while self._size > self.max_bytes and len(self._lines) > 1:
+            self._size -= self._lines.popleft()[1]
+            self.dropped_lines += 1
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def text(self) -> str:
+        output = "".join(line for line, _ in self._lines)
+        if self.dropped_lines:
+            return f"... ({self.dropped_lines} earlier lines omitted)\n" + output
+        return output
@@ -24,13 +24,22 @@ class ToolName(Enum):
     GET_DIMENSIONS = "get_dimensions"
     GET_ENTITIES = "get_entities"
     QUERY_METRICS = "query_metrics"
+    GET_QUERY_METRICS_PAGE = "get_query_metrics_page"
 
     # Discovery tools
     GET_MART_MODELS = "get_mart_models"
     GET_ALL_MODELS = "get_all_models"
+    GET_MODELS_PAGE = "get_models_page"
+    SEARCH_MODELS = "search_models"
     GET_MODEL_DETAILS = "get_model_details"
     GET_MODEL_PARENTS = "get_model_parents"
     GET_MODEL_CHILDREN = "get_model_children"
+    GET_MODEL_DETAILS_BATCH = "get_model_details_batch"
+    GET_MODEL_PARENTS_BATCH = "get_model_parents_batch"
+    GET_MODEL_CHILDREN_BATCH = "get_model_children_batch"
+    GET_MODEL_LINEAGE = "get_model_lineage"
+    GET_LINEAGE_PATH = "get_lineage_path"
+    GET_MODEL_IMPACT = "get_model_impact"
 
     # Remote tools
     TEXT_TO_SQL = "text_to_sql"
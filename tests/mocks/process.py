@@ -0,0 +1,24 @@
+class MockStream:
+    """Stands in for the stdout of an asyncio subprocess."""
+
+    def __init__(self, lines: list[bytes]):
+        self.lines = lines
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for line in self.lines:
+            yield line
+
+
+class MockProcess:
+    def __init__(self, lines: list[bytes] | None = None):
+        self.stdout = MockStream(lines if lines is not None else [b"command output"])
+        self.killed = False
+
+    def kill(self):
+        self.killed = True
+
+    async def wait(self):
+        return -9 if self.killed else 0
@@ -0,0 +1,83 @@
+from dbt_mcp.cache.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_get_and_set():
+    cache: TTLCache[str, str] = TTLCache(ttl_seconds=10, max_entries=10)
+
+    assert cache.get("a") is None
+    cache.set("a", "value")
+    assert cache.get("a") == "value"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire():
+    clock = FakeClock()
+    cache: TTLCache[str, str] = TTLCache(ttl_seconds=10, max_entries=10, clock=clock)
+    cache.set("a", "value")
+
+    clock.now = 9.9
+    assert cache.get("a") == "value"
+    clock.now = 10
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+    assert len(cache) == 0
+
+
+def test_evicts_least_recently_used():
+    cache: TTLCache[str, str] = TTLCache(ttl_seconds=10, max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_evicts_to_stay_under_max_bytes():
+    cache: TTLCache[str, str] = TTLCache(ttl_seconds=10, max_entries=10, max_bytes=10)
+    cache.set("a", "aaaa")
+    cache.set("b", "bbbb")
+    cache.set("c", "cccc")
+
+    assert cache.get("a") is None
+    assert cache.stats()["size_bytes"] == 8
+
+    # Values larger than the cache itself are not stored
+    cache.set("d", "d" * 11)
+    assert cache.get("d") is None
+    assert cache.get("b") == "bbbb"
+
+
+def test_replacing_a_value_updates_its_size():
+    cache: TTLCache[str, str] = TTLCache(ttl_seconds=10, max_entries=10, max_bytes=10)
+    cache.set("a", "aaaa")
+    cache.set("a", "aa")
+
+    assert cache.stats()["size_bytes"] == 2
+    assert cache.stats()["entries"] == 1
+
+
+def test_invalidate():
+    cache: TTLCache[str, str] = TTLCache(ttl_seconds=10, max_entries=10, max_bytes=10)
+    cache.set("a", "1")
+    cache.set("b", "2")
+
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.get("b") == "2"
+
+    cache.invalidate()
+    assert len(cache) == 0
+    assert cache.stats()["size_bytes"] == 0
@@ -1,5 +1,5 @@
 import os
-from unittest.mock import patch, mock_open
+from unittest.mock import mock_open, patch
 
 import pytest
 import yaml
@@ -92,6 +92,24 @@ class TestDbtMcpSettings:
                 settings = DbtMcpSettings(_env_file=None)
                 assert settings.disable_tools == expected
 
+    def test_dbt_cli_command_concurrency_parsing(self):
+        test_cases = [
+            ("build|run|test=1,docs=2", {"build|run|test": 1, "docs": 2}),
+            (" build = 1 , ,list=8", {"build": 1, "list": 8}),
+            ("", None),
+        ]
+
+        for input_val, expected in test_cases:
+            with patch.dict(os.environ, {"DBT_CLI_COMMAND_CONCURRENCY": input_val}):
+                settings = DbtMcpSettings(_env_file=None)
+                assert settings.dbt_cli_command_concurrency == expected
+
+        with (
+            patch.dict(os.environ, {"DBT_CLI_COMMAND_CONCURRENCY": "build"}),
+            pytest.raises(ValueError, match="DBT_CLI_COMMAND_CONCURRENCY"),
+        ):
+            DbtMcpSettings(_env_file=None)
+
     def test_actual_host_property(self):
         with patch.dict(os.environ, {"DBT_HOST": "host1.com"}):
             settings = DbtMcpSettings(_env_file=None)
@@ -151,13 +169,15 @@ class TestLoadConfig:
 
     def _load_config_with_env(self, env_vars):
         """Helper method to load config with test environment variables, avoiding .env file interference"""
-        with patch.dict(os.environ, env_vars):
-            with patch("dbt_mcp.config.config.DbtMcpSettings") as mock_settings_class:
-                # Create a real instance with test values, but without .env file loading
-                with patch.dict(os.environ, env_vars, clear=True):
-                    settings_instance = DbtMcpSettings(_env_file=None)
-                mock_settings_class.return_value = settings_instance
-                return load_config()
+        with (
+            patch.dict(os.environ, env_vars),
+            patch("dbt_mcp.config.config.DbtMcpSettings") as mock_settings_class,
+        ):
+            # Create a real instance with test values, but without .env file loading
+            with patch.dict(os.environ, env_vars, clear=True):
+                settings_instance = DbtMcpSettings(_env_file=None)
+            mock_settings_class.return_value = settings_instance
+            return load_config()
 
     def test_valid_config_all_services_enabled(self):
         env_vars = {
@@ -371,16 +391,18 @@ class TestLoadConfig:
         }
 
         # For this test, we need to call load_config directly to see environment side effects
-        with patch.dict(os.environ, env_vars, clear=True):
-            with patch("dbt_mcp.config.config.DbtMcpSettings") as mock_settings_class:
-                settings_instance = DbtMcpSettings(_env_file=None)
-                mock_settings_class.return_value = settings_instance
-                load_config()
+        with (
+            patch.dict(os.environ, env_vars, clear=True),
+            patch("dbt_mcp.config.config.DbtMcpSettings") as mock_settings_class,
+        ):
+            settings_instance = DbtMcpSettings(_env_file=None)
+            mock_settings_class.return_value = settings_instance
+            load_config()
 
-                assert (
-                    os.environ["DBT_WARN_ERROR_OPTIONS"]
-                    == '{"error": ["NoNodesForSelectionCriteria"]}'
-                )
+            assert (
+                os.environ["DBT_WARN_ERROR_OPTIONS"]
+                == '{"error": ["NoNodesForSelectionCriteria"]}'
+            )
 
     def test_warn_error_options_not_overridden_if_set(self):
         env_vars = {
@@ -392,13 +414,15 @@ class TestLoadConfig:
         }
 
         # For this test, we need to call load_config directly to see environment side effects
-        with patch.dict(os.environ, env_vars, clear=True):
-            with patch("dbt_mcp.config.config.DbtMcpSettings") as mock_settings_class:
-                settings_instance = DbtMcpSettings(_env_file=None)
-                mock_settings_class.return_value = settings_instance
-                load_config()
+        with (
+            patch.dict(os.environ, env_vars, clear=True),
+            patch("dbt_mcp.config.config.DbtMcpSettings") as mock_settings_class,
+        ):
+            settings_instance = DbtMcpSettings(_env_file=None)
+            mock_settings_class.return_value = settings_instance
+            load_config()
 
-                assert os.environ["DBT_WARN_ERROR_OPTIONS"] == "custom_options"
+            assert os.environ["DBT_WARN_ERROR_OPTIONS"] == "custom_options"
 
     def test_local_user_id_loading_from_dbt_profile(self):
         user_data = {"id": "local_user_123"}
@@ -412,11 +436,13 @@ class TestLoadConfig:
             "DISABLE_REMOTE": "true",
         }
 
-        with patch.dict(os.environ, env_vars):
-            with patch("pathlib.Path.exists", return_value=True):
-                with patch("builtins.open", mock_open(read_data=mock_file_content)):
-                    config = self._load_config_with_env(env_vars)
-                    assert config.tracking_config.local_user_id == "local_user_123"
+        with (
+            patch.dict(os.environ, env_vars),
+            patch("pathlib.Path.exists", return_value=True),
+            patch("builtins.open", mock_open(read_data=mock_file_content)),
+        ):
+            config = self._load_config_with_env(env_vars)
+            assert config.tracking_config.local_user_id == "local_user_123"
 
     def test_local_user_id_loading_failure_handling(self):
         env_vars = {
@@ -427,10 +453,12 @@ class TestLoadConfig:
             "DISABLE_REMOTE": "true",
         }
 
-        with patch.dict(os.environ, env_vars):
-            with patch("pathlib.Path.exists", return_value=False):
-                config = self._load_config_with_env(env_vars)
-                assert config.tracking_config.local_user_id is None
+        with (
+            patch.dict(os.environ, env_vars),
+            patch("pathlib.Path.exists", return_value=False),
+        ):
+            config = self._load_config_with_env(env_vars)
+            assert config.tracking_config.local_user_id is None
 
     def test_remote_requirements(self):
         # Test that remote_config is only created when remote tools are enabled
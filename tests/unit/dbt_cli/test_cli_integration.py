@@ -1,12 +1,14 @@
+import asyncio
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from tests.mocks.config import mock_config
+from tests.mocks.process import MockProcess
 
 
 class TestDbtCliIntegration(unittest.TestCase):
-    @patch("subprocess.Popen")
-    def test_dbt_command_execution(self, mock_popen):
+    @patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
+    def test_dbt_command_execution(self, mock_create_subprocess_exec):
         """
         Tests the full execution path for dbt commands, ensuring they are properly
         executed with the right arguments.
@@ -15,9 +17,9 @@ class TestDbtCliIntegration(unittest.TestCase):
         from dbt_mcp.dbt_cli.tools import register_dbt_cli_tools
 
         # Mock setup
-        mock_process = MagicMock()
-        mock_process.communicate.return_value = ("command output", None)
-        mock_popen.return_value = mock_process
+        mock_create_subprocess_exec.side_effect = lambda *args, **kwargs: MockProcess(
+            [b"command output"]
+        )
 
         # Create a mock FastMCP and Config
         mock_fastmcp = MagicMock()
@@ -91,21 +93,23 @@ class TestDbtCliIntegration(unittest.TestCase):
 
         # Run each test case
         for command_name, args, expected_args in test_cases:
-            mock_popen.reset_mock()
+            mock_create_subprocess_exec.reset_mock()
 
             # Call the function
-            result = tools[command_name](*args)
+            result = asyncio.run(tools[command_name](*args))
 
             # Verify the command was called correctly
-            mock_popen.assert_called_once()
-            actual_args = mock_popen.call_args.kwargs.get("args")
+            mock_create_subprocess_exec.assert_called_once()
+            actual_args = list(mock_create_subprocess_exec.call_args.args)
 
             num_params = 3
 
             self.assertEqual(actual_args[:num_params], expected_args[:num_params])
 
             # Verify correct working directory
-            self.assertEqual(mock_popen.call_args.kwargs.get("cwd"), "/test/project")
+            self.assertEqual(
+                mock_create_subprocess_exec.call_args.kwargs.get("cwd"), "/test/project"
+            )
 
             # Verify the output is returned correctly
             self.assertEqual(result, "command output")
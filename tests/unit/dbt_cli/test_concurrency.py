@@ -0,0 +1,105 @@
+import asyncio
+import stat
+import time
+from pathlib import Path
+
+import pytest
+
+from dbt_mcp.config.config import DbtCliConfig
+from dbt_mcp.dbt_cli.tools import register_dbt_cli_tools
+
+FAKE_DBT = """#!/bin/sh
+if [ "$1" = "build" ]; then
+    sleep {build_seconds}
+    echo "build done"
+else
+    sleep {other_seconds}
+    echo "$1 done"
+fi
+"""
+
+
+@pytest.fixture
+def mock_fastmcp():
+    class MockFastMCP:
+        def __init__(self):
+            self.tools = {}
+
+        def tool(self, **kwargs):
+            def decorator(func):
+                self.tools[func.__name__] = func
+                return func
+
+            return decorator
+
+    fastmcp = MockFastMCP()
+    return fastmcp, fastmcp.tools
+
+
+def _fake_dbt(
+    tmp_path: Path, build_seconds: float = 2, other_seconds: float = 0.1
+) -> str:
+    dbt_path = tmp_path / "dbt"
+    dbt_path.write_text(
+        FAKE_DBT.format(build_seconds=build_seconds, other_seconds=other_seconds)
+    )
+    dbt_path.chmod(dbt_path.stat().st_mode | stat.S_IEXEC)
+    return str(dbt_path)
+
+
+async def test_list_calls_complete_while_build_in_flight(tmp_path, mock_fastmcp):
+    fastmcp, tools = mock_fastmcp
+    register_dbt_cli_tools(
+        fastmcp,
+        DbtCliConfig(
+            project_dir=str(tmp_path),
+            dbt_path=_fake_dbt(tmp_path),
+            dbt_cli_timeout=10,
+            dbt_cli_max_concurrency=8,
+        ),
+    )
+
+    # The event loop must keep ticking while the build is running
+    heartbeats = 0
+
+    async def heartbeat():
+        nonlocal heartbeats
+        while True:
+            await asyncio.sleep(0.05)
+            heartbeats += 1
+
+    heartbeat_task = asyncio.create_task(heartbeat())
+    build_task = asyncio.create_task(tools["build"](selector=None))
+    await asyncio.sleep(0.1)
+
+    start = time.monotonic()
+    list_results = await asyncio.gather(
+        *[tools["ls"](selector=None, resource_type=None) for _ in range(5)]
+    )
+    list_elapsed = time.monotonic() - start
+
+    assert not build_task.done()
+    assert all(result.strip() == "list done" for result in list_results)
+    assert list_elapsed < 1.5
+    assert await build_task == "build done\n"
+    heartbeat_task.cancel()
+    assert heartbeats > 10
+
+
+async def test_concurrency_limit_bounds_running_commands(tmp_path, mock_fastmcp):
+    fastmcp, tools = mock_fastmcp
+    register_dbt_cli_tools(
+        fastmcp,
+        DbtCliConfig(
+            project_dir=str(tmp_path),
+            dbt_path=_fake_dbt(tmp_path, other_seconds=0.3),
+            dbt_cli_timeout=10,
+            dbt_cli_max_concurrency=1,
+        ),
+    )
+
+    start = time.monotonic()
+    await asyncio.gather(*[tools["parse"]() for _ in range(3)])
+
+    # With a single slot the three commands have to run one after another
+    assert time.monotonic() - start >= 0.9
@@ -0,0 +1,162 @@
+import stat
+import sys
+import types
+from dataclasses import dataclass, field
+from typing import Any
+
+import pytest
+
+from dbt_mcp.config.config import DbtCliConfig
+from dbt_mcp.dbt_cli.embedded_runner import (
+    EmbeddedDbtRunner,
+    create_embedded_runner,
+    detect_dbt_flavor,
+)
+
+
+@dataclass
+class FakeEventInfo:
+    name: str
+    level: str
+    msg: str
+
+
+@dataclass
+class FakeEvent:
+    info: FakeEventInfo
+
+
+@dataclass
+class FakeRunnerResult:
+    success: bool
+    result: Any = None
+    exception: BaseException | None = None
+
+
+@dataclass
+class FakeDbtRunner:
+    invocations: list[tuple[list[str], Any]] = field(default_factory=list)
+
+    def __call__(self, manifest=None, callbacks=None):
+        fake_runner = self
+
+        class Runner:
+            def invoke(self, args):
+                fake_runner.invocations.append((args, manifest))
+                if args[0] == "parse":
+                    return FakeRunnerResult(success=True, result="manifest")
+                for callback in callbacks:
+                    callback(FakeEvent(FakeEventInfo("MainReportVersion", "info", "")))
+                    callback(FakeEvent(FakeEventInfo("PrintEvent", "info", "a.b.c")))
+                    callback(FakeEvent(FakeEventInfo("PrintEvent", "info", "a.b.d")))
+                return FakeRunnerResult(success=True, result=["a.b.c", "a.b.d"])
+
+        return Runner()
+
+
+@pytest.fixture
+def fake_dbt_runner(monkeypatch):
+    fake_runner = FakeDbtRunner()
+    dbt_module = types.ModuleType("dbt")
+    cli_module = types.ModuleType("dbt.cli")
+    main_module = types.ModuleType("dbt.cli.main")
+    main_module.dbtRunner = fake_runner  # type: ignore[attr-defined]
+    monkeypatch.setitem(sys.modules, "dbt", dbt_module)
+    monkeypatch.setitem(sys.modules, "dbt.cli", cli_module)
+    monkeypatch.setitem(sys.modules, "dbt.cli.main", main_module)
+    return fake_runner
+
+
+def _fake_executable(tmp_path, version_output: str) -> str:
+    dbt_path = tmp_path / "dbt"
+    dbt_path.write_text(f"#!/bin/sh\nprintf '{version_output}'\n")
+    dbt_path.chmod(dbt_path.stat().st_mode | stat.S_IEXEC)
+    return str(dbt_path)
+
+
+@pytest.mark.parametrize(
+    "version_output,expected_flavor",
+    [
+        ("Core:\\n  - installed: 1.10.4\\n", "core"),
+        ("dbt Cloud CLI - 0.38.22\\n", "cloud_cli"),
+        ("dbt-fusion 2.0.0-beta.34\\n", "fusion"),
+        ("something else\\n", "unknown"),
+    ],
+)
+def test_detect_dbt_flavor(tmp_path, version_output, expected_flavor):
+    assert detect_dbt_flavor(_fake_executable(tmp_path, version_output)) == (
+        expected_flavor
+    )
+
+
+def test_detect_dbt_flavor_missing_executable():
+    assert detect_dbt_flavor("/path/to/missing/dbt") == "unknown"
+
+
+def test_create_embedded_runner_falls_back_for_cloud_cli(tmp_path, fake_dbt_runner):
+    config = DbtCliConfig(
+        project_dir=str(tmp_path),
+        dbt_path=_fake_executable(tmp_path, "dbt Cloud CLI - 0.38.22\\n"),
+        dbt_cli_timeout=10,
+        dbt_cli_backend="embedded",
+    )
+    assert create_embedded_runner(config) is None
+
+
+def test_create_embedded_runner_for_dbt_core(tmp_path, fake_dbt_runner):
+    config = DbtCliConfig(
+        project_dir=str(tmp_path),
+        dbt_path=_fake_executable(tmp_path, "Core:\\n  - installed: 1.10.4\\n"),
+        dbt_cli_timeout=10,
+        dbt_cli_backend="embedded",
+    )
+    assert isinstance(create_embedded_runner(config), EmbeddedDbtRunner)
+    config.dbt_cli_backend = "subprocess"
+    assert create_embedded_runner(config) is None
+
+
+async def test_embedded_runner_reuses_manifest(tmp_path, fake_dbt_runner):
+    (tmp_path / "models").mkdir()
+    (tmp_path / "models" / "a.sql").write_text("select 1")
+    runner = EmbeddedDbtRunner(project_dir=str(tmp_path))
+
+    assert await runner.invoke(["list", "--quiet"]) == "a.b.c\na.b.d"
+    assert await runner.invoke(["list", "--quiet"]) == "a.b.c\na.b.d"
+
+    commands = [args[0] for args, _ in fake_dbt_runner.invocations]
+    assert commands == ["parse", "list", "list"]
+    assert fake_dbt_runner.invocations[1][1] == "manifest"
+    assert fake_dbt_runner.invocations[1][0][-4:] == [
+        "--project-dir",
+        str(tmp_path),
+        "--log-level",
+        "none",
+    ]
+
+    # Changing a project file forces a new parse
+    (tmp_path / "models" / "b.sql").write_text("select 2")
+    await runner.invoke(["list", "--quiet"])
+    commands = [args[0] for args, _ in fake_dbt_runner.invocations]
+    assert commands == ["parse", "list", "list", "parse", "list"]
+
+
+async def test_embedded_runner_only_parses_for_manifest_commands(
+    tmp_path, fake_dbt_runner, monkeypatch
+):
+    fingerprints: list[str] = []
+    monkeypatch.setattr(
+        "dbt_mcp.dbt_cli.embedded_runner.fingerprint_project",
+        lambda project_dir: fingerprints.append(project_dir) or "fingerprint",
+    )
+    runner = EmbeddedDbtRunner(project_dir=str(tmp_path))
+
+    await runner.invoke(["debug"])
+    assert fingerprints == []
+
+    await runner.invoke(["parse"])
+    await runner.invoke(["list", "--quiet"])
+    commands = [args[0] for args, _ in fake_dbt_runner.invocations]
+    assert commands == ["debug", "parse", "list"]
+    assert fake_dbt_runner.invocations[0][1] is None
+    assert fake_dbt_runner.invocations[2][1] == "manifest"
+    assert len(fingerprints) == 2
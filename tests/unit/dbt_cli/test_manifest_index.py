@@ -0,0 +1,256 @@
+import json
+import os
+
+import pytest
+
+from dbt_mcp.config.config import DbtCliConfig
+from dbt_mcp.dbt_cli.manifest_index import ManifestIndex
+from dbt_mcp.dbt_cli.tools import register_dbt_cli_tools
+
+
+def _node(unique_id: str, fqn: list[str], path: str, **kwargs) -> dict:
+    resource_type, package_name, name = unique_id.split(".")[:3]
+    return {
+        "name": name,
+        "resource_type": resource_type,
+        "package_name": package_name,
+        "fqn": fqn,
+        "original_file_path": path,
+        "tags": [],
+    } | kwargs
+
+
+MANIFEST = {
+    "metadata": {"project_name": "jaffle"},
+    "nodes": {
+        "model.jaffle.stg_orders": _node(
+            "model.jaffle.stg_orders",
+            ["jaffle", "staging", "stg_orders"],
+            "models/staging/stg_orders.sql",
+            tags=["staging"],
+        ),
+        "model.jaffle.stg_customers": _node(
+            "model.jaffle.stg_customers",
+            ["jaffle", "staging", "stg_customers"],
+            "models/staging/stg_customers.sql",
+            tags=["staging"],
+        ),
+        "model.jaffle.customers": _node(
+            "model.jaffle.customers",
+            ["jaffle", "marts", "customers"],
+            "models/marts/customers.sql",
+            tags=["nightly"],
+        ),
+        "model.jaffle.orders_report": _node(
+            "model.jaffle.orders_report",
+            ["jaffle", "marts", "orders_report"],
+            "models/marts/orders_report.sql",
+        ),
+        "test.jaffle.not_null_customers_id.abc": _node(
+            "test.jaffle.not_null_customers_id.abc",
+            ["jaffle", "not_null_customers_id"],
+            "models/marts/schema.yml",
+        ),
+        "model.utils.calendar": _node(
+            "model.utils.calendar",
+            ["utils", "calendar"],
+            "models/calendar.sql",
+        ),
+    },
+    "sources": {
+        "source.jaffle.raw.orders": _node(
+            "source.jaffle.raw",
+            ["jaffle", "raw", "orders"],
+            "models/staging/sources.yml",
+            name="orders",
+            source_name="raw",
+        ),
+    },
+    "parent_map": {
+        "source.jaffle.raw.orders": [],
+        "model.jaffle.stg_orders": ["source.jaffle.raw.orders"],
+        "model.jaffle.stg_customers": [],
+        "model.jaffle.customers": [
+            "model.jaffle.stg_orders",
+            "model.jaffle.stg_customers",
+        ],
+        "model.jaffle.orders_report": ["model.jaffle.customers"],
+        "test.jaffle.not_null_customers_id.abc": ["model.jaffle.customers"],
+        "model.utils.calendar": [],
+    },
+    "child_map": {
+        "source.jaffle.raw.orders": ["model.jaffle.stg_orders"],
+        "model.jaffle.stg_orders": ["model.jaffle.customers"],
+        "model.jaffle.stg_customers": ["model.jaffle.customers"],
+        "model.jaffle.customers": [
+            "model.jaffle.orders_report",
+            "test.jaffle.not_null_customers_id.abc",
+        ],
+        "model.jaffle.orders_report": [],
+        "test.jaffle.not_null_customers_id.abc": [],
+        "model.utils.calendar": [],
+    },
+}
+
+
+@pytest.fixture
+def manifest_index(tmp_path):
+    (tmp_path / "target").mkdir()
+    (tmp_path / "target" / "manifest.json").write_text(json.dumps(MANIFEST))
+    return ManifestIndex(str(tmp_path))
+
+
+@pytest.mark.parametrize(
+    "selector,resource_types,expected",
+    [
+        ("stg_orders", None, ["jaffle.staging.stg_orders"]),
+        (
+            "tag:staging",
+            None,
+            ["jaffle.staging.stg_customers", "jaffle.staging.stg_orders"],
+        ),
+        (
+            "staging",
+            None,
+            ["jaffle.staging.stg_customers", "jaffle.staging.stg_orders"],
+        ),
+        (
+            "path:models/marts",
+            ["model"],
+            ["jaffle.marts.customers", "jaffle.marts.orders_report"],
+        ),
+        ("package:utils", None, ["utils.calendar"]),
+        (
+            "+stg_orders",
+            None,
+            ["jaffle.staging.stg_orders", "source:jaffle.raw.orders"],
+        ),
+        (
+            "stg_orders+",
+            None,
+            [
+                "jaffle.marts.customers",
+                "jaffle.marts.orders_report",
+                "jaffle.staging.stg_orders",
+                "jaffle.not_null_customers_id",
+            ],
+        ),
+        (
+            "stg_orders+1",
+            ["model"],
+            ["jaffle.marts.customers", "jaffle.staging.stg_orders"],
+        ),
+        (
+            "@stg_orders",
+            ["model", "source"],
+            [
+                "jaffle.marts.customers",
+                "jaffle.marts.orders_report",
+                "jaffle.staging.stg_customers",
+                "jaffle.staging.stg_orders",
+                "source:jaffle.raw.orders",
+            ],
+        ),
+        # Tests are selected together with the models they test
+        ("customers", None, ["jaffle.marts.customers", "jaffle.not_null_customers_id"]),
+        # Tests selected indirectly are part of both sides of the intersection
+        (
+            "tag:nightly,resource_type:model",
+            None,
+            ["jaffle.marts.customers", "jaffle.not_null_customers_id"],
+        ),
+        (
+            "stg_orders utils.calendar",
+            None,
+            ["jaffle.staging.stg_orders", "utils.calendar"],
+        ),
+        ("resource_type:source", None, ["source:jaffle.raw.orders"]),
+        ("source:raw", None, ["source:jaffle.raw.orders"]),
+        (
+            "jaffle.marts.*",
+            ["model"],
+            ["jaffle.marts.customers", "jaffle.marts.orders_report"],
+        ),
+    ],
+)
+def test_list_nodes(manifest_index, selector, resource_types, expected):
+    # Nodes are listed in unique_id order, like in dbt
+    assert manifest_index.list_nodes(selector, resource_types) == expected
+
+
+def test_list_nodes_without_selector(manifest_index):
+    assert manifest_index.list_nodes(None, ["model"]) == [
+        "jaffle.marts.customers",
+        "jaffle.marts.orders_report",
+        "jaffle.staging.stg_customers",
+        "jaffle.staging.stg_orders",
+        "utils.calendar",
+    ]
+
+
+@pytest.mark.parametrize(
+    "selector",
+    ["state:modified", "config.materialized:table", "path:models/*/stg_*.sql"],
+)
+def test_unsupported_selectors_fall_back(manifest_index, selector):
+    assert manifest_index.list_nodes(selector, None) is None
+
+
+def test_missing_manifest(tmp_path):
+    assert ManifestIndex(str(tmp_path)).list_nodes("stg_orders", None) is None
+
+
+def test_reloads_when_manifest_changes(manifest_index):
+    assert manifest_index.list_nodes("new_model", None) == []
+
+    manifest = json.loads(json.dumps(MANIFEST))
+    manifest["nodes"]["model.jaffle.new_model"] = _node(
+        "model.jaffle.new_model",
+        ["jaffle", "new_model"],
+        "models/new_model.sql",
+    )
+    with open(manifest_index.manifest_path, "w") as f:
+        json.dump(manifest, f)
+    stat = os.stat(manifest_index.manifest_path)
+    os.utime(
+        manifest_index.manifest_path,
+        ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000),
+    )
+
+    assert manifest_index.list_nodes("new_model", None) == ["jaffle.new_model"]
+
+
+async def test_list_tool_uses_manifest_index(manifest_index, monkeypatch):
+    subprocess_calls = []
+
+    async def mock_create_subprocess_exec(*args, **kwargs):
+        subprocess_calls.append(args)
+        raise AssertionError("dbt should not be called")
+
+    monkeypatch.setattr("asyncio.create_subprocess_exec", mock_create_subprocess_exec)
+
+    class MockFastMCP:
+        def __init__(self):
+            self.tools = {}
+
+        def tool(self, **kwargs):
+            def decorator(func):
+                self.tools[func.__name__] = func
+                return func
+
+            return decorator
+
+    fastmcp = MockFastMCP()
+    register_dbt_cli_tools(
+        fastmcp,  # type: ignore[arg-type]
+        DbtCliConfig(
+            project_dir=manifest_index.project_dir,
+            dbt_path="/path/to/dbt",
+            dbt_cli_timeout=10,
+        ),
+    )
+
+    result = await fastmcp.tools["ls"](selector="+stg_orders", resource_type=None)
+
+    assert result == "jaffle.staging.stg_orders\nsource:jaffle.raw.orders"
+    assert not subprocess_calls
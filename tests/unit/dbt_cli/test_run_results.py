@@ -0,0 +1,171 @@
+import json
+import stat
+from pathlib import Path
+
+from dbt_mcp.config.config import DbtCliConfig
+from dbt_mcp.dbt_cli.run_results import summarize_run_results
+from dbt_mcp.dbt_cli.tools import register_dbt_cli_tools
+
+
+def _result(unique_id: str, status: str, **kwargs) -> dict:
+    return {
+        "unique_id": unique_id,
+        "status": status,
+        "execution_time": 1.23456,
+        "adapter_response": {},
+        "message": None,
+        "failures": None,
+    } | kwargs
+
+
+RUN_RESULTS = {
+    "args": {"which": "build"},
+    "elapsed_time": 12.3456,
+    "results": [
+        _result(
+            "model.jaffle.stg_orders",
+            "success",
+            adapter_response={"rows_affected": 42},
+            message="SELECT 42",
+        ),
+        _result("model.jaffle.customers", "error", message="Database Error"),
+        _result("test.jaffle.not_null_customers_id", "fail", failures=3),
+        _result("model.jaffle.orders_report", "skipped"),
+        _result("test.jaffle.unique_orders_id", "pass"),
+    ],
+}
+
+
+def test_summarize_run_results():
+    assert json.loads(summarize_run_results(RUN_RESULTS, max_nodes=10)) == {
+        "status": "error",
+        "elapsed_time": 12.35,
+        "counts": {"success": 1, "error": 1, "fail": 1, "skipped": 1, "pass": 1},
+        "nodes": [
+            {
+                "unique_id": "model.jaffle.customers",
+                "status": "error",
+                "execution_time": 1.23,
+                "message": "Database Error",
+            },
+            {
+                "unique_id": "test.jaffle.not_null_customers_id",
+                "status": "fail",
+                "execution_time": 1.23,
+                "failures": 3,
+            },
+            {
+                "unique_id": "model.jaffle.orders_report",
+                "status": "skipped",
+                "execution_time": 1.23,
+            },
+            {
+                "unique_id": "model.jaffle.stg_orders",
+                "status": "success",
+                "execution_time": 1.23,
+                "rows_affected": 42,
+            },
+            {
+                "unique_id": "test.jaffle.unique_orders_id",
+                "status": "pass",
+                "execution_time": 1.23,
+            },
+        ],
+    }
+
+
+def test_summarize_run_results_caps_nodes():
+    summary = json.loads(summarize_run_results(RUN_RESULTS, max_nodes=2))
+
+    # Failing nodes are listed before the cap applies
+    assert [node["status"] for node in summary["nodes"]] == ["error", "fail"]
+    assert summary["omitted_nodes"] == 3
+    assert sum(summary["counts"].values()) == 5
+
+
+def test_summarize_successful_run():
+    summary = json.loads(
+        summarize_run_results(
+            {"results": [_result("model.jaffle.stg_orders", "success")]},
+            max_nodes=10,
+        )
+    )
+
+    assert summary["status"] == "success"
+    assert "omitted_nodes" not in summary
+
+
+FAKE_DBT = """#!/bin/sh
+echo "console output"
+if [ "$WRITE_RUN_RESULTS" = "1" ]; then
+    mkdir -p "{target}"
+    cat > "{target}/run_results.json" <<'JSON'
+{run_results}
+JSON
+fi
+"""
+
+
+def _register_tools(tmp_path: Path, **config) -> dict:
+    dbt_path = tmp_path / "dbt"
+    dbt_path.write_text(
+        FAKE_DBT.format(target=tmp_path / "target", run_results=json.dumps(RUN_RESULTS))
+    )
+    dbt_path.chmod(dbt_path.stat().st_mode | stat.S_IEXEC)
+
+    class MockFastMCP:
+        def __init__(self):
+            self.tools = {}
+
+        def tool(self, **kwargs):
+            def decorator(func):
+                self.tools[func.__name__] = func
+                return func
+
+            return decorator
+
+    fastmcp = MockFastMCP()
+    register_dbt_cli_tools(
+        fastmcp,  # type: ignore[arg-type]
+        DbtCliConfig(
+            project_dir=str(tmp_path),
+            dbt_path=str(dbt_path),
+            dbt_cli_timeout=10,
+            **config,
+        ),
+    )
+    return fastmcp.tools
+
+
+async def test_build_returns_summary(tmp_path, monkeypatch):
+    monkeypatch.setenv("WRITE_RUN_RESULTS", "1")
+    tools = _register_tools(tmp_path, dbt_cli_result_format="summary")
+
+    result = json.loads(await tools["build"](selector=None))
+
+    assert result["counts"]["error"] == 1
+    assert len(result["nodes"]) == 5
+
+
+async def test_stale_run_results_are_ignored(tmp_path, monkeypatch):
+    tools = _register_tools(tmp_path, dbt_cli_result_format="summary")
+    monkeypatch.setenv("WRITE_RUN_RESULTS", "1")
+    await tools["build"](selector=None)
+
+    # This run fails before writing run_results.json
+    monkeypatch.setenv("WRITE_RUN_RESULTS", "0")
+    assert await tools["build"](selector=None) == "console output\n"
+
+
+async def test_run_results_of_another_command_are_ignored(tmp_path, monkeypatch):
+    monkeypatch.setenv("WRITE_RUN_RESULTS", "1")
+    tools = _register_tools(tmp_path, dbt_cli_result_format="summary")
+
+    assert await tools["run"](selector=None) == "console output\n"
+
+
+async def test_text_format_by_default(tmp_path, monkeypatch):
+    monkeypatch.setenv("WRITE_RUN_RESULTS", "1")
+    tools = _register_tools(tmp_path)
+
+    assert await tools["build"](selector=None) == "console output\n"
@@ -0,0 +1,151 @@
+import asyncio
+
+import pytest
+
+from dbt_mcp.dbt_cli.scheduler import DbtCommandScheduler, SchedulerQueueFullError
+
+
+async def _run(
+    scheduler: DbtCommandScheduler,
+    command: str,
+    events: list[str],
+    release: asyncio.Event,
+) -> None:
+    async with scheduler.slot(command):
+        events.append(f"start {command}")
+        await release.wait()
+        events.append(f"end {command}")
+
+
+async def _settle() -> None:
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+async def test_group_limit():
+    scheduler = DbtCommandScheduler(
+        max_concurrency=4, command_concurrency={"build|run": 1}, max_queued=10
+    )
+    events: list[str] = []
+    release = asyncio.Event()
+
+    tasks = [
+        asyncio.create_task(_run(scheduler, command, events, release))
+        for command in ["build", "run", "list", "list"]
+    ]
+    await _settle()
+
+    # `run` waits for `build` as they share a group
+    assert events == ["start build", "start list", "start list"]
+    assert scheduler.stats()["running_by_group"] == {"build|run": 1, "list": 2}
+    assert scheduler.stats()["queued"] == 1
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert events.index("start run") > events.index("end build")
+    assert scheduler.stats()["completed"] == 4
+    assert scheduler.stats()["running"] == 0
+
+
+async def test_commands_start_in_queue_order():
+    scheduler = DbtCommandScheduler(
+        max_concurrency=1, command_concurrency={}, max_queued=10
+    )
+    events: list[str] = []
+    releases = {command: asyncio.Event() for command in ["a", "b", "c", "d"]}
+
+    tasks = []
+    for command in ["a", "b", "c", "d"]:
+        tasks.append(
+            asyncio.create_task(_run(scheduler, command, events, releases[command]))
+        )
+        await _settle()
+    for release in releases.values():
+        release.set()
+    await asyncio.gather(*tasks)
+
+    assert [event for event in events if event.startswith("start")] == [
+        "start a",
+        "start b",
+        "start c",
+        "start d",
+    ]
+
+
+async def test_waiting_group_does_not_block_other_commands():
+    scheduler = DbtCommandScheduler(
+        max_concurrency=2, command_concurrency={"build": 1}, max_queued=10
+    )
+    events: list[str] = []
+    release = asyncio.Event()
+    list_release = asyncio.Event()
+    list_release.set()
+
+    build_tasks = [
+        asyncio.create_task(_run(scheduler, "build", events, release)) for _ in range(2)
+    ]
+    await _settle()
+    # Queued after the second build, but can start right away
+    await _run(scheduler, "list", events, list_release)
+
+    assert events == ["start build", "start list", "end list"]
+    release.set()
+    await asyncio.gather(*build_tasks)
+
+
+async def test_queue_is_bounded():
+    scheduler = DbtCommandScheduler(
+        max_concurrency=1, command_concurrency={}, max_queued=1
+    )
+    events: list[str] = []
+    release = asyncio.Event()
+    tasks = [
+        asyncio.create_task(_run(scheduler, "build", events, release)) for _ in range(2)
+    ]
+    await _settle()
+
+    with pytest.raises(SchedulerQueueFullError):
+        await _run(scheduler, "list", events, release)
+    assert scheduler.stats()["rejected"] == 1
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+
+async def test_cancelled_commands_leave_the_queue():
+    scheduler = DbtCommandScheduler(
+        max_concurrency=1, command_concurrency={}, max_queued=10
+    )
+    events: list[str] = []
+    release = asyncio.Event()
+    running = asyncio.create_task(_run(scheduler, "build", events, release))
+    queued = asyncio.create_task(_run(scheduler, "list", events, release))
+    await _settle()
+
+    queued.cancel()
+    await _settle()
+    assert scheduler.stats()["queued"] == 0
+
+    release.set()
+    await running
+    assert events == ["start build", "end build"]
+    assert scheduler.stats()["running"] == 0
+
+
+async def test_queue_wait_metrics():
+    scheduler = DbtCommandScheduler(
+        max_concurrency=1, command_concurrency={}, max_queued=10
+    )
+    events: list[str] = []
+    release = asyncio.Event()
+    tasks = [
+        asyncio.create_task(_run(scheduler, "build", events, release)) for _ in range(2)
+    ]
+    await _settle()
+    await asyncio.sleep(0.05)
+    release.set()
+    await asyncio.gather(*tasks)
+
+    queue_wait = scheduler.stats()["queue_wait_seconds"]
+    assert queue_wait["max"] >= 0.05
+    assert queue_wait["p95"] == queue_wait["max"]
@@ -0,0 +1,106 @@
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from dbt_mcp.config.config import DbtCliConfig
+from dbt_mcp.dbt_cli.show_cache import is_show_output
+from dbt_mcp.dbt_cli.tools import register_dbt_cli_tools
+from dbt_mcp.stats.stats import get_stats
+from tests.mocks.process import MockProcess
+
+SHOW_OUTPUT = json.dumps({"show": [{"id": 1}]}, indent=2)
+
+
+def test_is_show_output():
+    assert is_show_output(SHOW_OUTPUT)
+    assert not is_show_output("Database Error: relation does not exist")
+    assert not is_show_output('"show"')
+
+
+@pytest.fixture
+def show_tool(tmp_path, monkeypatch):
+    (tmp_path / "models").mkdir()
+    (tmp_path / "models" / "orders.sql").write_text("select 1 as id")
+    outputs = [SHOW_OUTPUT]
+    create_subprocess_exec = AsyncMock(
+        side_effect=lambda *args, **kwargs: MockProcess(
+            [line.encode() for line in outputs[0].splitlines(keepends=True)]
+        )
+    )
+    monkeypatch.setattr("asyncio.create_subprocess_exec", create_subprocess_exec)
+
+    class MockFastMCP:
+        def __init__(self):
+            self.tools = {}
+
+        def tool(self, **kwargs):
+            def decorator(func):
+                self.tools[func.__name__] = func
+                return func
+
+            return decorator
+
+    fastmcp = MockFastMCP()
+    register_dbt_cli_tools(
+        fastmcp,  # type: ignore[arg-type]
+        DbtCliConfig(
+            project_dir=str(tmp_path),
+            dbt_path="/path/to/dbt",
+            dbt_cli_timeout=10,
+            dbt_cli_show_cache_ttl=60,
+        ),
+    )
+    return fastmcp.tools["show"], create_subprocess_exec, outputs
+
+
+async def test_show_results_are_cached(show_tool):
+    show, create_subprocess_exec, _ = show_tool
+
+    first = await show(sql_query="select * from orders", limit=5, use_cache=True)
+    second = await show(sql_query="select *\nfrom orders;", limit=5, use_cache=True)
+
+    assert first == second == SHOW_OUTPUT
+    assert create_subprocess_exec.call_count == 1
+    stats = get_stats()["dbt_cli_show_cache"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+async def test_limit_is_part_of_the_key(show_tool):
+    show, create_subprocess_exec, _ = show_tool
+
+    await show(sql_query="select * from orders", limit=5, use_cache=True)
+    await show(sql_query="select * from orders", limit=10, use_cache=True)
+
+    assert create_subprocess_exec.call_count == 2
+
+
+async def test_bypass_cache(show_tool):
+    show, create_subprocess_exec, _ = show_tool
+
+    await show(sql_query="select * from orders", limit=5, use_cache=True)
+    await show(sql_query="select * from orders", limit=5, use_cache=False)
+    await show(sql_query="select * from orders", limit=5, use_cache=True)
+
+    assert create_subprocess_exec.call_count == 2
+
+
+async def test_project_changes_invalidate_results(show_tool, tmp_path):
+    show, create_subprocess_exec, _ = show_tool
+
+    await show(sql_query="select * from orders", limit=5, use_cache=True)
+    (tmp_path / "models" / "customers.sql").write_text("select 1 as id")
+    await show(sql_query="select * from orders", limit=5, use_cache=True)
+
+    assert create_subprocess_exec.call_count == 2
+
+
+async def test_errors_are_not_cached(show_tool):
+    show, create_subprocess_exec, outputs = show_tool
+    outputs[0] = "Database Error\n"
+
+    await show(sql_query="select * from orders", limit=5, use_cache=True)
+    await show(sql_query="select * from orders", limit=5, use_cache=True)
+
+    assert create_subprocess_exec.call_count == 2
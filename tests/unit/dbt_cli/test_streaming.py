@@ -0,0 +1,126 @@
+import json
+import stat
+from pathlib import Path
+
+from dbt_mcp.config.config import DbtCliConfig
+from dbt_mcp.dbt_cli.tools import register_dbt_cli_tools
+from dbt_mcp.tools.streaming import OutputEvent, OutputRingBuffer, output_listener
+
+LOG_LINES = [
+    {"info": {"name": "MainReportVersion", "level": "info", "msg": "Running dbt"}},
+    {"info": {"name": "LogModelResult", "level": "info", "msg": "1 of 1 OK"}},
+    {"info": {"name": "RunResultError", "level": "error", "msg": "Model failed"}},
+    {"info": {"name": "PrintEvent", "level": "info", "msg": "Done."}},
+]
+
+FAKE_DBT = """#!/bin/sh
+echo "$@" > "{args_file}"
+cat <<'LOGS'
+{logs}
+LOGS
+"""
+
+
+def _fake_dbt(tmp_path: Path) -> str:
+    dbt_path = tmp_path / "dbt"
+    dbt_path.write_text(
+        FAKE_DBT.format(
+            args_file=tmp_path / "args",
+            logs="\n".join(json.dumps(line) for line in LOG_LINES),
+        )
+    )
+    dbt_path.chmod(dbt_path.stat().st_mode | stat.S_IEXEC)
+    return str(dbt_path)
+
+
+def _register_tools(tmp_path: Path, **config) -> dict:
+    class MockFastMCP:
+        def __init__(self):
+            self.tools = {}
+
+        def tool(self, **kwargs):
+            def decorator(func):
+                self.tools[func.__name__] = func
+                return func
+
+            return decorator
+
+    fastmcp = MockFastMCP()
+    register_dbt_cli_tools(
+        fastmcp,  # type: ignore[arg-type]
+        DbtCliConfig(
+            project_dir=str(tmp_path),
+            dbt_path=_fake_dbt(tmp_path),
+            dbt_cli_timeout=10,
+            **config,
+        ),
+    )
+    return fastmcp.tools
+
+
+async def test_output_is_published_while_running(tmp_path):
+    tools = _register_tools(tmp_path)
+    events: list[OutputEvent] = []
+
+    async def listener(event: OutputEvent) -> None:
+        events.append(event)
+
+    token = output_listener.set(listener)
+    try:
+        result = await tools["build"](selector=None)
+    finally:
+        output_listener.reset(token)
+
+    assert "--log-format json" in (tmp_path / "args").read_text()
+    assert [event.message for event in events] == [
+        "Running dbt",
+        "1 of 1 OK",
+        "Model failed",
+        "Done.",
+    ]
+    assert events[1].data == LOG_LINES[1]
+    # The result only keeps what dbt prints with --quiet
+    assert result == "Model failed\nDone.\n"
+
+
+async def test_quiet_without_listener(tmp_path):
+    tools = _register_tools(tmp_path)
+
+    await tools["build"](selector=None)
+
+    assert "--quiet" in (tmp_path / "args").read_text()
+
+
+async def test_output_is_truncated(tmp_path):
+    tools = _register_tools(tmp_path, dbt_cli_output_max_bytes=150)
+
+    result = await tools["build"](selector=None)
+
+    assert result.startswith("... (2 earlier lines omitted)\n")
+    assert result.endswith(json.dumps(LOG_LINES[-1]) + "\n")
+
+
+def test_ring_buffer_keeps_latest_lines():
+    output = OutputRingBuffer(max_bytes=10)
+    for line in ["aaaa\n", "bbbb\n", "cccc\n"]:
+        output.append(line)
+
+    assert len(output) == 2
+    assert output.dropped_lines == 1
+    assert output.text() == "... (1 earlier lines omitted)\nbbbb\ncccc\n"
+
+
+def test_ring_buffer_counts_encoded_bytes():
+    output = OutputRingBuffer(max_bytes=12)
+    for line in ["ééé\n", "ééé\n"]:
+        output.append(line)
+
+    assert output.dropped_lines == 1
+    assert output.text() == "... (1 earlier lines omitted)\nééé\n"
+
+
+def test_ring_buffer_keeps_oversized_line():
+    output = OutputRingBuffer(max_bytes=2)
+    output.append("too long\n")
+
+    assert output.text() == "too long\n"
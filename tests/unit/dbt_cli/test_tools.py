@@ -1,18 +1,13 @@
-import subprocess
-
 import pytest
 from pytest import MonkeyPatch
 
 from dbt_mcp.dbt_cli.tools import register_dbt_cli_tools
 from tests.mocks.config import mock_dbt_cli_config
+from tests.mocks.process import MockProcess
 
 
 @pytest.fixture
 def mock_process():
-    class MockProcess:
-        def communicate(self, timeout=None):
-            return "command output", None
-
     return MockProcess()
 
 
@@ -96,7 +91,7 @@ def mock_fastmcp():
         ),
     ],
 )
-def test_show_command_limit_logic(
+async def test_show_command_limit_logic(
     monkeypatch: MonkeyPatch,
     mock_process,
     mock_fastmcp,
@@ -104,14 +99,14 @@ def test_show_command_limit_logic(
     limit_param,
     expected_args,
 ):
-    # Mock Popen
+    # Mock the subprocess creation
     mock_calls = []
 
-    def mock_popen(args, **kwargs):
-        mock_calls.append(args)
+    async def mock_create_subprocess_exec(*args, **kwargs):
+        mock_calls.append(list(args))
         return mock_process
 
-    monkeypatch.setattr("subprocess.Popen", mock_popen)
+    monkeypatch.setattr("asyncio.create_subprocess_exec", mock_create_subprocess_exec)
 
     # Register tools and get show tool
     fastmcp, tools = mock_fastmcp
@@ -119,7 +114,7 @@ def test_show_command_limit_logic(
     show_tool = tools["show"]
 
     # Call show tool with test parameters
-    show_tool(sql_query=sql_query, limit=limit_param)
+    await show_tool(sql_query=sql_query, limit=limit_param)
 
     # Verify the command was called with expected arguments
     assert mock_calls
@@ -127,17 +122,17 @@ def test_show_command_limit_logic(
     assert args_list == expected_args
 
 
-def test_run_command_adds_quiet_flag_to_verbose_commands(
+async def test_run_command_adds_quiet_flag_to_verbose_commands(
     monkeypatch: MonkeyPatch, mock_process, mock_fastmcp
 ):
-    # Mock Popen
+    # Mock the subprocess creation
     mock_calls = []
 
-    def mock_popen(args, **kwargs):
-        mock_calls.append(args)
+    async def mock_create_subprocess_exec(*args, **kwargs):
+        mock_calls.append(list(args))
         return mock_process
 
-    monkeypatch.setattr("subprocess.Popen", mock_popen)
+    monkeypatch.setattr("asyncio.create_subprocess_exec", mock_create_subprocess_exec)
 
     # Setup
     mock_fastmcp_obj, tools = mock_fastmcp
@@ -145,7 +140,7 @@ def test_run_command_adds_quiet_flag_to_verbose_commands(
     run_tool = tools["run"]
 
     # Execute
-    run_tool()
+    await run_tool()
 
     # Verify
     assert mock_calls
@@ -153,17 +148,17 @@ def test_run_command_adds_quiet_flag_to_verbose_commands(
     assert "--quiet" in args_list
 
 
-def test_run_command_correctly_formatted(
+async def test_run_command_correctly_formatted(
     monkeypatch: MonkeyPatch, mock_process, mock_fastmcp
 ):
-    # Mock Popen
+    # Mock the subprocess creation
     mock_calls = []
 
-    def mock_popen(args, **kwargs):
-        mock_calls.append(args)
+    async def mock_create_subprocess_exec(*args, **kwargs):
+        mock_calls.append(list(args))
         return mock_process
 
-    monkeypatch.setattr("subprocess.Popen", mock_popen)
+    monkeypatch.setattr("asyncio.create_subprocess_exec", mock_create_subprocess_exec)
 
     fastmcp, tools = mock_fastmcp
 
@@ -172,7 +167,7 @@ def test_run_command_correctly_formatted(
     run_tool = tools["run"]
 
     # Run the command with a selector
-    run_tool(selector="my_model")
+    await run_tool(selector="my_model")
 
     # Verify the command is correctly formatted
     assert mock_calls
@@ -186,17 +181,17 @@ def test_run_command_correctly_formatted(
     ]
 
 
-def test_show_command_correctly_formatted(
+async def test_show_command_correctly_formatted(
     monkeypatch: MonkeyPatch, mock_process, mock_fastmcp
 ):
-    # Mock Popen
+    # Mock the subprocess creation
     mock_calls = []
 
-    def mock_popen(args, **kwargs):
-        mock_calls.append(args)
+    async def mock_create_subprocess_exec(*args, **kwargs):
+        mock_calls.append(list(args))
         return mock_process
 
-    monkeypatch.setattr("subprocess.Popen", mock_popen)
+    monkeypatch.setattr("asyncio.create_subprocess_exec", mock_create_subprocess_exec)
 
     # Setup
     mock_fastmcp_obj, tools = mock_fastmcp
@@ -204,7 +199,7 @@ def test_show_command_correctly_formatted(
     show_tool = tools["show"]
 
     # Execute
-    show_tool(sql_query="SELECT * FROM my_model")
+    await show_tool(sql_query="SELECT * FROM my_model")
 
     # Verify
     assert mock_calls
@@ -216,16 +211,22 @@ def test_show_command_correctly_formatted(
     assert args_list[4] == "--favor-state"
 
 
-def test_list_command_timeout_handling(monkeypatch: MonkeyPatch, mock_fastmcp):
-    # Mock Popen
-    class MockProcessWithTimeout:
-        def communicate(self, timeout=None):
-            raise subprocess.TimeoutExpired(cmd=["dbt", "list"], timeout=10)
+async def test_list_command_timeout_handling(monkeypatch: MonkeyPatch, mock_fastmcp):
+    # Mock the subprocess creation
+    class MockStreamWithTimeout:
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            raise TimeoutError
+
+    process = MockProcess()
+    process.stdout = MockStreamWithTimeout()  # type: ignore[assignment]
 
-    def mock_popen(*args, **kwargs):
-        return MockProcessWithTimeout()
+    async def mock_create_subprocess_exec(*args, **kwargs):
+        return process
 
-    monkeypatch.setattr("subprocess.Popen", mock_popen)
+    monkeypatch.setattr("asyncio.create_subprocess_exec", mock_create_subprocess_exec)
 
     # Setup
     mock_fastmcp_obj, tools = mock_fastmcp
@@ -233,11 +234,12 @@ def test_list_command_timeout_handling(monkeypatch: MonkeyPatch, mock_fastmcp):
     list_tool = tools["ls"]
 
     # Test timeout case
-    result = list_tool(resource_type=["model", "snapshot"])
+    result = await list_tool(resource_type=["model", "snapshot"])
+    assert process.killed
     assert "Timeout: dbt command took too long to complete" in result
     assert "Try using a specific selector to narrow down the results" in result
 
     # Test with selector - should still timeout
-    result = list_tool(selector="my_model", resource_type=["model"])
+    result = await list_tool(selector="my_model", resource_type=["model"])
     assert "Timeout: dbt command took too long to complete" in result
     assert "Try using a specific selector to narrow down the results" in result
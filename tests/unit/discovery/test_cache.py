@@ -0,0 +1,146 @@
+import asyncio
+
+from dbt_mcp.discovery.cache import CachedMetadataAPIClient
+from dbt_mcp.discovery.client import GraphQLQueries
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeAPIClient:
+    def __init__(self):
+        self.queries: list[tuple[str, dict]] = []
+        self.last_updated_at = "2025-01-01T00:00:00Z"
+        self.delay = 0.0
+        self.errors: list | None = None
+        self.environment_check_fails = False
+
+    async def execute_query(self, query: str, variables: dict) -> dict:
+        if query == GraphQLQueries.GET_ENVIRONMENT_LAST_UPDATED:
+            if self.environment_check_fails:
+                raise ConnectionError("Connection refused")
+            return {
+                "data": {
+                    "environment": {"applied": {"lastUpdatedAt": self.last_updated_at}}
+                }
+            }
+        self.queries.append((query, variables))
+        await asyncio.sleep(self.delay)
+        if self.errors:
+            return {"errors": self.errors}
+        return {"data": {"call": len(self.queries)}}
+
+
+def _cached_client(
+    api_client: FakeAPIClient, clock: FakeClock
+) -> CachedMetadataAPIClient:
+    return CachedMetadataAPIClient(
+        api_client,
+        environment_id=1,
+        ttl_seconds=300,
+        max_entries=10,
+        check_interval=30,
+        clock=clock,
+    )
+
+
+async def test_identical_queries_are_cached():
+    api_client = FakeAPIClient()
+    cached_client = _cached_client(api_client, FakeClock())
+
+    first = await cached_client.execute_query("query", {"a": 1, "b": 2})
+    second = await cached_client.execute_query("query", {"b": 2, "a": 1})
+    other = await cached_client.execute_query("query", {"a": 2})
+
+    assert first == second == {"data": {"call": 1}}
+    assert other == {"data": {"call": 2}}
+    assert len(api_client.queries) == 2
+    assert cached_client.stats()["hits"] == 1
+
+
+async def test_results_expire():
+    api_client = FakeAPIClient()
+    clock = FakeClock()
+    cached_client = _cached_client(api_client, clock)
+
+    await cached_client.execute_query("query", {})
+    clock.now = 301
+    await cached_client.execute_query("query", {})
+
+    assert len(api_client.queries) == 2
+
+
+async def test_concurrent_identical_queries_are_sent_once():
+    api_client = FakeAPIClient()
+    api_client.delay = 0.05
+    cached_client = _cached_client(api_client, FakeClock())
+
+    results = await asyncio.gather(
+        *(cached_client.execute_query("query", {"a": 1}) for _ in range(5))
+    )
+
+    assert results == [{"data": {"call": 1}}] * 5
+    assert len(api_client.queries) == 1
+    assert cached_client.stats()["deduplicated"] == 4
+
+
+async def test_cancelled_caller_does_not_cancel_query_for_others():
+    api_client = FakeAPIClient()
+    api_client.delay = 0.05
+    cached_client = _cached_client(api_client, FakeClock())
+
+    first = asyncio.create_task(cached_client.execute_query("query", {}))
+    second = asyncio.create_task(cached_client.execute_query("query", {}))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == {"data": {"call": 1}}
+
+
+async def test_invalidated_when_environment_is_updated():
+    api_client = FakeAPIClient()
+    clock = FakeClock()
+    cached_client = _cached_client(api_client, clock)
+    await cached_client.execute_query("query", {})
+
+    # Not checked again before the interval
+    api_client.last_updated_at = "2025-01-02T00:00:00Z"
+    clock.now = 10
+    await cached_client.execute_query("query", {})
+    assert len(api_client.queries) == 1
+
+    clock.now = 31
+    await cached_client.execute_query("query", {})
+    assert len(api_client.queries) == 2
+    assert cached_client.stats()["invalidations"] == 1
+
+    clock.now = 62
+    await cached_client.execute_query("query", {})
+    assert len(api_client.queries) == 2
+
+
+async def test_errors_are_not_cached():
+    api_client = FakeAPIClient()
+    api_client.errors = [{"message": "Unauthorized"}]
+    cached_client = _cached_client(api_client, FakeClock())
+
+    await cached_client.execute_query("query", {})
+    await cached_client.execute_query("query", {})
+
+    assert len(api_client.queries) == 2
+
+
+async def test_failed_environment_check_keeps_cache():
+    api_client = FakeAPIClient()
+    clock = FakeClock()
+    cached_client = _cached_client(api_client, clock)
+    await cached_client.execute_query("query", {})
+
+    api_client.environment_check_fails = True
+    clock.now = 31
+    assert await cached_client.execute_query("query", {}) == {"data": {"call": 1}}
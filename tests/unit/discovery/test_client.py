@@ -0,0 +1,328 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from dbt_mcp.config.config import HttpClientConfig
+from dbt_mcp.discovery.client import (
+    AsyncMetadataAPIClient,
+    AsyncModelsFetcher,
+    GraphQLQueries,
+    model_details_query,
+)
+
+
+class StubGraphQLHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        StubGraphQLHandler.connections += 1
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        page = int(request["variables"]["after"] or 0)
+        body = json.dumps(
+            {
+                "data": {
+                    "environment": {
+                        "applied": {
+                            "models": {
+                                "pageInfo": {"endCursor": str(min(page + 1, 3))},
+                                "edges": [{"node": {"name": f"model_{page}"}}],
+                            }
+                        }
+                    }
+                }
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGraphQLHandler)
+    StubGraphQLHandler.connections = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/graphql"
+    server.shutdown()
+
+
+def _model_response(name: str) -> dict:
+    return {
+        "data": {
+            "environment": {
+                "applied": {
+                    "models": {
+                        "edges": [
+                            {"node": {"name": name, "parents": [], "children": []}}
+                        ]
+                    }
+                }
+            }
+        }
+    }
+
+
+def _async_api_client(pool_size: int) -> tuple[AsyncMetadataAPIClient, dict]:
+    in_flight = {"current": 0, "max": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        in_flight["current"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["current"])
+        await asyncio.sleep(0.1)
+        in_flight["current"] -= 1
+        variables = json.loads(request.content)["variables"]
+        return httpx.Response(
+            200, json=_model_response(variables["modelsFilter"]["identifier"])
+        )
+
+    api_client = AsyncMetadataAPIClient(
+        url="http://test/graphql",
+        headers={},
+        http_client_config=HttpClientConfig(pool_size=pool_size),
+    )
+    api_client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return api_client, in_flight
+
+
+async def test_fetch_for_models_runs_concurrently():
+    api_client, in_flight = _async_api_client(pool_size=10)
+    models_fetcher = AsyncModelsFetcher(api_client=api_client, environment_id=1)
+    models = [(f"model_{i}", None) for i in range(5)]
+
+    start = time.perf_counter()
+    details = await models_fetcher.fetch_for_models(
+        models_fetcher.fetch_model_details, models
+    )
+
+    assert time.perf_counter() - start < 0.4
+    assert [model["name"] for model in details] == [name for name, _ in models]
+    assert in_flight["max"] == 5
+
+
+async def test_concurrency_is_bounded_by_pool_size():
+    api_client, in_flight = _async_api_client(pool_size=2)
+    models_fetcher = AsyncModelsFetcher(api_client=api_client, environment_id=1)
+
+    parents = await models_fetcher.fetch_for_models(
+        models_fetcher.fetch_model_parents, [(f"model_{i}", None) for i in range(5)]
+    )
+
+    assert parents == [[]] * 5
+    assert in_flight["max"] == 2
+
+
+async def test_pages_reuse_one_connection(stub_server):
+    api_client = AsyncMetadataAPIClient(url=stub_server, headers={})
+    models_fetcher = AsyncModelsFetcher(api_client=api_client, environment_id=1)
+
+    models = await models_fetcher.fetch_models()
+
+    assert [model["name"] for model in models] == [
+        "model_0",
+        "model_1",
+        "model_2",
+        "model_3",
+    ]
+    assert StubGraphQLHandler.connections == 1
+    await api_client.close()
+
+
+def _batch_api_client() -> tuple[AsyncMetadataAPIClient, list[dict]]:
+    requests: list[dict] = []
+
+    def models(names: list[str]) -> dict:
+        return {
+            "edges": [
+                {
+                    "node": {
+                        "name": name,
+                        "uniqueId": f"model.jaffle.{name}",
+                        "parents": [{"name": f"{name}_parent"}],
+                        "children": [{"name": f"{name}_child"}],
+                    }
+                }
+                for name in names
+                if not name.startswith("missing")
+            ]
+        }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        requests.append(body)
+        variables = body["variables"]
+        if "modelsFilter" in variables:
+            applied = {
+                "models": models(
+                    [
+                        unique_id.split(".")[-1]
+                        for unique_id in variables["modelsFilter"]["uniqueIds"]
+                    ]
+                )
+            }
+        else:
+            applied = {
+                f"model{i}": models([variables[f"identifier{i}"]])
+                for i in range(len(variables) - 1)
+            }
+        return httpx.Response(200, json={"data": {"environment": {"applied": applied}}})
+
+    api_client = AsyncMetadataAPIClient(url="http://test/graphql", headers={})
+    api_client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return api_client, requests
+
+
+async def test_fetch_models_details_by_unique_ids():
+    api_client, requests = _batch_api_client()
+    models_fetcher = AsyncModelsFetcher(api_client=api_client, environment_id=1)
+
+    details = await models_fetcher.fetch_models_details(
+        unique_ids=[
+            "model.jaffle.orders",
+            "model.jaffle.missing",
+            "model.jaffle.orders",
+        ]
+    )
+
+    assert details == {
+        "model.jaffle.orders": {
+            "name": "orders",
+            "uniqueId": "model.jaffle.orders",
+            "parents": [{"name": "orders_parent"}],
+            "children": [{"name": "orders_child"}],
+        },
+        "model.jaffle.missing": {},
+    }
+    assert len(requests) == 1
+    assert requests[0]["variables"]["modelsFilter"] == {
+        "uniqueIds": ["model.jaffle.orders", "model.jaffle.missing"]
+    }
+
+
+async def test_fetch_models_parents_by_names():
+    api_client, requests = _batch_api_client()
+    models_fetcher = AsyncModelsFetcher(api_client=api_client, environment_id=1)
+    model_names = [f"model_{i}" for i in range(30)] + ["missing_model"]
+
+    parents = await models_fetcher.fetch_models_parents(model_names=model_names)
+
+    assert list(parents) == model_names
+    assert parents["model_7"] == [{"name": "model_7_parent"}]
+    assert parents["missing_model"] == []
+    # Names are fetched with aliased root fields, 25 per query
+    assert len(requests) == 2
+    assert (
+        "model24: models(filter: {identifier: $identifier24}" in (requests[0]["query"])
+    )
+
+
+async def test_fetch_models_children_mixed():
+    api_client, requests = _batch_api_client()
+    models_fetcher = AsyncModelsFetcher(api_client=api_client, environment_id=1)
+
+    children = await models_fetcher.fetch_models_children(
+        model_names=["customers"], unique_ids=["model.jaffle.orders"]
+    )
+
+    assert children == {
+        "customers": [{"name": "customers_child"}],
+        "model.jaffle.orders": [{"name": "orders_child"}],
+    }
+    assert len(requests) == 2
+
+
+def _paged_api_client(num_models: int) -> tuple[AsyncMetadataAPIClient, list[dict]]:
+    requests: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        variables = json.loads(request.content)["variables"]
+        requests.append(variables)
+        start = int(variables["after"] or 0)
+        end = min(start + variables["first"], num_models)
+        models = {
+            "pageInfo": {"endCursor": str(end), "hasNextPage": end < num_models},
+            "edges": [{"node": {"name": f"model_{i}"}} for i in range(start, end)],
+        }
+        return httpx.Response(
+            200, json={"data": {"environment": {"applied": {"models": models}}}}
+        )
+
+    api_client = AsyncMetadataAPIClient(url="http://test/graphql", headers={})
+    api_client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return api_client, requests
+
+
+async def test_iter_models_pages_goes_past_max_num_models():
+    api_client, requests = _paged_api_client(num_models=1050)
+    models_fetcher = AsyncModelsFetcher(api_client=api_client, environment_id=1)
+
+    page_sizes = [
+        len(page["models"]) async for page in models_fetcher.iter_models_pages()
+    ]
+    models = await models_fetcher.fetch_models()
+
+    assert page_sizes == [100] * 10 + [50]
+    # Stops on the page with hasNextPage false, without an extra request
+    assert len(requests) == 11 + 10
+    assert len(models) == 1000
+
+
+async def test_fetch_models_page_returns_next_cursor():
+    api_client, requests = _paged_api_client(num_models=30)
+    models_fetcher = AsyncModelsFetcher(api_client=api_client, environment_id=1)
+
+    first = await models_fetcher.fetch_models_page(page_size=20)
+    last = await models_fetcher.fetch_models_page(
+        cursor=first["next_cursor"], page_size=20
+    )
+
+    assert first["next_cursor"] == "20"
+    assert [model["name"] for model in last["models"]] == [
+        f"model_{i}" for i in range(20, 30)
+    ]
+    assert last["next_cursor"] is None
+    assert requests[1]["after"] == "20"
+
+
+def test_model_details_query_selects_only_requested_fields():
+    columns_query = model_details_query(frozenset({"columns"}))
+    metadata_query = model_details_query(frozenset({"metadata", "compiled_code"}))
+
+    assert "catalog" in columns_query
+    assert "compiledCode" not in columns_query
+    assert "database" not in columns_query
+    assert "catalog" not in metadata_query
+    assert "compiledCode" in metadata_query
+    assert "schema" in metadata_query
+    # Generated once per field set
+    assert model_details_query(frozenset({"columns"})) is columns_query
+    assert model_details_query(frozenset()) is GraphQLQueries.GET_MODEL_DETAILS
+
+
+async def test_fetch_models_details_with_fields():
+    api_client, requests = _batch_api_client()
+    models_fetcher = AsyncModelsFetcher(api_client=api_client, environment_id=1)
+
+    await models_fetcher.fetch_models_details(
+        model_names=["orders"], unique_ids=["model.jaffle.orders"], fields=["columns"]
+    )
+
+    assert len(requests) == 2
+    for request in requests:
+        assert "catalog" in request["query"]
+        assert "compiledCode" not in request["query"]
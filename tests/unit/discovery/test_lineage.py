@@ -0,0 +1,242 @@
+import pytest
+
+from dbt_mcp.discovery.client import AsyncModelsFetcher, GraphQLQueries
+from dbt_mcp.discovery.lineage import LineageFetcher, LineageGraph, lineage_from_models
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _nested(unique_id: str, resource_type: str = "model") -> dict:
+    return {
+        "uniqueId": unique_id,
+        "name": unique_id.split(".")[-1],
+        "resourceType": resource_type,
+    }
+
+
+# raw.orders -> stg_orders -> orders -> revenue -> dashboard
+#                                    \-> customers
+JAFFLE_MODELS = [
+    {
+        "uniqueId": "model.jaffle.stg_orders",
+        "name": "stg_orders",
+        "parents": [
+            _nested("source.jaffle.raw.orders", "source"),
+            _nested("macro.jaffle.cents_to_dollars", "macro"),
+        ],
+        "children": [_nested("model.jaffle.orders")],
+    },
+    {
+        "uniqueId": "model.jaffle.orders",
+        "name": "orders",
+        "parents": [_nested("model.jaffle.stg_orders")],
+        "children": [
+            _nested("model.jaffle.revenue"),
+            _nested("model.jaffle.customers"),
+            _nested("test.jaffle.not_null_orders_id", "test"),
+        ],
+    },
+    {
+        "uniqueId": "model.jaffle.revenue",
+        "name": "revenue",
+        "parents": [_nested("model.jaffle.orders")],
+        "children": [_nested("exposure.jaffle.dashboard", "exposure")],
+    },
+    {
+        "uniqueId": "model.jaffle.customers",
+        "name": "customers",
+        "parents": [_nested("model.jaffle.orders")],
+        "children": [],
+    },
+]
+
+
+def _graph(models: list[dict]) -> LineageGraph:
+    graph = LineageGraph()
+    graph.update(*lineage_from_models(models))
+    return graph
+
+
+def _ids(nodes) -> list[str]:
+    return [node.unique_id for node in nodes]
+
+
+def test_lineage_from_models_ignores_macros():
+    nodes, edges = lineage_from_models(JAFFLE_MODELS)
+
+    assert "macro.jaffle.cents_to_dollars" not in {node.unique_id for node in nodes}
+    assert ("source.jaffle.raw.orders", "model.jaffle.stg_orders") in edges
+
+
+def test_traverse():
+    graph = _graph(JAFFLE_MODELS)
+
+    downstream = graph.traverse("model.jaffle.stg_orders", "downstream")
+    assert [depth for _, depth in downstream] == [1, 2, 2, 2, 3]
+    assert set(_ids(node for node, _ in downstream)) == {
+        "model.jaffle.orders",
+        "model.jaffle.revenue",
+        "model.jaffle.customers",
+        "test.jaffle.not_null_orders_id",
+        "exposure.jaffle.dashboard",
+    }
+
+    upstream = graph.traverse("model.jaffle.revenue", "upstream", max_depth=2)
+    assert [(node.unique_id, depth) for node, depth in upstream] == [
+        ("model.jaffle.orders", 1),
+        ("model.jaffle.stg_orders", 2),
+    ]
+
+
+def test_shortest_path():
+    graph = _graph(JAFFLE_MODELS)
+
+    downstream = graph.shortest_path(
+        "source.jaffle.raw.orders", "exposure.jaffle.dashboard"
+    )
+    upstream = graph.shortest_path("model.jaffle.revenue", "model.jaffle.stg_orders")
+
+    assert downstream is not None
+    assert _ids(downstream) == [
+        "source.jaffle.raw.orders",
+        "model.jaffle.stg_orders",
+        "model.jaffle.orders",
+        "model.jaffle.revenue",
+        "exposure.jaffle.dashboard",
+    ]
+    assert upstream is not None
+    assert _ids(upstream) == [
+        "model.jaffle.revenue",
+        "model.jaffle.orders",
+        "model.jaffle.stg_orders",
+    ]
+    assert graph.shortest_path("model.jaffle.revenue", "model.jaffle.customers") is None
+
+
+def test_impact():
+    graph = _graph(JAFFLE_MODELS)
+
+    impact = graph.impact(graph.find("orders"))
+
+    assert impact["total"] == 4
+    assert impact["maxDepth"] == 2
+    assert impact["byDepth"] == {1: 3, 2: 1}
+    assert impact["byResourceType"] == {"model": 2, "test": 1, "exposure": 1}
+    assert impact["exposures"] == [
+        {
+            "uniqueId": "exposure.jaffle.dashboard",
+            "name": "dashboard",
+            "resourceType": "exposure",
+        }
+    ]
+
+
+def test_find_doesnt_merge_models_with_the_same_name():
+    graph = _graph(
+        [
+            *JAFFLE_MODELS,
+            {"uniqueId": "model.jaffle.customers.v2", "name": "customers"},
+            {"uniqueId": "model.other.orders", "name": "orders"},
+        ]
+    )
+
+    assert graph.find("revenue") == "model.jaffle.revenue"
+    assert graph.find("orders", "model.other.orders") == "model.other.orders"
+    with pytest.raises(ValueError, match="model.jaffle.orders, model.other.orders"):
+        graph.find("orders")
+    with pytest.raises(ValueError, match="model.jaffle.customers.v2"):
+        graph.find("customers")
+
+
+def test_update_applies_only_changed_edges():
+    graph = _graph(JAFFLE_MODELS)
+    assert graph.num_edges == 6
+
+    # customers now reads from stg_orders, and the other models were removed
+    models = [
+        JAFFLE_MODELS[0] | {"children": [_nested("model.jaffle.customers")]},
+        JAFFLE_MODELS[3] | {"parents": [_nested("model.jaffle.stg_orders")]},
+    ]
+    added, removed = graph.update(*lineage_from_models(models))
+
+    assert (added, removed) == (1, 5)
+    assert graph.num_edges == 2
+    assert len(graph) == 3
+    assert _ids(
+        node for node, _ in graph.traverse("source.jaffle.raw.orders", "downstream")
+    ) == ["model.jaffle.stg_orders", "model.jaffle.customers"]
+
+
+class FakeAPIClient:
+    def __init__(self, models: list[dict]):
+        self.models = models
+        self.last_updated_at = "2025-01-01T00:00:00Z"
+        self.lineage_queries = 0
+
+    async def execute_query(self, query: str, variables: dict) -> dict:
+        if query == GraphQLQueries.GET_ENVIRONMENT_LAST_UPDATED:
+            return {
+                "data": {
+                    "environment": {"applied": {"lastUpdatedAt": self.last_updated_at}}
+                }
+            }
+        assert query == GraphQLQueries.GET_MODELS_LINEAGE
+        self.lineage_queries += 1
+        page = int(variables["after"] or 0)
+        edges = [{"node": model} for model in self.models[page * 2 : page * 2 + 2]]
+        return {
+            "data": {
+                "environment": {
+                    "applied": {
+                        "models": {
+                            "pageInfo": {
+                                "endCursor": str(page + 1) if edges else str(page)
+                            },
+                            "edges": edges,
+                        }
+                    }
+                }
+            }
+        }
+
+
+async def test_fetcher_refreshes_when_environment_is_updated():
+    api_client = FakeAPIClient(JAFFLE_MODELS)
+    clock = FakeClock()
+    fetcher = LineageFetcher(
+        AsyncModelsFetcher(api_client=api_client, environment_id=1),
+        check_interval=30,
+        clock=clock,
+    )
+
+    graph = await fetcher.get_graph()
+    assert len(graph) == 7
+    assert api_client.lineage_queries == 3
+
+    # Not updated
+    clock.now = 60
+    await fetcher.get_graph()
+    assert api_client.lineage_queries == 3
+
+    api_client.last_updated_at = "2025-01-02T00:00:00Z"
+    api_client.models = JAFFLE_MODELS[:2]
+    clock.now = 70
+    await fetcher.get_graph()
+    assert api_client.lineage_queries == 3
+
+    clock.now = 100
+    graph = await fetcher.get_graph()
+    assert api_client.lineage_queries == 5
+    assert "model.jaffle.revenue" in _ids(
+        node for node, _ in graph.traverse("model.jaffle.orders", "downstream")
+    )
+    assert "exposure.jaffle.dashboard" not in _ids(
+        node for node, _ in graph.traverse("model.jaffle.orders", "downstream")
+    )
+    assert fetcher.stats()["refreshes"] == 2
@@ -0,0 +1,132 @@
+from collections.abc import Sequence
+
+from dbt_mcp.discovery.client import AsyncModelsFetcher, GraphQLQueries
+from dbt_mcp.discovery.search import (
+    ModelSearchIndex,
+    ModelSearchIndexFetcher,
+    tokenize,
+)
+
+
+def _model(name: str, description: str = "", columns: Sequence[str] = ()) -> dict:
+    return {
+        "uniqueId": f"model.jaffle.{name}",
+        "name": name,
+        "description": description,
+        "catalog": {"columns": [{"name": column} for column in columns]},
+    }
+
+
+MODELS = [
+    _model("customers", "One row per customer", ["customer_id", "first_name"]),
+    _model("orders", "Orders placed by customers", ["order_id", "customer_id"]),
+    _model("fct_revenue", "Daily revenue", ["order_date", "revenue"]),
+    _model("stg_payments", "Payments from the app", ["payment_id", "amount"]),
+]
+
+
+def _names(results: list[dict]) -> list[str]:
+    return [result["name"] for result in results]
+
+
+def test_tokenize():
+    assert tokenize("fct_Orders, by customer-ID") == [
+        "fct",
+        "orders",
+        "by",
+        "customer",
+        "id",
+    ]
+
+
+def test_search_ranks_name_over_columns_over_description():
+    index = ModelSearchIndex(MODELS)
+
+    assert _names(index.search("customers")) == ["customers", "orders"]
+    assert _names(index.search("revenue")) == ["fct_revenue"]
+    assert _names(index.search("payment amount")) == ["stg_payments"]
+
+
+def test_search_exact_name_first():
+    index = ModelSearchIndex([*MODELS, _model("orders_daily", "Orders by day")])
+
+    assert _names(index.search("orders"))[0] == "orders"
+    assert _names(index.search("orders_daily"))[0] == "orders_daily"
+
+
+def test_search_tolerates_typos_and_prefixes():
+    index = ModelSearchIndex(MODELS)
+
+    assert _names(index.search("custmers"))[0] == "customers"
+    assert _names(index.search("pay"))[0] == "stg_payments"
+    assert index.search("zebra") == []
+
+
+def test_search_top_k():
+    index = ModelSearchIndex(MODELS)
+
+    results = index.search("customer order revenue payment", top_k=2)
+
+    assert len(results) == 2
+    assert results[0]["score"] >= results[1]["score"]
+    assert set(results[0]) == {"uniqueId", "name", "description", "score"}
+
+
+class FakeAPIClient:
+    def __init__(self, models: list[dict]):
+        self.models = models
+        self.last_updated_at = "2025-01-01T00:00:00Z"
+        self.pages = 0
+
+    async def execute_query(self, query: str, variables: dict) -> dict:
+        if query == GraphQLQueries.GET_ENVIRONMENT_LAST_UPDATED:
+            return {
+                "data": {
+                    "environment": {"applied": {"lastUpdatedAt": self.last_updated_at}}
+                }
+            }
+        assert query == GraphQLQueries.GET_MODELS_SEARCH_FIELDS
+        self.pages += 1
+        start = int(variables["after"] or 0)
+        end = min(start + 2, len(self.models))
+        return {
+            "data": {
+                "environment": {
+                    "applied": {
+                        "models": {
+                            "pageInfo": {
+                                "endCursor": str(end),
+                                "hasNextPage": end < len(self.models),
+                            },
+                            "edges": [
+                                {"node": model} for model in self.models[start:end]
+                            ],
+                        }
+                    }
+                }
+            }
+        }
+
+
+async def test_fetcher_rebuilds_index_when_environment_is_updated():
+    api_client = FakeAPIClient(MODELS)
+    now = 0.0
+    fetcher = ModelSearchIndexFetcher(
+        AsyncModelsFetcher(api_client=api_client, environment_id=1),
+        check_interval=30,
+        clock=lambda: now,
+    )
+
+    index = await fetcher.get_index()
+    assert len(index) == 4
+    assert api_client.pages == 2
+
+    api_client.models = [*MODELS, _model("dim_products")]
+    api_client.last_updated_at = "2025-01-02T00:00:00Z"
+    assert await fetcher.get_index() is index
+
+    now = 30
+    index = await fetcher.get_index()
+    assert _names(index.search("products")) == ["dim_products"]
+    assert fetcher.stats()["models"] == 5
+    assert fetcher.stats()["refreshes"] == 2
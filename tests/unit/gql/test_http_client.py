@@ -0,0 +1,88 @@
+import httpx
+import pytest
+
+from dbt_mcp.config.config import HttpClientConfig
+from dbt_mcp.gql.http_client import async_post_with_retries, retry_delay
+
+CONFIG = HttpClientConfig(max_retries=2, retry_backoff=0)
+
+
+def _client(
+    responses: list[httpx.Response | Exception],
+) -> tuple[httpx.AsyncClient, list]:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), requests
+
+
+async def _post(client: httpx.AsyncClient) -> httpx.Response:
+    return await async_post_with_retries(
+        client, CONFIG, url="http://test/graphql", json={"query": "{}"}, headers={}
+    )
+
+
+@pytest.mark.parametrize("status_code", [429, 500, 502, 503, 504])
+async def test_retries_transient_errors(status_code):
+    client, requests = _client(
+        [httpx.Response(status_code), httpx.Response(200, json={"data": {}})]
+    )
+
+    assert (await _post(client)).json() == {"data": {}}
+    assert len(requests) == 2
+
+
+async def test_retries_transport_errors():
+    client, requests = _client(
+        [httpx.ConnectError("refused"), httpx.Response(200, json={"data": {}})]
+    )
+
+    assert (await _post(client)).status_code == 200
+    assert len(requests) == 2
+
+
+async def test_gives_up_after_max_retries():
+    client, requests = _client([httpx.Response(503) for _ in range(3)])
+
+    assert (await _post(client)).status_code == 503
+    assert len(requests) == 3
+
+
+async def test_raises_transport_error_after_max_retries():
+    client, _ = _client([httpx.ConnectError("refused") for _ in range(3)])
+
+    with pytest.raises(httpx.ConnectError):
+        await _post(client)
+
+
+async def test_does_not_retry_client_errors():
+    client, requests = _client([httpx.Response(400, json={"errors": []})])
+
+    assert (await _post(client)).status_code == 400
+    assert len(requests) == 1
+
+
+def test_retry_delay():
+    config = HttpClientConfig(retry_backoff=0.5)
+
+    assert retry_delay(config, 0, None) == 0.5
+    assert retry_delay(config, 2, None) == 2
+    assert (
+        retry_delay(config, 0, httpx.Response(429, headers={"Retry-After": "3"})) == 3
+    )
+
+
+def test_retry_delay_is_clamped():
+    config = HttpClientConfig(retry_backoff=0.5, retry_max_backoff=4)
+
+    assert retry_delay(config, 5, None) == 4
+    assert (
+        retry_delay(config, 0, httpx.Response(429, headers={"Retry-After": "3600"}))
+        == 4
+    )
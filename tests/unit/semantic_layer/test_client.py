@@ -0,0 +1,272 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from typing import Any
+
+import pyarrow as pa
+from dbtsl.api.shared.query_params import GroupByParam, GroupByType
+
+from dbt_mcp.config.config import SemanticLayerConfig
+from dbt_mcp.semantic_layer.client import SemanticLayerFetcher
+from dbt_mcp.semantic_layer.gql.gql import GRAPHQL_QUERIES
+
+METRICS = [
+    {"name": "revenue", "type": "SIMPLE"},
+    {"name": "order_count", "type": "SIMPLE"},
+]
+DIMENSIONS = [
+    {
+        "name": "metric_time",
+        "type": "TIME",
+        "queryableGranularities": ["DAY"],
+        "queryableTimeGranularities": [],
+    },
+    {
+        "name": "customer__region",
+        "type": "CATEGORICAL",
+        "queryableGranularities": [],
+        "queryableTimeGranularities": [],
+    },
+]
+ENTITIES = [{"name": "customer", "type": "PRIMARY"}]
+
+
+class FakeSemanticLayer:
+    def __init__(self):
+        self.requests: list[str] = []
+
+    async def submit_request(self, payload: dict) -> dict:
+        query = payload["query"]
+        self.requests.append(query)
+        if query == GRAPHQL_QUERIES["metrics"]:
+            return {"data": {"metrics": METRICS}}
+        if query == GRAPHQL_QUERIES["dimensions"]:
+            return {"data": {"dimensions": DIMENSIONS}}
+        if query == GRAPHQL_QUERIES["entities"]:
+            return {"data": {"entities": ENTITIES}}
+        assert query == GRAPHQL_QUERIES["dimensions_and_entities"]
+        return {"data": {"dimensions": DIMENSIONS, "entities": ENTITIES}}
+
+
+class FakeSemanticLayerClient:
+    """Like the clients of the SDK, can't open more than one session."""
+
+    def __init__(
+        self, queries_started: list[str], release: asyncio.Event, rows: int = 1
+    ):
+        self.queries_started = queries_started
+        self.release = release
+        self.rows = rows
+        self.has_session = False
+        self.read_cache: bool | None = None
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[None]:
+        assert not self.has_session
+        self.has_session = True
+        yield
+        self.has_session = False
+
+    async def query(self, **query_params: Any) -> pa.Table:
+        assert self.has_session
+        self.queries_started.append(",".join(query_params["metrics"]))
+        self.read_cache = query_params["read_cache"]
+        await self.release.wait()
+        return pa.table(
+            {metric: [1.5] * self.rows for metric in query_params["metrics"]}
+        )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _fetcher(
+    clock: FakeClock | None = None,
+    sl_client_factory: Callable[[], FakeSemanticLayerClient] | None = None,
+    **config_overrides: Any,
+) -> tuple[SemanticLayerFetcher, FakeSemanticLayer]:
+    semantic_layer = FakeSemanticLayer()
+    config = SemanticLayerConfig(
+        url="https://semantic-layer.example.com/api/graphql",
+        host="semantic-layer.example.com",
+        prod_environment_id=1,
+        service_token="token",
+        headers={},
+        cache_ttl=60,
+        **config_overrides,
+    )
+    fetcher = SemanticLayerFetcher(
+        sl_client_factory=sl_client_factory,  # type: ignore
+        config=config,
+        gql_client=semantic_layer,  # type: ignore
+        clock=clock or FakeClock(),
+    )
+    return fetcher, semantic_layer
+
+
+def _group_by(name: str) -> GroupByParam:
+    return GroupByParam(name=name, type=GroupByType.DIMENSION, grain=None)
+
+
+async def test_validate_query_metrics_params_suggests_closest_names():
+    fetcher, _ = _fetcher()
+
+    assert (
+        await fetcher.validate_query_metrics_params(metrics=["revenu"], group_by=None)
+        == "Errors: Metric revenu not found. Did you mean: revenue?"
+    )
+    assert (
+        await fetcher.validate_query_metrics_params(
+            metrics=["revenue"],
+            group_by=[_group_by("metric_time"), _group_by("customer__regoin")],
+        )
+        == "Errors: Group by customer__regoin not found. "
+        + "Did you mean: customer__region, customer?"
+    )
+    assert (
+        await fetcher.validate_query_metrics_params(
+            metrics=["revenue", "order_count"], group_by=[_group_by("customer")]
+        )
+        is None
+    )
+
+
+async def test_validate_query_metrics_params_reuses_matchers():
+    fetcher, semantic_layer = _fetcher()
+
+    for _ in range(3):
+        await fetcher.validate_query_metrics_params(
+            metrics=["revenue", "order_count"], group_by=[_group_by("metric_time")]
+        )
+        await fetcher.validate_query_metrics_params(
+            metrics=["order_count", "revenue"], group_by=[_group_by("customer")]
+        )
+
+    assert semantic_layer.requests == [
+        GRAPHQL_QUERIES["metrics"],
+        GRAPHQL_QUERIES["dimensions_and_entities"],
+    ]
+    assert await fetcher.metrics_matcher() is await fetcher.metrics_matcher()
+    assert await fetcher.group_by_matcher(["revenue", "order_count"]) is (
+        await fetcher.group_by_matcher(["order_count", "revenue"])
+    )
+
+
+async def test_metadata_expires_and_can_be_invalidated():
+    clock = FakeClock()
+    fetcher, semantic_layer = _fetcher(clock)
+
+    await fetcher.list_metrics()
+    await fetcher.get_dimensions(["revenue"])
+    clock.now = 59
+    await fetcher.list_metrics()
+    await fetcher.get_dimensions(["revenue"])
+    assert len(semantic_layer.requests) == 2
+
+    clock.now = 60
+    await fetcher.list_metrics()
+    assert len(semantic_layer.requests) == 3
+
+    fetcher.invalidate()
+    await fetcher.list_metrics()
+    await fetcher.get_dimensions(["revenue"])
+    assert len(semantic_layer.requests) == 5
+    assert fetcher.stats()["metadata"]["hits"] == 2
+    assert fetcher.stats()["metadata"]["expirations"] == 1
+
+
+async def test_dimensions_and_entities_are_fetched_together():
+    fetcher, semantic_layer = _fetcher()
+
+    dimensions, entities = await fetcher.get_dimensions_and_entities(["revenue"])
+
+    assert [d.name for d in dimensions] == ["metric_time", "customer__region"]
+    assert [e.name for e in entities] == ["customer"]
+    assert await fetcher.get_dimensions(["revenue"]) == dimensions
+    assert await fetcher.get_entities(["revenue"]) == entities
+    assert len(semantic_layer.requests) == 1
+
+
+async def test_queries_run_concurrently():
+    queries_started: list[str] = []
+    release = asyncio.Event()
+    fetcher, _ = _fetcher(
+        sl_client_factory=lambda: FakeSemanticLayerClient(queries_started, release)
+    )
+
+    queries = [
+        asyncio.create_task(fetcher.query_metrics(metrics=[metric]))
+        for metric in ("revenue", "order_count")
+    ]
+    while len(queries_started) < 2:
+        await asyncio.sleep(0)
+    release.set()
+
+    results = await asyncio.gather(*queries)
+    assert [json.loads(result.result)["result"] for result in results] == [
+        [{"revenue": 1.5}],
+        [{"order_count": 1.5}],
+    ]
+
+
+async def test_query_results_are_cached():
+    queries_started: list[str] = []
+    release = asyncio.Event()
+    release.set()
+    clients: list[FakeSemanticLayerClient] = []
+
+    def sl_client_factory() -> FakeSemanticLayerClient:
+        clients.append(FakeSemanticLayerClient(queries_started, release))
+        return clients[-1]
+
+    fetcher, _ = _fetcher(sl_client_factory=sl_client_factory, result_cache_ttl=60)
+
+    first = await fetcher.query_metrics(
+        metrics=["revenue", "order_count"], result_format="csv"
+    )
+    second = await fetcher.query_metrics(
+        metrics=["order_count", "revenue"], result_format="csv"
+    )
+    assert json.loads(first.result)["result"] == '"revenue","order_count"\n1.5,1.5\n'
+    assert json.loads(second.result)["result"] == '"order_count","revenue"\n1.5,1.5\n'
+    assert queries_started == ["revenue,order_count"]
+    assert clients[0].read_cache is True
+
+    await fetcher.query_metrics(metrics=["revenue", "order_count"], read_cache=False)
+    await fetcher.query_metrics(metrics=["revenue", "order_count"], use_cache=False)
+    assert len(queries_started) == 3
+    assert clients[0].read_cache is True
+    assert fetcher.stats()["results"]["hits"] == 1
+
+
+async def test_large_query_results_are_paged():
+    release = asyncio.Event()
+    release.set()
+    queries_started: list[str] = []
+    fetcher, _ = _fetcher(
+        sl_client_factory=lambda: FakeSemanticLayerClient(
+            queries_started, release, rows=3
+        ),
+        result_max_rows=2,
+    )
+
+    first = await fetcher.query_metrics(metrics=["revenue"])
+    assert first.result is not None
+    first_page = json.loads(first.result)
+    assert first_page["result"] == [{"revenue": 1.5}, {"revenue": 1.5}]
+    assert first_page["total_rows"] == 3
+
+    second = await fetcher.get_query_metrics_page(cursor=first_page["next_cursor"])
+    assert second.result is not None
+    second_page = json.loads(second.result)
+    assert second_page["result"] == [{"revenue": 1.5}]
+    assert second_page["next_cursor"] is None
+    assert queries_started == ["revenue"]
+
+    assert (await fetcher.get_query_metrics_page(cursor="unknown:2")).error
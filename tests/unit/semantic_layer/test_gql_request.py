@@ -0,0 +1,76 @@
+import json
+
+import httpx
+import pytest
+
+from dbt_mcp.config.config import HttpClientConfig, SemanticLayerConfig
+from dbt_mcp.semantic_layer.gql.gql import GRAPHQL_QUERIES
+from dbt_mcp.semantic_layer.gql.gql_request import (
+    SemanticLayerGraphQLClient,
+    operation_name,
+)
+
+CONFIG = SemanticLayerConfig(
+    url="https://semantic-layer.example.com/api/graphql",
+    host="semantic-layer.example.com",
+    prod_environment_id=1,
+    service_token="token",
+    headers={"Authorization": "Bearer token"},
+    http_client=HttpClientConfig(max_retries=1, retry_backoff=0),
+)
+
+
+def _client(
+    responses: list[httpx.Response],
+) -> tuple[SemanticLayerGraphQLClient, list[httpx.Request]]:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return responses.pop(0)
+
+    gql_client = SemanticLayerGraphQLClient(CONFIG)
+    gql_client.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return gql_client, requests
+
+
+def test_operation_name():
+    assert operation_name(GRAPHQL_QUERIES["metrics"]) == "GetMetrics"
+    assert operation_name("{ metrics { name } }") == "anonymous"
+
+
+async def test_submit_request_adds_environment_id_and_retries():
+    gql_client, requests = _client(
+        [httpx.Response(503), httpx.Response(200, json={"data": {"metrics": []}})]
+    )
+    payload = {
+        "query": GRAPHQL_QUERIES["entities"],
+        "variables": {"metrics": [{"name": "revenue"}]},
+    }
+
+    assert await gql_client.submit_request(payload) == {"data": {"metrics": []}}
+    assert len(requests) == 2
+    assert json.loads(requests[-1].content)["variables"] == {
+        "metrics": [{"name": "revenue"}],
+        "environmentId": 1,
+    }
+    assert requests[-1].headers["Authorization"] == "Bearer token"
+    assert "environmentId" not in payload["variables"]
+
+
+async def test_stats_record_latency_and_errors_per_operation():
+    gql_client, _ = _client(
+        [
+            httpx.Response(200, json={"data": {"metrics": []}}),
+            httpx.Response(200, json={"errors": [{"message": "Unknown metric"}]}),
+        ]
+    )
+
+    await gql_client.submit_request({"query": GRAPHQL_QUERIES["metrics"]})
+    with pytest.raises(ValueError, match="Unknown metric"):
+        await gql_client.submit_request({"query": GRAPHQL_QUERIES["metrics"]})
+
+    stats = gql_client.stats()["operations"]["GetMetrics"]
+    assert stats["requests"] == 2
+    assert stats["errors"] == 1
+    assert 0 <= stats["latency_seconds"]["p50"] <= stats["latency_seconds"]["max"]
@@ -0,0 +1,80 @@
+import random
+
+from dbt_mcp.semantic_layer.levenshtein import (
+    WordMatcher,
+    get_closest_words,
+    get_misspellings,
+    levenshtein,
+)
+
+
+def _reference_levenshtein(s1: str, s2: str) -> int:
+    dp = [[0] * (len(s2) + 1) for _ in range(len(s1) + 1)]
+    for i in range(len(s1) + 1):
+        dp[i][0] = i
+    for j in range(len(s2) + 1):
+        dp[0][j] = j
+    for i in range(1, len(s1) + 1):
+        for j in range(1, len(s2) + 1):
+            cost = 0 if s1[i - 1] == s2[j - 1] else 1
+            dp[i][j] = min(dp[i - 1][j] + 1, dp[i][j - 1] + 1, dp[i - 1][j - 1] + cost)
+    return dp[len(s1)][len(s2)]
+
+
+def _reference_closest_words(
+    target: str, words: list[str], top_k: int | None, threshold: int | None
+) -> list[str]:
+    distances = [(word, _reference_levenshtein(target, word)) for word in words]
+    if threshold is not None:
+        distances = [(word, dist) for word, dist in distances if dist <= threshold]
+    distances.sort(key=lambda x: x[1])
+    if top_k is not None:
+        distances = distances[:top_k]
+    return [word for word, _ in distances]
+
+
+def _random_word(rng: random.Random, max_length: int) -> str:
+    return "".join(rng.choices("abc_de", k=rng.randint(0, max_length)))
+
+
+def test_levenshtein():
+    assert levenshtein("", "") == 0
+    assert levenshtein("", "abc") == 3
+    assert levenshtein("abc", "") == 3
+    assert levenshtein("kitten", "sitting") == 3
+    assert levenshtein("revenue", "revenue") == 0
+
+
+def test_levenshtein_matches_dynamic_programming():
+    rng = random.Random(0)
+    for _ in range(300):
+        # Longer than 64 characters to cover more than a machine word
+        s1, s2 = _random_word(rng, 90), _random_word(rng, 90)
+        assert levenshtein(s1, s2) == _reference_levenshtein(s1, s2)
+
+
+def test_closest_words_match_reference():
+    rng = random.Random(1)
+    words = [_random_word(rng, 12) for _ in range(300)]
+    matcher = WordMatcher(words)
+    for _ in range(200):
+        target = _random_word(rng, 12)
+        top_k = rng.choice([None, 0, 1, 5])
+        threshold = rng.choice([None, 0, 1, 3, 6])
+        expected = _reference_closest_words(target, words, top_k, threshold)
+        assert matcher.closest(target, top_k, threshold) == expected
+        assert get_closest_words(target, words, top_k, threshold) == expected
+    assert matcher.closest("abc", -1, 3) == get_closest_words("abc", words, -1, 3) == []
+
+
+def test_misspellings():
+    words = ["revenue", "revenue_usd", "order_total", "customers", "orders"]
+
+    misspellings = get_misspellings(
+        targets=["revenu", "orders", "custmers"], words=words, top_k=5
+    )
+
+    assert [(m.word, m.similar_words) for m in misspellings] == [
+        ("revenu", ["revenue"]),
+        ("custmers", ["customers"]),
+    ]
@@ -0,0 +1,118 @@
+import json
+
+import pyarrow as pa
+import pytest
+
+from dbt_mcp.semantic_layer.paging import (
+    ResultPageNotFoundError,
+    ResultPages,
+    serialize_page,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _table(rows: int) -> pa.Table:
+    return pa.table({"id": list(range(rows)), "region": ["EMEA"] * rows})
+
+
+def _pages(
+    clock: FakeClock | None = None,
+    max_rows: int = 10,
+    max_bytes: int = 0,
+    max_retained_bytes: int = 1_000_000,
+) -> ResultPages:
+    return ResultPages(
+        max_rows=max_rows,
+        max_bytes=max_bytes,
+        ttl_seconds=60,
+        max_retained_bytes=max_retained_bytes,
+        clock=clock or FakeClock(),
+    )
+
+
+def test_serialize_page_stays_within_the_budget():
+    table = _table(100)
+
+    page, rows = serialize_page(table, 95, "json", max_rows=10, max_bytes=0)
+    assert rows == 5
+    assert [row["id"] for row in json.loads(page)] == [95, 96, 97, 98, 99]
+
+    page, rows = serialize_page(table, 0, "json", max_rows=0, max_bytes=200)
+    assert len(page) <= 200
+    assert len(json.loads(page)) == rows
+
+    page, rows = serialize_page(table, 0, "csv", max_rows=0, max_bytes=1)
+    assert rows == 1
+    assert page == '"id","region"\n0,"EMEA"\n'
+
+
+def test_results_within_the_budget_are_returned_in_one_page():
+    pages = _pages()
+
+    assert json.loads(pages.first_page(_table(10), "json")) == {
+        "result": [{"id": i, "region": "EMEA"} for i in range(10)],
+        "offset": 0,
+        "rows": 10,
+        "total_rows": 10,
+        "truncated": False,
+        "next_cursor": None,
+    }
+    assert json.loads(pages.first_page(_table(10), "csv"))["result"].startswith(
+        '"id","region"\n0,"EMEA"\n'
+    )
+    assert pages.stats()["entries"] == 0
+
+
+def test_large_results_are_returned_page_by_page():
+    pages = _pages()
+    table = _table(25)
+
+    response = json.loads(pages.first_page(table, "json"))
+    ids = [row["id"] for row in response["result"]]
+    assert response["offset"] == 0
+    assert response["rows"] == 10
+    assert response["total_rows"] == 25
+    assert response["truncated"]
+    while response["next_cursor"] is not None:
+        response = json.loads(pages.page(response["next_cursor"], "json"))
+        ids.extend(row["id"] for row in response["result"])
+    assert ids == list(range(25))
+    assert response["offset"] == 20
+    assert response["rows"] == 5
+    assert not response["truncated"]
+
+    cursor = json.loads(pages.first_page(table, "csv"))["next_cursor"]
+    response = json.loads(pages.page(cursor, "csv"))
+    assert response["result"].splitlines()[1] == '10,"EMEA"'
+
+
+def test_expired_or_unknown_cursors_are_rejected():
+    clock = FakeClock()
+    pages = _pages(clock)
+    cursor = json.loads(pages.first_page(_table(25), "json"))["next_cursor"]
+
+    with pytest.raises(ResultPageNotFoundError):
+        pages.page("unknown:10", "json")
+    with pytest.raises(ResultPageNotFoundError):
+        pages.page(cursor.split(":")[0] + ":ten", "json")
+    clock.now = 60
+    with pytest.raises(ResultPageNotFoundError):
+        pages.page(cursor, "json")
+
+
+def test_results_too_large_to_retain_are_truncated_without_cursor():
+    pages = _pages(max_retained_bytes=10)
+
+    response = json.loads(pages.first_page(_table(25), "json"))
+
+    assert response["rows"] == 10
+    assert response["truncated"]
+    assert response["next_cursor"] is None
+    assert pages.stats()["entries"] == 0
@@ -0,0 +1,159 @@
+import asyncio
+
+import pyarrow as pa
+import pytest
+from dbtsl.api.shared.query_params import GroupByParam, GroupByType
+
+from dbt_mcp.semantic_layer.result_cache import (
+    QueryResultCache,
+    query_fingerprint,
+    with_metric_order,
+)
+from dbt_mcp.semantic_layer.types import OrderByParam
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeQuery:
+    def __init__(self):
+        self.calls = 0
+        self.completed = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self) -> pa.Table:
+        self.calls += 1
+        calls = self.calls
+        await self.release.wait()
+        self.completed += 1
+        return pa.table({"revenue": [float(calls)]})
+
+
+async def _wait_for_calls(query: FakeQuery, calls: int) -> None:
+    while query.calls < calls:
+        await asyncio.sleep(0)
+
+
+def _cache(clock: FakeClock, stale_seconds: float = 0) -> QueryResultCache:
+    return QueryResultCache(
+        ttl_seconds=60,
+        stale_seconds=stale_seconds,
+        max_entries=10,
+        max_bytes=1_000_000,
+        clock=clock,
+    )
+
+
+def test_query_fingerprint_is_normalized():
+    group_by = [
+        GroupByParam(name="metric_time", type=GroupByType.DIMENSION, grain="DAY")
+    ]
+    order_by = [OrderByParam(name="revenue", descending=True)]
+
+    assert query_fingerprint(
+        ["revenue", "order_count"], group_by, order_by, "{{ Dimension('x') }}  = 1", 10
+    ) == query_fingerprint(
+        ["order_count", "revenue"],
+        [GroupByParam(name="metric_time", type=GroupByType.DIMENSION, grain="day")],
+        order_by,
+        "{{ Dimension('x') }} =\n 1",
+        10,
+    )
+    assert query_fingerprint(["revenue"], None, None, None, None) == (
+        query_fingerprint(["revenue"], [], [], "", None)
+    )
+    assert query_fingerprint(["revenue"], group_by, None, None, 10) != (
+        query_fingerprint(["revenue"], group_by, None, None, 20)
+    )
+    assert query_fingerprint(["revenue"], None, order_by, None, None) != (
+        query_fingerprint(["revenue"], None, None, None, None)
+    )
+    assert query_fingerprint(["revenue"], None, None, "a = 1 -- x\nor b", None) != (
+        query_fingerprint(["revenue"], None, None, "a = 1 -- x or b", None)
+    )
+
+
+@pytest.mark.parametrize(
+    "metrics, expected",
+    [
+        (["revenue", "order_count"], ["METRIC_TIME__DAY", "REVENUE", "ORDER_COUNT"]),
+        (["order_count", "revenue"], ["METRIC_TIME__DAY", "ORDER_COUNT", "REVENUE"]),
+        (["order_count", "unknown"], ["METRIC_TIME__DAY", "REVENUE", "ORDER_COUNT"]),
+    ],
+)
+def test_with_metric_order(metrics, expected):
+    table = pa.table({"METRIC_TIME__DAY": [1], "REVENUE": [2.0], "ORDER_COUNT": [3]})
+
+    assert with_metric_order(table, metrics).column_names == expected
+
+
+async def test_results_are_cached():
+    clock = FakeClock()
+    cache = _cache(clock)
+    query = FakeQuery()
+
+    assert (await cache.get("a", query))["revenue"][0].as_py() == 1
+    assert (await cache.get("a", query))["revenue"][0].as_py() == 1
+    assert (await cache.get("a", query, use_cache=False))["revenue"][0].as_py() == 2
+    assert (await cache.get("a", query))["revenue"][0].as_py() == 2
+    clock.now = 60
+    assert (await cache.get("a", query))["revenue"][0].as_py() == 3
+
+    assert query.calls == 3
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["expirations"] == 1
+
+
+async def test_stale_results_are_refreshed_in_the_background():
+    clock = FakeClock()
+    cache = _cache(clock, stale_seconds=30)
+    query = FakeQuery()
+
+    await cache.get("a", query)
+    clock.now = 70
+    query.release.clear()
+    assert (await cache.get("a", query))["revenue"][0].as_py() == 1
+    assert (await cache.get("a", query))["revenue"][0].as_py() == 1
+    await _wait_for_calls(query, 2)
+
+    query.release.set()
+    while query.completed < 2:
+        await asyncio.sleep(0)
+    assert (await cache.get("a", query))["revenue"][0].as_py() == 2
+    assert cache.stats()["stale_hits"] == 2
+    assert cache.stats()["refreshes"] == 1
+
+
+async def test_concurrent_identical_queries_are_sent_once():
+    cache = _cache(FakeClock())
+    query = FakeQuery()
+    query.release.clear()
+
+    results = asyncio.gather(*(cache.get("a", query) for _ in range(3)))
+    await _wait_for_calls(query, 1)
+    query.release.set()
+
+    assert [table["revenue"][0].as_py() for table in await results] == [1, 1, 1]
+    assert query.calls == 1
+    assert cache.stats()["deduplicated"] == 2
+
+
+async def test_results_of_queries_sent_before_invalidation_are_not_cached():
+    cache = _cache(FakeClock())
+    query = FakeQuery()
+    query.release.clear()
+
+    result = asyncio.ensure_future(cache.get("a", query))
+    await _wait_for_calls(query, 1)
+    cache.invalidate()
+    query.release.set()
+    await result
+    await cache.get("a", query)
+
+    assert query.calls == 2
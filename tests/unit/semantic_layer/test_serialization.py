@@ -0,0 +1,104 @@
+import base64
+import datetime
+import decimal
+import io
+import json
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pytest
+
+from dbt_mcp.semantic_layer.serialization import serialize_table, table_to_json
+
+TABLE = pa.table(
+    {
+        "metric_time__day": pa.array([datetime.date(2024, 1, 2), None]),
+        "metric_time__second": pa.array(
+            [datetime.datetime(2024, 1, 2, 3, 4, 5), None], pa.timestamp("us")
+        ),
+        "customer__name": ['Bob "B" \\ Smith', "Zoë"],
+        "customer__region": pa.array(["EMEA", None]).dictionary_encode(),
+        "is_active": [True, None],
+        "order_count": pa.array([3, None], pa.int64()),
+        "revenue": [1.5, float("nan")],
+        "margin": pa.array([decimal.Decimal("0.25"), None]),
+        "tags": [["a", "b"], None],
+    }
+)
+
+
+def test_json_values():
+    assert json.loads(table_to_json(TABLE)) == [
+        {
+            "metric_time__day": "2024-01-02",
+            "metric_time__second": "2024-01-02 03:04:05.000000",
+            "customer__name": 'Bob "B" \\ Smith',
+            "customer__region": "EMEA",
+            "is_active": True,
+            "order_count": 3,
+            "revenue": 1.5,
+            "margin": 0.25,
+            "tags": ["a", "b"],
+        },
+        {
+            "metric_time__day": None,
+            "metric_time__second": None,
+            "customer__name": "Zoë",
+            "customer__region": None,
+            "is_active": None,
+            "order_count": None,
+            "revenue": None,
+            "margin": None,
+            "tags": None,
+        },
+    ]
+
+
+def test_json_is_compact():
+    table = pa.table({"a": [1, 2], "b": ["x", "y"]})
+
+    assert table_to_json(table) == '[{"a":1,"b":"x"},{"a":2,"b":"y"}]'
+    assert table_to_json(table.slice(0, 0)) == "[]"
+
+
+def test_json_escapes_control_characters():
+    names = ["line\nbreak", "tab\tand \x01", None]
+
+    result = json.loads(table_to_json(pa.table({"name": names})))
+
+    assert [row["name"] for row in result] == names
+
+
+def test_json_spans_record_batches():
+    batches = [
+        pa.record_batch({"n": pa.array(range(i, i + 3), pa.int64())}) for i in (0, 3, 6)
+    ]
+    table = pa.Table.from_batches([batches[0], batches[1].slice(0, 0), *batches[1:]])
+
+    assert [row["n"] for row in json.loads(table_to_json(table))] == list(range(9))
+
+
+def test_csv():
+    result = serialize_table(TABLE.select(["customer__name", "order_count"]), "csv")
+
+    assert pa_csv.read_csv(io.BytesIO(result.encode())).to_pylist() == [
+        {"customer__name": 'Bob "B" \\ Smith', "order_count": 3},
+        {"customer__name": "Zoë", "order_count": None},
+    ]
+
+
+def test_arrow():
+    # NaN isn't equal to itself
+    table = TABLE.drop_columns(["revenue"])
+
+    result = serialize_table(table, "arrow")
+
+    with pa.ipc.open_stream(base64.b64decode(result)) as reader:
+        assert reader.read_all().equals(table)
+
+
+@pytest.mark.parametrize("result_format", ["json", "csv", "arrow"])
+def test_empty_table(result_format):
+    table = pa.table({"revenue": pa.array([], pa.float64())})
+
+    assert isinstance(serialize_table(table, result_format), str)
@@ -0,0 +1,154 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+import pyarrow as pa
+import pytest
+from dbtsl.error import QueryFailedError
+
+from dbt_mcp.semantic_layer.session_pool import SemanticLayerSessionPool
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeSemanticLayerClient:
+    def __init__(self, clients: list["FakeSemanticLayerClient"]):
+        clients.append(self)
+        self.has_session = False
+        self.closed = False
+        self.broken = False
+        self.queries = 0
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[None]:
+        assert not self.has_session
+        self.has_session = True
+        yield
+        self.has_session = False
+        self.closed = True
+
+    async def query(self, **query_params: Any) -> pa.Table:
+        assert self.has_session
+        if self.broken:
+            raise ConnectionError("Connection closed by the server")
+        if query_params["metrics"] == ["unknown"]:
+            raise QueryFailedError("Metric unknown not found")
+        self.queries += 1
+        await asyncio.sleep(0)
+        return pa.table({"revenue": [1.5]})
+
+
+def _pool(
+    clients: list[FakeSemanticLayerClient],
+    clock: FakeClock | None = None,
+    max_sessions: int = 2,
+    idle_timeout: float = 60,
+) -> SemanticLayerSessionPool:
+    return SemanticLayerSessionPool(
+        lambda: FakeSemanticLayerClient(clients),
+        max_sessions=max_sessions,
+        idle_timeout=idle_timeout,
+        clock=clock or FakeClock(),
+    )
+
+
+async def test_sessions_are_reused():
+    clients: list[FakeSemanticLayerClient] = []
+    pool = _pool(clients)
+
+    for _ in range(3):
+        assert (await pool.query(metrics=["revenue"])).num_rows == 1
+    with pytest.raises(QueryFailedError):
+        await pool.query(metrics=["unknown"])
+    await pool.query(metrics=["revenue"])
+
+    assert len(clients) == 1
+    assert clients[0].queries == 4
+    assert pool.stats()["opened"] == 1
+    assert pool.stats()["reused"] == 4
+    assert pool.stats()["idle"] == 1
+    await pool.close()
+    assert clients[0].closed
+
+
+async def test_concurrent_queries_use_separate_sessions_up_to_the_limit():
+    clients: list[FakeSemanticLayerClient] = []
+    pool = _pool(clients, max_sessions=2)
+
+    await asyncio.gather(*(pool.query(metrics=["revenue"]) for _ in range(6)))
+
+    assert len(clients) == 2
+    assert sum(client.queries for client in clients) == 6
+    assert pool.stats()["idle"] == 2
+    assert pool.stats()["in_use"] == 0
+    await pool.close()
+
+
+async def test_idle_sessions_are_closed():
+    clients: list[FakeSemanticLayerClient] = []
+    clock = FakeClock()
+    pool = _pool(clients, clock)
+
+    await pool.query(metrics=["revenue"])
+    clock.now = 60
+    await pool.query(metrics=["revenue"])
+
+    assert len(clients) == 2
+    assert pool.stats()["closed_idle"] == 1
+    await pool.close()
+    assert clients[0].closed
+
+
+async def test_idle_sessions_are_closed_without_queries():
+    clients: list[FakeSemanticLayerClient] = []
+    pool = SemanticLayerSessionPool(
+        lambda: FakeSemanticLayerClient(clients), max_sessions=2, idle_timeout=0.01
+    )
+
+    await pool.query(metrics=["revenue"])
+    await asyncio.sleep(0.05)
+
+    assert pool.stats()["idle"] == 0
+    assert clients[0].closed
+    await pool.close()
+
+
+async def test_reconnects_when_a_reused_session_fails():
+    clients: list[FakeSemanticLayerClient] = []
+    pool = _pool(clients)
+
+    await pool.query(metrics=["revenue"])
+    clients[0].broken = True
+    assert (await pool.query(metrics=["revenue"])).num_rows == 1
+
+    assert len(clients) == 2
+    assert clients[0].closed
+    assert pool.stats()["reconnects"] == 1
+    assert pool.stats()["closed_failed"] == 1
+
+    await pool.close()
+
+
+async def test_new_sessions_that_fail_are_not_retried():
+    clients: list[FakeSemanticLayerClient] = []
+
+    def broken_client() -> FakeSemanticLayerClient:
+        client = FakeSemanticLayerClient(clients)
+        client.broken = True
+        return client
+
+    pool = SemanticLayerSessionPool(broken_client, max_sessions=2, idle_timeout=60)
+
+    with pytest.raises(ConnectionError):
+        await pool.query(metrics=["revenue"])
+
+    assert len(clients) == 1
+    assert clients[0].closed
+    assert pool.stats()["idle"] == 0
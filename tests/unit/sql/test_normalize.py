@@ -0,0 +1,20 @@
+import pytest
+
+from dbt_mcp.sql.normalize import normalize_sql
+
+
+@pytest.mark.parametrize(
+    "sql,expected",
+    [
+        ("select  *\n  from orders ;", "select * from orders"),
+        ("select 'a  b' as x", "select 'a  b' as x"),
+        ('select "my  col" from t', 'select "my  col" from t'),
+        ("select 'it''s   ok'", "select 'it''s   ok'"),
+        ("select a -- x\n, b from t", "select a , b from t"),
+        ("select a -- x , b from t", "select a"),
+        ("select a /* x\n y */, b from t", "select a , b from t"),
+        ("select '-- x' as a", "select '-- x' as a"),
+    ],
+)
+def test_normalize_sql(sql, expected):
+    assert normalize_sql(sql) == expected